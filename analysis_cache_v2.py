@@ -0,0 +1,192 @@
+"""
+Analysis Cache for Outlook VTT Extractor v2.0
+Content-addressed, persistent cache of Chat AI analysis results
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class AnalysisCache:
+    """Caches LLM output keyed by transcript, meeting type, prompt version and model
+
+    Each entry is stored as its own JSON file (<key>.json) in the cache
+    directory. File modification time doubles as the last-access time, so
+    eviction is least-recently-used once the entry or size limits are hit,
+    and entries older than max_age_days are dropped on access and on prune.
+    """
+
+    def __init__(self, cache_dir, max_entries=500, max_age_days=30, max_mb=50, log_callback=None):
+        """Initialize the cache
+
+        Args:
+            cache_dir: Directory to store cache entries in
+            max_entries: Maximum number of cached analyses
+            max_age_days: Entries older than this are discarded
+            max_mb: Maximum total size of the cache on disk
+            log_callback: Function to call for logging
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.log = log_callback or print
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def normalize_transcript(transcript):
+        """Collapse whitespace and case so trivially different copies share a key"""
+        return ' '.join((transcript or '').split()).lower()
+
+    @classmethod
+    def make_key(cls, transcript, meeting_type, template_version, model, temperature,
+                 backend='chatai', endpoint=''):
+        """Build the content hash for an analysis request
+
+        Args:
+            transcript: Transcript text sent to the LLM
+            meeting_type: Classified meeting type
+            template_version: Prompt template version (meeting_prompts_v2)
+            model: LLM model/deployment name
+            temperature: Sampling temperature
+            backend: LLM backend (llm_backends_v2), so stub/replay output never
+                answers for a real model
+            endpoint: Base URL the completion came from (e.g. a mock server)
+
+        Returns:
+            Hex digest string
+        """
+        digest = hashlib.sha256()
+        for part in (meeting_type, template_version, model, f"{float(temperature):.3f}", backend, endpoint):
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(cls.normalize_transcript(transcript).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Look up a cached analysis
+
+        Returns:
+            Entry dictionary (with 'llm_output') or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            if time.time() - entry.get('created_at', 0) > self.max_age_seconds:
+                self._remove(path)
+                self.misses += 1
+                return None
+
+            # Touch for LRU ordering
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+
+            self.hits += 1
+            return entry
+
+    def put(self, key, llm_output, **metadata):
+        """Store an analysis result
+
+        Args:
+            key: Key from make_key()
+            llm_output: Raw LLM completion text
+            **metadata: Extra JSON-serializable fields to keep with the entry
+        """
+        entry = dict(metadata)
+        entry['llm_output'] = llm_output
+        entry['created_at'] = time.time()
+
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, path)
+                self.stores += 1
+            except OSError as e:
+                self.log(f"Error writing analysis cache: {e}")
+                return
+
+            self._prune()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            self.evictions += 1
+        except OSError:
+            pass
+
+    def _prune(self):
+        """Drop expired entries, then least-recently-used ones over the limits"""
+        now = time.time()
+        entries = []
+        for item in os.scandir(self.cache_dir):
+            if not item.name.endswith('.json'):
+                continue
+            try:
+                st = item.stat()
+            except OSError:
+                continue
+            if now - st.st_mtime > self.max_age_seconds:
+                self._remove(item.path)
+                continue
+            entries.append((st.st_mtime, st.st_size, item.path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_bytes -= size
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for item in os.scandir(self.cache_dir):
+                if item.name.endswith('.json'):
+                    self._remove(item.path)
+
+    def stats(self):
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            entries = 0
+            total_bytes = 0
+            for item in os.scandir(self.cache_dir):
+                if item.name.endswith('.json'):
+                    entries += 1
+                    try:
+                        total_bytes += item.stat().st_size
+                    except OSError:
+                        pass
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'entries': entries,
+                'bytes': total_bytes,
+            }
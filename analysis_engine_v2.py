@@ -0,0 +1,607 @@
+"""
+Analysis Engine v2.0
+Tk-independent meeting analysis pipeline: classify -> compact -> prompt -> call -> parse -> persist.
+
+Used by both email paths in producto.py, by the command line below and by
+benchmarks. Each stage is a plain callable taking the AnalysisContext, so any
+stage can be swapped out (e.g. a fake LLM call for testing), and every run
+records per-stage timings.
+
+Command line:
+    python analysis_engine_v2.py meeting.vtt --title "Sprint 12 Refinement"
+    python analysis_engine_v2.py standup1.vtt standup2.vtt standup3.txt   (small meetings are batched)
+    python analysis_engine_v2.py meeting.vtt --backend stub   (offline, canned completions)
+    (Chat AI credentials are read from CHATAI_CLIENT_ID / CHATAI_CLIENT_SECRET / CHATAI_APP_KEY)
+    (the openai backend's key from LLM_API_KEY or the OS credential store)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import time
+
+from transcript_v2 import TranscriptCue, parse_vtt_cues, cues_from_text, cues_to_text
+from meeting_classifier_v2 import classify_meeting, MeetingClassification
+from meeting_prompts_v2 import PROMPT_TEMPLATES
+from chunked_analysis_v2 import ChunkedAnalyzer
+from token_estimator_v2 import estimate_tokens
+from transcript_compaction_v2 import compact_transcript, CompactionResult
+from analysis_cache_v2 import AnalysisCache
+from credential_store_v2 import get_credential
+from chatai_client_v2 import DEFAULT_MODEL, DEFAULT_CHATAI_BASE_URL, DEFAULT_SSO_URL
+from llm_backends_v2 import BACKENDS, LLMBackend, create_backend
+from llm_response_parser_v2 import parse_llm_response
+from llm_dispatch_v2 import BatchingDispatcher
+from rate_limiter_v2 import AdaptiveConcurrencyLimiter, RateLimitedBackend, MEETING_PRIORITY, DEFAULT_PRIORITY
+
+
+@dataclass
+class Transcript:
+    title: str
+    cues: List[TranscriptCue]
+    base_name: str = "meeting"  # Prefix for *_analysis.json / *_analysis.txt
+    raw_text: Optional[str] = None  # Original text, when it was not built from cues
+
+    @property
+    def text(self) -> str:
+        if self.raw_text is not None:
+            return self.raw_text
+        return cues_to_text(self.cues)
+
+    @classmethod
+    def from_vtt(cls, title: str, vtt_content: str, base_name: str = "meeting") -> "Transcript":
+        return cls(title=title, cues=parse_vtt_cues(vtt_content), base_name=base_name)
+
+    @classmethod
+    def from_text(cls, title: str, text: str, base_name: str = "meeting") -> "Transcript":
+        return cls(title=title, cues=cues_from_text(text), base_name=base_name, raw_text=text)
+
+
+@dataclass
+class AnalysisConfig:
+    chatai_client_id: str = ""
+    chatai_client_secret: str = ""
+    chatai_app_key: str = ""
+    output_dir: str = "."
+    model: str = DEFAULT_MODEL
+    chatai_base_url: str = DEFAULT_CHATAI_BASE_URL
+    sso_url: str = DEFAULT_SSO_URL
+    temperature: float = 0.2
+    max_tokens: int = 8000
+    min_transcript_chars: int = 50
+    cache_enabled: bool = True
+    chunked_enabled: bool = True
+    chunked_threshold_tokens: int = 12000
+    chunk_max_tokens: int = 6000
+    chunk_overlap_tokens: int = 300
+    chunk_max_parallel: int = 4
+    stream_enabled: bool = True
+    llm_backend: str = "chatai"       # chatai | openai | stub | replay (see llm_backends_v2)
+    llm_base_url: str = ""            # openai backend only
+    llm_api_key: str = ""             # openai backend only (credential, never read from settings)
+    llm_replay_path: str = ""         # replay backend only
+    llm_record_path: str = ""         # Record every completion to this JSONL file
+    stub_latency_ms: int = 0          # stub backend only
+    stub_tokens_per_sec: float = 0    # stub backend only (0 = instant)
+    stub_error_rate: float = 0.0      # stub backend only (fraction of calls throttled)
+    rate_limit_enabled: bool = True   # Adaptive concurrency + retry on 429/503
+    llm_initial_concurrency: int = 2
+    llm_max_concurrency: int = 8
+    llm_max_retries: int = 3
+    compaction_enabled: bool = True
+    compaction_target_tokens: int = 0  # 0 = clean up only, never drop content
+    batching_enabled: bool = True        # Only applies to analyze_many()
+    batch_max_meetings: int = 4
+    batch_max_wait_ms: int = 500
+    batch_max_tokens: int = 12000
+    batch_max_meeting_tokens: int = 3000
+
+    @classmethod
+    def from_settings(cls, settings: Dict, **overrides) -> "AnalysisConfig":
+        """Build from a ConfigManager.config dictionary (plus credentials etc. as overrides)"""
+        values = dict(
+            output_dir=settings.get('output_directory', '.'),
+            model=settings.get('chatai_model', DEFAULT_MODEL),
+            chatai_base_url=settings.get('chatai_base_url', DEFAULT_CHATAI_BASE_URL),
+            sso_url=settings.get('chatai_sso_url', DEFAULT_SSO_URL),
+            llm_backend=settings.get('llm_backend', 'chatai'),
+            llm_base_url=settings.get('llm_base_url', ''),
+            llm_replay_path=settings.get('llm_replay_path', ''),
+            llm_record_path=settings.get('llm_record_path', ''),
+            stub_latency_ms=settings.get('llm_stub_latency_ms', 0),
+            stub_tokens_per_sec=settings.get('llm_stub_tokens_per_sec', 0),
+            stub_error_rate=settings.get('llm_stub_error_rate', 0.0),
+            rate_limit_enabled=settings.get('llm_rate_limit_enabled', True),
+            llm_initial_concurrency=settings.get('llm_initial_concurrency', 2),
+            llm_max_concurrency=settings.get('llm_max_concurrency', 8),
+            llm_max_retries=settings.get('llm_max_retries', 3),
+            cache_enabled=settings.get('analysis_cache_enabled', True),
+            chunked_enabled=settings.get('chunked_analysis_enabled', True),
+            chunked_threshold_tokens=settings.get('chunked_analysis_threshold_tokens', 12000),
+            chunk_max_tokens=settings.get('chunk_max_tokens', 6000),
+            chunk_overlap_tokens=settings.get('chunk_overlap_tokens', 300),
+            chunk_max_parallel=settings.get('chunk_max_parallel', 4),
+            stream_enabled=settings.get('chatai_streaming_enabled', True),
+            compaction_enabled=settings.get('transcript_compaction_enabled', True),
+            compaction_target_tokens=settings.get('transcript_target_tokens', 0),
+            batching_enabled=settings.get('llm_batching_enabled', True),
+            batch_max_meetings=settings.get('llm_batch_max_meetings', 4),
+            batch_max_wait_ms=settings.get('llm_batch_max_wait_ms', 500),
+            batch_max_tokens=settings.get('llm_batch_max_tokens', 12000),
+            batch_max_meeting_tokens=settings.get('llm_batch_max_meeting_tokens', 3000),
+        )
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def has_credentials(self) -> bool:
+        if self.llm_backend in ('stub', 'replay'):
+            return True
+        if self.llm_backend == 'openai':
+            return bool(self.llm_base_url)
+        return all([self.chatai_client_id, self.chatai_client_secret, self.chatai_app_key])
+
+    @property
+    def endpoint(self) -> str:
+        """Where completions come from (part of the analysis cache key)"""
+        if self.llm_backend == 'openai':
+            return self.llm_base_url.rstrip('/')
+        if self.llm_backend == 'replay':
+            return os.path.abspath(self.llm_replay_path) if self.llm_replay_path else ''
+        if self.llm_backend == 'stub':
+            return ''
+        return self.chatai_base_url.rstrip('/')
+
+
+@dataclass
+class AnalysisResult:
+    meeting_title: str
+    meeting_type: str
+    classification: MeetingClassification
+    llm_output: str
+    structured_data: Optional[Dict]
+    analysis_text: str
+    analysis_file: Optional[str] = None  # *_analysis.txt file name
+    json_file: Optional[str] = None      # *_analysis.json file name (if parsed)
+    cached: bool = False
+    chunked: bool = False
+    original_tokens: Optional[int] = None   # Transcript tokens before / after compaction
+    compacted_tokens: Optional[int] = None
+    template_version: Optional[str] = None  # Prompt template that produced the result
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class AnalysisContext:
+    """Mutable state handed from stage to stage"""
+    transcript: Transcript
+    config: AnalysisConfig
+    classification: Optional[MeetingClassification] = None
+    compaction: Optional[CompactionResult] = None
+    user_prompt: Optional[str] = None
+    template_version: Optional[str] = None
+    chunked: bool = False
+    incomplete: bool = False  # A chunk failed or needed repair; never cached
+    cache_key: Optional[str] = None
+    cached: bool = False
+    llm_output: Optional[str] = None
+    structured_data: Optional[Dict] = None
+    result: Optional[AnalysisResult] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    on_item: Optional[Callable[[str, Dict], None]] = None
+    batchable: bool = False
+
+
+Stage = Callable[[AnalysisContext], bool]
+
+
+class AnalysisEngine:
+    """Runs the analysis stages for one transcript at a time (thread-safe across calls)"""
+
+    STAGES = ('classify', 'compact', 'prompt', 'call', 'parse', 'persist')
+
+    def __init__(self, config: AnalysisConfig, cache: Optional[AnalysisCache] = None,
+                 client: Optional[LLMBackend] = None, log_callback=None):
+        """
+        Args:
+            config: AnalysisConfig
+            cache: AnalysisCache to reuse identical analyses (optional)
+            client: LLM backend (created from config.llm_backend, behind the
+                adaptive rate limiter, if not given)
+            log_callback: Function to call for logging
+        """
+        self.config = config
+        self.cache = cache
+        self.log = log_callback or print
+        self.limiter = None
+        if client is None:
+            client = create_backend(config, log_callback=self.log)
+            if config.rate_limit_enabled:
+                self.limiter = AdaptiveConcurrencyLimiter(
+                    initial_limit=config.llm_initial_concurrency,
+                    max_limit=config.llm_max_concurrency,
+                    log_callback=self.log
+                )
+                client = RateLimitedBackend(client, self.limiter, max_retries=config.llm_max_retries,
+                                            log_callback=self.log)
+        self.client = client
+        self.dispatcher = None
+        if config.batching_enabled:
+            self.dispatcher = BatchingDispatcher(
+                self.client, max_batch_size=config.batch_max_meetings,
+                max_wait_ms=config.batch_max_wait_ms, max_batch_tokens=config.batch_max_tokens,
+                max_request_tokens=config.batch_max_meeting_tokens, model=config.model,
+                log_callback=self.log
+            )
+        self.stages: Dict[str, Stage] = {name: getattr(self, f"{name}_stage") for name in self.STAGES}
+
+    def set_stage(self, name: str, stage: Stage) -> None:
+        """Replace one stage (must be one of STAGES)"""
+        if name not in self.STAGES:
+            raise ValueError(f"Unknown stage '{name}' (expected one of {', '.join(self.STAGES)})")
+        self.stages[name] = stage
+
+    def analyze(self, transcript: Transcript,
+                classification: Optional[MeetingClassification] = None,
+                on_item: Optional[Callable[[str, Dict], None]] = None,
+                batchable: bool = False) -> Optional[AnalysisResult]:
+        """Run every stage for a transcript
+
+        Args:
+            transcript: Transcript to analyze
+            classification: Pre-computed classification (e.g. from streaming download)
+            on_item: Called with ("stories" | "actions", item) as each item streams
+                in from the model. Not called for cached, chunked or batched
+                analyses; use the final structured_data for those.
+            batchable: Let the dispatcher combine this call with concurrent ones
+
+        Returns:
+            AnalysisResult, or None if a stage stopped the run
+        """
+        context = AnalysisContext(transcript=transcript, config=self.config,
+                                  classification=classification, on_item=on_item,
+                                  batchable=batchable)
+        for name in self.STAGES:
+            started = time.perf_counter()
+            try:
+                carry_on = self.stages[name](context)
+            finally:
+                context.timings[name] = time.perf_counter() - started
+            if not carry_on:
+                return None
+
+        context.result.timings = dict(context.timings)
+        timing_summary = ", ".join(f"{k} {v:.2f}s" for k, v in context.timings.items())
+        if self.limiter is not None:
+            stats = self.limiter.stats()
+            timing_summary += (f" | LLM concurrency {stats['in_flight']}/{stats['limit']}, "
+                               f"queued {stats['queue_depth']}, throttled {stats['throttled']}")
+        self.log(f"  ⏱ Analysis stages: {timing_summary}")
+        return context.result
+
+    def close(self) -> None:
+        """Send any pending batched request and stop the dispatcher thread"""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+
+    def llm_stats(self) -> Optional[Dict]:
+        """Live limiter stats (concurrency, queue depth, throttle counts), None if not rate limited"""
+        return self.limiter.stats() if self.limiter is not None else None
+
+    def analyze_many(self, transcripts: List[Transcript],
+                     max_parallel: Optional[int] = None) -> List[Optional[AnalysisResult]]:
+        """Analyze several transcripts concurrently; small ones share Chat AI requests
+
+        Returns:
+            One AnalysisResult (or None) per transcript, in the same order
+        """
+        if not transcripts:
+            return []
+        workers = max_parallel or max(len(transcripts), 1)
+
+        def run(transcript):
+            try:
+                return self.analyze(transcript, batchable=True)
+            except Exception as e:
+                self.log(f"  Analysis error ({transcript.title}): {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, transcripts))
+
+    # --- Stages --------------------------------------------------------------
+
+    def classify_stage(self, context: AnalysisContext) -> bool:
+        text = context.transcript.text
+        if len(text) < context.config.min_transcript_chars:
+            self.log("  ✗ Transcript too short to analyze")
+            return False
+
+        if context.classification is None:
+            context.classification = classify_meeting(context.transcript.title, text)
+
+        classification = context.classification
+        self.log(f"  📊 Meeting Classification: {classification.meeting_type.upper()}")
+        self.log(f"     Refinement Score: {classification.refinement_score:.2f} | Action Score: {classification.action_score:.2f}")
+
+        # Intelligent routing based on classification
+        if classification.meeting_type == "refinement":
+            self.log("  🎯 Routing: Stories → Jira (with approval)")
+        elif classification.meeting_type == "general":
+            self.log("  🎯 Routing: Actions → Outlook Tasks (automatic)")
+        else:  # mixed
+            self.log("  🎯 Routing: Stories → Jira | Actions → Outlook Tasks")
+        return True
+
+    def compact_stage(self, context: AnalysisContext) -> bool:
+        config = context.config
+        if not config.compaction_enabled or not context.transcript.cues:
+            return True
+
+        compaction = compact_transcript(
+            context.transcript.cues, model=config.model,
+            target_tokens=config.compaction_target_tokens
+        )
+        if not compaction.cues:
+            return True
+        context.compaction = compaction
+        context.transcript = replace(context.transcript, cues=compaction.cues, raw_text=None)
+
+        self.log(f"  🗜 Transcript: {compaction.original_tokens} → {compaction.compacted_tokens} tokens "
+                 f"(-{compaction.saved_ratio:.0%}; {compaction.duplicates_removed} repeated lines, "
+                 f"{compaction.turns_merged} cues merged)")
+        if compaction.dropped_segments:
+            self.log(f"     Dropped {compaction.dropped_segments} low-signal segment(s) "
+                     f"to fit {config.compaction_target_tokens} tokens")
+        for note in compaction.notes:
+            self.log(f"  ⚠ {note}")
+        return True
+
+    def prompt_stage(self, context: AnalysisContext) -> bool:
+        config = context.config
+        transcript = context.transcript
+        meeting_type = context.classification.meeting_type
+
+        if context.compaction is not None:
+            tokens = context.compaction.compacted_tokens
+        else:
+            tokens = estimate_tokens(transcript.text, config.model)
+        context.chunked = config.chunked_enabled and tokens > config.chunked_threshold_tokens
+        context.template_version = PROMPT_TEMPLATES.version(meeting_type, context.chunked)
+
+        # Chunked prompts are built per part inside the call stage
+        if not context.chunked:
+            # Cue texts go straight into the prompt, without joining them first
+            transcript_view = (transcript.raw_text if transcript.raw_text is not None
+                               else [cue.text for cue in transcript.cues])
+            context.user_prompt = PROMPT_TEMPLATES.get(meeting_type).render(transcript.title, transcript_view)
+        return True
+
+    def call_stage(self, context: AnalysisContext) -> bool:
+        meeting_type = context.classification.meeting_type
+
+        # Reuse a previous analysis of the same transcript if we have one
+        if self.cache is not None and context.config.cache_enabled:
+            context.cache_key = AnalysisCache.make_key(
+                context.transcript.text, meeting_type, context.template_version,
+                context.config.model, context.config.temperature,
+                backend=context.config.llm_backend, endpoint=context.config.endpoint
+            )
+            entry = self.cache.get(context.cache_key)
+            counts = f"hits: {self.cache.hits}, misses: {self.cache.misses}"
+            if entry:
+                self.log(f"  ⚡ Analysis cache hit ({counts}) - skipping Chat AI call")
+                context.llm_output = entry['llm_output']
+                context.cached = True
+                return True
+            self.log(f"  Analysis cache miss ({counts})")
+
+        if not context.config.has_credentials:
+            self.log("  ✗ Chat AI credentials not configured")
+            return False
+
+        priority = MEETING_PRIORITY.get(meeting_type, DEFAULT_PRIORITY)
+        client = self.client.for_priority(priority) if hasattr(self.client, 'for_priority') else self.client
+
+        if context.chunked:
+            config = context.config
+            analyzer = ChunkedAnalyzer(
+                call_llm=client.complete,
+                parse_response=lambda output: parse_llm_response(output, meeting_type),
+                max_workers=config.chunk_max_parallel,
+                max_chunk_tokens=config.chunk_max_tokens,
+                overlap_tokens=config.chunk_overlap_tokens,
+                log_callback=self.log
+            )
+            merged, complete = analyzer.analyze(context.transcript.title, meeting_type, context.transcript.cues)
+            context.llm_output = json.dumps(merged) if merged else None
+            context.incomplete = not complete
+        elif context.batchable and self.dispatcher is not None:
+            context.llm_output = self.dispatcher.complete(context.user_prompt, priority=priority)
+        elif context.config.stream_enabled:
+            context.llm_output = client.stream_complete(context.user_prompt, on_item=context.on_item)
+        else:
+            context.llm_output = client.complete(context.user_prompt)
+
+        if context.llm_output is None:
+            self.log(f"  ✗ {getattr(self.client, 'name', 'LLM')} returned no completion")
+            return False
+        return True
+
+    def parse_stage(self, context: AnalysisContext) -> bool:
+        parsed = parse_llm_response(context.llm_output, context.classification.meeting_type)
+        structured_data = parsed.data
+        context.structured_data = structured_data
+
+        if parsed.salvaged:
+            self.log("  ⚠ Response JSON was malformed - kept the complete items only")
+        elif parsed.truncated:
+            self.log("  ⚠ Response was cut off - trailing items may be missing")
+        elif parsed.repaired:
+            self.log("  ⚠ Response JSON needed repair")
+        if parsed.dropped_items:
+            self.log(f"  ⚠ Dropped {parsed.dropped_items} item(s) that failed validation")
+        if not structured_data:
+            self.log(f"  ✗ Could not parse analysis JSON: {'; '.join(parsed.errors)}")
+
+        if structured_data:
+            if 'stories' in structured_data:
+                self.log(f"     {len(structured_data['stories'])} stories")
+            if 'actions' in structured_data:
+                self.log(f"     {len(structured_data['actions'])} actions")
+
+            # Only cache complete output that parsed cleanly, so a bad completion is retried next time
+            if context.cache_key and not context.cached and parsed.clean and not context.incomplete:
+                self.cache.put(context.cache_key, context.llm_output,
+                               meeting_type=context.classification.meeting_type,
+                               meeting_title=context.transcript.title,
+                               template_version=context.template_version)
+        return True
+
+    def persist_stage(self, context: AnalysisContext) -> bool:
+        output_dir = context.config.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        base_name = context.transcript.base_name
+        meeting_title = context.transcript.title
+        meeting_type = context.classification.meeting_type
+        structured_data = context.structured_data
+
+        json_file = None
+        if structured_data:
+            json_file = f"{base_name}_analysis.json"
+            artifact = dict(structured_data)
+            artifact['_meta'] = {
+                'template_version': context.template_version,
+                'model': context.config.model,
+                'meeting_title': meeting_title,
+                'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'cached': context.cached,
+                'chunked': context.chunked,
+            }
+            with open(os.path.join(output_dir, json_file), 'w', encoding='utf-8') as f:
+                json.dump(artifact, f, indent=2)
+
+        analysis_text = (f"Meeting: {meeting_title}\nType: {meeting_type}\n"
+                         f"Template: {context.template_version}\n\n")
+        if structured_data:
+            analysis_text += json.dumps(structured_data, indent=2)
+        else:
+            analysis_text += context.llm_output
+
+        analysis_file = f"{base_name}_analysis.txt"
+        with open(os.path.join(output_dir, analysis_file), 'w', encoding='utf-8') as f:
+            f.write(analysis_text)
+
+        context.result = AnalysisResult(
+            meeting_title=meeting_title,
+            meeting_type=meeting_type,
+            classification=context.classification,
+            llm_output=context.llm_output,
+            structured_data=structured_data,
+            analysis_text=analysis_text,
+            analysis_file=analysis_file,
+            json_file=json_file,
+            cached=context.cached,
+            chunked=context.chunked,
+            original_tokens=context.compaction.original_tokens if context.compaction else None,
+            compacted_tokens=context.compaction.compacted_tokens if context.compaction else None,
+            template_version=context.template_version,
+        )
+        return True
+
+    # --- Helpers -------------------------------------------------------------
+
+    @staticmethod
+    def parse_llm_json(llm_output, meeting_type=None):
+        """Extract and validate the JSON object from an LLM completion (None if nothing usable)"""
+        return parse_llm_response(llm_output, meeting_type).data
+
+
+# --- Command line -------------------------------------------------------------
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze meeting transcripts (.vtt or .txt) with Chat AI")
+    parser.add_argument('files', nargs='+', help="Transcript files (.vtt or plain text)")
+    parser.add_argument('--title', help="Meeting title (defaults to the file name; single file only)")
+    parser.add_argument('--output-dir', help="Where to write *_analysis files (defaults to each file's folder)")
+    parser.add_argument('--no-cache', action='store_true', help="Always call Chat AI")
+    parser.add_argument('--no-batch', action='store_true', help="Send every meeting in its own request")
+    parser.add_argument('--backend', choices=BACKENDS, default='chatai', help="LLM backend (default: chatai)")
+    parser.add_argument('--base-url', help="Chat AI deployments URL / OpenAI-compatible base URL (e.g. a mock_server_v2)")
+    parser.add_argument('--sso-url', help="SSO token URL override")
+    parser.add_argument('--record', help="Append every completion to this JSONL file")
+    parser.add_argument('--replay', help="Recording to play back (with --backend replay)")
+    parser.add_argument('--stub-latency-ms', type=int, default=0, help="Stub backend: latency per call")
+    parser.add_argument('--stub-tokens-per-sec', type=float, default=0, help="Stub backend: output speed (0 = instant)")
+    parser.add_argument('--stub-error-rate', type=float, default=0.0, help="Stub backend: fraction of calls throttled (429)")
+    args = parser.parse_args(argv)
+
+    transcripts = []
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        title = args.title if args.title and len(args.files) == 1 else base_name
+        if path.lower().endswith('.vtt'):
+            transcripts.append(Transcript.from_vtt(title, content, base_name))
+        else:
+            transcripts.append(Transcript.from_text(title, content, base_name))
+
+    output_dir = args.output_dir or os.path.dirname(os.path.abspath(args.files[0]))
+    config = AnalysisConfig(
+        chatai_client_id=os.getenv('CHATAI_CLIENT_ID', ''),
+        chatai_client_secret=os.getenv('CHATAI_CLIENT_SECRET', ''),
+        chatai_app_key=os.getenv('CHATAI_APP_KEY', ''),
+        output_dir=output_dir,
+        cache_enabled=not args.no_cache,
+        batching_enabled=not args.no_batch,
+        llm_backend=args.backend,
+        llm_base_url=args.base_url or '',
+        llm_api_key=get_credential('llm_api_key') or '',
+        llm_record_path=args.record or '',
+        llm_replay_path=args.replay or '',
+        stub_latency_ms=args.stub_latency_ms,
+        stub_tokens_per_sec=args.stub_tokens_per_sec,
+        stub_error_rate=args.stub_error_rate,
+    )
+    if args.base_url and args.backend == 'chatai':
+        config.chatai_base_url = args.base_url
+    if args.sso_url:
+        config.sso_url = args.sso_url
+    cache = AnalysisCache(os.path.join(output_dir, '.analysis_cache'))
+    engine = AnalysisEngine(config, cache=cache)
+    try:
+        if len(transcripts) == 1:
+            results = [engine.analyze(transcripts[0])]
+        else:
+            results = engine.analyze_many(transcripts)
+    finally:
+        engine.close()
+
+    summary = []
+    for transcript, result in zip(transcripts, results):
+        if not result:
+            summary.append({'meeting_title': transcript.title, 'error': "analysis failed"})
+            continue
+        summary.append({
+            'meeting_title': result.meeting_title,
+            'meeting_type': result.meeting_type,
+            'analysis_file': os.path.join(output_dir, result.analysis_file),
+            'stories': len((result.structured_data or {}).get('stories', [])),
+            'actions': len((result.structured_data or {}).get('actions', [])),
+            'cached': result.cached,
+            'chunked': result.chunked,
+            'timings': result.timings,
+        })
+
+    print(json.dumps(summary[0] if len(summary) == 1 else summary, indent=2))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
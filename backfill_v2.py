@@ -0,0 +1,258 @@
+"""
+Backfill v2.0
+Processes the recording notifications received in a past date range, e.g.
+when a team is onboarded with months of meetings already in their mailbox.
+
+The source (any MailSource; for Outlook, Items.Restrict) is queried one
+date window ("page") at a time, so it only ever returns the matching emails
+of that window instead of the whole folder. Emails already in the state
+store are skipped before their body is read. New ones are processed by a
+thread pool; the source itself is only touched on the calling thread.
+
+After each window the progress is checkpointed, so an interrupted backfill
+resumes from the first unfinished window. A dry run reports the counts and
+an estimated LLM cost without processing anything.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import threading
+
+from mail_sources_v2 import MailSource
+from meeting_prompts_v2 import SYSTEM_PROMPT, build_mixed_user_prompt
+from token_estimator_v2 import estimate_tokens
+
+
+@dataclass
+class BackfillStats:
+    windows: int = 0
+    matched: int = 0                 # Emails in range whose subject matches
+    already_handled: int = 0         # Skipped: in the state store already
+    queued: int = 0                  # New emails (processed, or would be in a dry run)
+    completed: int = 0
+    skipped: int = 0                 # No Webex URL / transcript, download failed, ...
+    failed: int = 0
+    estimated_input_tokens: int = 0
+    estimated_output_tokens: int = 0
+    estimated_cost: float = 0.0
+    interrupted: bool = False
+
+    def summary(self) -> str:
+        text = (f"{self.matched} matched, {self.already_handled} already handled, {self.queued} new "
+                f"({self.completed} completed, {self.skipped} skipped, {self.failed} failed) "
+                f"in {self.windows} window(s)")
+        if self.estimated_input_tokens:
+            text += (f" | est. {self.estimated_input_tokens:,} input + {self.estimated_output_tokens:,} output "
+                     f"tokens ≈ ${self.estimated_cost:.2f}")
+        return text
+
+
+def date_windows(start: datetime, end: datetime, days: int) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive windows of at most days each"""
+    windows = []
+    step = timedelta(days=max(1, days))
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + step, end)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+class BackfillCheckpoint:
+    """JSON file recording how far a backfill run got"""
+
+    def __init__(self, path, log_callback=None):
+        self.path = path
+        self.log = log_callback or print
+
+    def load(self, run_key) -> Optional[Dict]:
+        """Checkpoint of run_key, or None (missing, unreadable or for another run)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.log(f"Error loading backfill checkpoint: {e}")
+            return None
+        return data if isinstance(data, dict) and data.get('run_key') == run_key else None
+
+    def save(self, run_key, completed_until: datetime, stats: BackfillStats) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'run_key': run_key, 'completed_until': completed_until.isoformat(),
+                           'stats': asdict(stats)}, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.log(f"Error writing backfill checkpoint: {e}")
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class BackfillRunner:
+    """Enumerates a date range of a mail source and processes every new matching email"""
+
+    def __init__(self, config_manager, process_email: Callable[[Dict], object],
+                 checkpoint_path=None, parallelism=None, window_days=None, log_callback=None):
+        """
+        Args:
+            config_manager: ConfigManager (state store and backfill_* settings)
+            process_email: Called with each new email dict (e.g. MeetingPipeline.process_email);
+                a returned object with a status of 'skipped'/'failed' is counted as such
+            checkpoint_path: Progress file (default: backfill_checkpoint.json in the config dir)
+            parallelism: Emails processed at once (default: backfill_parallelism)
+            window_days: Days per source query (default: backfill_window_days)
+            log_callback: Function to call for logging
+        """
+        config = config_manager.config
+        self.config_manager = config_manager
+        self.process_email = process_email
+        self.parallelism = max(1, parallelism or config.get('backfill_parallelism', 2))
+        self.window_days = window_days or config.get('backfill_window_days', 7)
+        self.log = log_callback or print
+        self.checkpoint = BackfillCheckpoint(
+            checkpoint_path or os.path.join(config_manager.config_dir, 'backfill_checkpoint.json'),
+            log_callback=self.log
+        )
+
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    def stop(self) -> None:
+        """Stop after the emails already being processed (safe from any thread)"""
+        self._stop.set()
+
+    def run(self, source: MailSource, start: datetime, end: datetime, subject_pattern=None,
+            dry_run=False, resume=True) -> BackfillStats:
+        """
+        Backfill [start, end) of a mail source.
+
+        Args:
+            source: MailSource (e.g. OutlookMailSource; used on this thread only)
+            start: First received time to include
+            end: Received times before this are included
+            subject_pattern: Subject substring (default: email_subject_pattern)
+            dry_run: Only count emails and estimate the LLM cost
+            resume: Continue from the checkpoint of an identical earlier run
+
+        Returns:
+            BackfillStats
+        """
+        if subject_pattern is None:
+            subject_pattern = self.config_manager.config.get('email_subject_pattern', '')
+        run_key = f"{source.location}|{subject_pattern}|{start.isoformat()}|{end.isoformat()}"
+
+        stats = BackfillStats()
+        windows = date_windows(start, end, self.window_days)
+        if resume and not dry_run:
+            saved = self.checkpoint.load(run_key)
+            if saved:
+                completed_until = datetime.fromisoformat(saved['completed_until'])
+                stats = BackfillStats(**saved['stats'])
+                windows = [window for window in windows if window[1] > completed_until]
+                self.log(f"Resuming backfill after {completed_until:%Y-%m-%d %H:%M} "
+                         f"({len(windows)} window(s) left)")
+
+        self.log(f"{'Dry run: ' if dry_run else ''}Backfilling {start:%Y-%m-%d} → {end:%Y-%m-%d} "
+                 f"in {len(windows)} window(s), {self.parallelism} at a time")
+
+        executor = None if dry_run else ThreadPoolExecutor(max_workers=self.parallelism,
+                                                            thread_name_prefix="backfill")
+        # Bounded hand-off so bodies of a huge window are not all held in memory at once
+        slots = threading.Semaphore(self.parallelism * 2)
+        try:
+            for window_start, window_end in windows:
+                if self._stop.is_set():
+                    break
+                futures = []
+                for email_data in self._new_emails(source, window_start, window_end, subject_pattern,
+                                                   stats, read_body=not dry_run):
+                    if dry_run:
+                        continue
+                    slots.acquire()
+                    future = executor.submit(self._process, email_data, stats)
+                    future.add_done_callback(lambda _: slots.release())
+                    futures.append(future)
+                    if self._stop.is_set():
+                        break
+
+                for future in futures:
+                    future.result()
+                if self._stop.is_set():
+                    break
+
+                stats.windows += 1
+                if not dry_run:
+                    self.checkpoint.save(run_key, window_end, stats)
+                self.log(f"  Window {window_start:%Y-%m-%d} → {window_end:%Y-%m-%d} done: {stats.summary()}")
+        except KeyboardInterrupt:
+            self.stop()
+            self.log("Backfill interrupted - finishing emails in progress")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+        stats.interrupted = self._stop.is_set()
+        if dry_run:
+            self.estimate_cost(stats)
+        elif not stats.interrupted:
+            self.checkpoint.clear()
+        self.log(f"{'Backfill interrupted' if stats.interrupted else 'Backfill finished'}: {stats.summary()}")
+        return stats
+
+    def estimate_cost(self, stats: BackfillStats) -> BackfillStats:
+        """Fill in the estimated LLM tokens and cost for the queued emails (upper bound:
+        emails without a transcript and analysis cache hits cost nothing)"""
+        config = self.config_manager.config
+        prompt_tokens = estimate_tokens(SYSTEM_PROMPT + build_mixed_user_prompt('Meeting', ''),
+                                        config.get('chatai_model'))
+        per_meeting_input = prompt_tokens + config.get('backfill_tokens_per_meeting', 9000)
+        per_meeting_output = config.get('backfill_output_tokens_per_meeting', 1500)
+
+        stats.estimated_input_tokens = stats.queued * per_meeting_input
+        stats.estimated_output_tokens = stats.queued * per_meeting_output
+        stats.estimated_cost = round(
+            stats.estimated_input_tokens / 1000 * config.get('llm_cost_per_1k_input_tokens', 0.0)
+            + stats.estimated_output_tokens / 1000 * config.get('llm_cost_per_1k_output_tokens', 0.0), 4
+        )
+        return stats
+
+    # --- Internals -----------------------------------------------------------
+
+    def _new_emails(self, source: MailSource, window_start, window_end, subject_pattern,
+                    stats: BackfillStats, read_body=True):
+        """Yield email dicts for unhandled matches in one window (runs on the source's thread)"""
+        for message in source.iter_messages(since=window_start, until=window_end, subject_pattern=subject_pattern):
+            stats.matched += 1
+            if self.config_manager.is_email_handled(message.entry_id):
+                stats.already_handled += 1
+                continue
+            stats.queued += 1
+            yield message.to_email_data(read_body=read_body)
+
+    def _process(self, email_data, stats: BackfillStats) -> None:
+        try:
+            result = self.process_email(email_data)
+            status = getattr(result, 'status', 'completed')
+        except Exception as e:
+            self.log(f"✗ Error processing {email_data['subject'][:60]}: {str(e)}")
+            status = 'failed'
+
+        with self._stats_lock:
+            if status == 'failed':
+                stats.failed += 1
+            elif status == 'skipped':
+                stats.skipped += 1
+            else:
+                stats.completed += 1
@@ -0,0 +1,11 @@
+"""
+Producto benchmarks
+
+Times every CPU-bound pipeline stage on synthetic, seeded corpora (no
+Outlook, Webex, Chat AI or Jira needed) and compares runs to catch
+regressions. Run from the repository root:
+
+    python -m benchmarks run --output before.json
+    python -m benchmarks run --compare before.json
+    python -m benchmarks compare before.json after.json
+"""
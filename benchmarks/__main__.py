@@ -0,0 +1,85 @@
+"""
+Command line entry point: python -m benchmarks {run,compare}
+"""
+
+import argparse
+import sys
+import tempfile
+
+from benchmarks.harness import (compare_reports, format_comparison, format_results, load_report,
+                                make_report, measure, write_report)
+from benchmarks.stages import STAGES
+
+
+def cmd_run(args) -> int:
+    stages = args.stage or list(STAGES)
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"Unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})", file=sys.stderr)
+        return 2
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="producto-bench-") as workdir:
+        for stage in stages:
+            print(f"[{stage}] building corpus...", file=sys.stderr)
+            for case in STAGES[stage](args.quick, workdir):
+                results.append(measure(case, repeats=args.repeats, min_time=args.min_time))
+                print(f"  {case.name}: {results[-1].median_ms:.3f} ms", file=sys.stderr)
+
+    print(format_results(results))
+    report = make_report(results, label=args.label)
+    if args.output:
+        write_report(report, args.output)
+        print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        return show_comparison(load_report(args.compare), report, args.threshold)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    return show_comparison(load_report(args.baseline), load_report(args.current), args.threshold)
+
+
+def show_comparison(baseline, current, threshold) -> int:
+    rows = compare_reports(baseline, current, threshold)
+    print(f"\n{baseline.get('label')} → {current.get('label')} (regression threshold {threshold:.0%})")
+    print(format_comparison(rows))
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✓ No regressions")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Producto pipeline benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Run the benchmarks")
+    run.add_argument('--quick', action='store_true', help="Smaller corpora (skips 4-hour VTT and 100k state)")
+    run.add_argument('--stage', action='append', help=f"Only this stage (repeatable): {', '.join(STAGES)}")
+    run.add_argument('--repeats', type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    run.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds measured per benchmark")
+    run.add_argument('--label', help="Report label (default: git describe)")
+    run.add_argument('--output', help="Write the JSON report here")
+    run.add_argument('--compare', metavar='BASELINE', help="Compare against an earlier JSON report")
+    run.add_argument('--threshold', type=float, default=0.15, help="Slowdown counted as a regression (default: 0.15)")
+    run.set_defaults(handler=cmd_run)
+
+    compare = commands.add_parser('compare', help="Compare two JSON reports")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.15, help="Slowdown counted as a regression (default: 0.15)")
+    compare.set_defaults(handler=cmd_compare)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Synthetic corpora for the benchmarks.
+
+Everything is generated from a seed, so two runs (or two versions of the
+code) measure exactly the same inputs.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+import json
+import random
+import uuid
+
+SPEAKERS = ["Jane Doe", "Raj Patel", "Mei Chen", "Carlos Ruiz", "Anna Novak", "Tom O'Brien"]
+
+REFINEMENT_LINES = [
+    "As a user I want to filter the dashboard by region so that I can spot outages faster.",
+    "What are the acceptance criteria for the export story?",
+    "I'd size this one at five story points, maybe eight with the migration.",
+    "Let's split the epic into a backend story and a UI story.",
+    "The definition of done should include load testing against staging.",
+]
+
+ACTION_LINES = [
+    "Raj will follow up with the security team by Friday.",
+    "Action item: Mei to send the revised timeline to the customer.",
+    "Can you own the rollback plan and share it before the next sync?",
+    "We agreed to move the release to the second week of the sprint.",
+    "Carlos is going to check the licensing numbers and report back.",
+]
+
+FILLER_LINES = [
+    "Um, yeah, I think that makes sense.",
+    "Can everyone hear me okay?",
+    "Sorry, I was on mute.",
+    "Okay, let's move on to the next item.",
+    "Right, right. Sounds good.",
+]
+
+TOPICS = ["Sprint Planning", "Backlog Refinement", "Customer Escalation Sync", "Architecture Review",
+          "Weekly Ops Standup", "Release Readiness", "Q3 Roadmap", "Incident Retro"]
+
+SUBJECT_PREFIX = "Your Webex meeting content is available: "
+NOTIFICATION_KINDS = ('recording', 'lsr', 'transcript', 'noise')
+
+
+def _stamp(seconds: float) -> str:
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{secs:06.3f}"
+
+
+def vtt_transcript(minutes: int, seed: int = 0, cue_seconds: float = 4.0) -> str:
+    """Webex-style VTT with one "Speaker: text" cue every cue_seconds"""
+    rng = random.Random(seed)
+    lines = ["WEBVTT", ""]
+    start = 0.0
+    cue = 1
+    while start < minutes * 60:
+        pool = rng.choices((REFINEMENT_LINES, ACTION_LINES, FILLER_LINES), weights=(3, 3, 4))[0]
+        end = start + cue_seconds
+        lines += [str(cue), f"{_stamp(start)} --> {_stamp(end)}", f"{rng.choice(SPEAKERS)}: {rng.choice(pool)}", ""]
+        start = end
+        cue += 1
+    return "\n".join(lines)
+
+
+def notification_html(index: int, kind: str = 'recording', seed: int = 0) -> Tuple[str, str]:
+    """
+    One Webex "meeting content is available" email.
+
+    Args:
+        index: Varies topic, ids and dates
+        kind: 'recording' (playback link + password), 'lsr' (lsr.php?RCID= link),
+            'transcript' (meeting link and transcript, no recording) or 'noise' (no link)
+
+    Returns:
+        (subject, HTML body)
+    """
+    rng = random.Random(seed * 100003 + index)
+    topic = f"{rng.choice(TOPICS)} #{index}"
+    recording_id = uuid.UUID(int=rng.getrandbits(128)).hex
+    site = rng.choice(["cisco", "acme", "globex"])
+
+    if kind == 'recording':
+        link = f"https://{site}.webex.com/webappng/sites/{site}/recording/{recording_id}/playback"
+        details = f"<p>Recording password: Pw{rng.randint(1000, 9999)}</p>"
+    elif kind == 'lsr':
+        link = f"https://{site}.webex.com/{site}/lsr.php?RCID={recording_id}"
+        details = f"<p>Password: Rec{rng.randint(1000, 9999)}</p>"
+    elif kind == 'transcript':
+        link = f"https://{site}.webex.com/meet/{rng.choice(SPEAKERS).split()[0].lower()}{index}"
+        details = (f"<p>Meeting number: {rng.randint(10 ** 9, 10 ** 10 - 1)}</p>"
+                   "<p>The transcript and meeting notes are ready.</p>")
+    else:
+        link = "https://www.example.com/newsletter"
+        details = "<p>No recording was made for this meeting.</p>"
+
+    footer = "".join(f"<p style=\"color:#888\">{line}</p>" for line in (
+        "Do not reply to this automatic message.", "Privacy Statement | Copyright Cisco.com"))
+    body = (
+        "<html><head><style>td {font-family: Arial}</style></head><body>"
+        f"<table><tr><td><h2>{topic}</h2></td></tr>"
+        f"<tr><td>Hosted by {rng.choice(SPEAKERS)}</td></tr>"
+        f"<tr><td><a href=\"{link}\">View content</a> {link}</td></tr>"
+        f"<tr><td>{details}</td></tr></table>{footer}</body></html>"
+    )
+    return SUBJECT_PREFIX + topic, body
+
+
+def notification_corpus(count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """count notifications cycling through every kind"""
+    return [notification_html(i, NOTIFICATION_KINDS[i % len(NOTIFICATION_KINDS)], seed) for i in range(count)]
+
+
+def recordings_list_json(count: int, seed: int = 0) -> str:
+    """Body of a Webex GET /v1/recordings response"""
+    rng = random.Random(seed)
+    now = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    items = []
+    for i in range(count):
+        created = now - timedelta(hours=rng.randint(1, 24 * 30))
+        items.append({
+            'id': uuid.UUID(int=rng.getrandbits(128)).hex,
+            'meetingId': uuid.UUID(int=rng.getrandbits(128)).hex + f"_I_{rng.randint(10 ** 8, 10 ** 9)}",
+            'topic': f"{rng.choice(TOPICS)} #{i}",
+            'createTime': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'timeRecorded': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'durationSeconds': rng.randint(300, 14400),
+            'sizeBytes': rng.randint(10 ** 6, 10 ** 9),
+            'format': 'ARF',
+            'status': 'available',
+        })
+    return json.dumps({'items': items})
+
+
+def structured_analysis(stories: int, actions: int, seed: int = 0) -> Dict:
+    """Analysis dict shaped like a parsed Chat AI response"""
+    rng = random.Random(seed)
+    return {
+        'meeting_type': 'mixed',
+        'stories': [{
+            'summary': f"Story {i}: {rng.choice(REFINEMENT_LINES)[:60]}",
+            'description': " ".join(rng.choices(REFINEMENT_LINES, k=3)),
+            'acceptance_criteria': rng.sample(REFINEMENT_LINES, 3),
+            'estimate_points': rng.choice([1, 2, 3, 5, 8]),
+            'assignees': rng.sample(SPEAKERS, 2),
+            'labels': ["AIGen-ReviewRqd", "needs triage"],
+        } for i in range(stories)],
+        'actions': [{
+            'title': f"Action {i}: {rng.choice(ACTION_LINES)[:60]}",
+            'description': rng.choice(ACTION_LINES),
+            'owner': rng.choice(SPEAKERS),
+            'due_date_hint': rng.choice(["Friday", "next sprint", None]),
+            'related_decision': rng.choice([None, "Move the release"]),
+        } for i in range(actions)],
+    }
+
+
+def llm_response(stories: int, actions: int, seed: int = 0, style: str = 'fenced') -> str:
+    """
+    A Chat AI completion for the analysis prompt.
+
+    Args:
+        style: 'clean' (bare JSON), 'fenced' (prose plus a ```json block),
+            'trailing_commas' (needs repair) or 'truncated' (cut off mid-item)
+    """
+    text = json.dumps(structured_analysis(stories, actions, seed), indent=2)
+    if style == 'clean':
+        return text
+    if style == 'trailing_commas':
+        text = text.replace('"\n', '",\n').replace(']\n', '],\n')
+    elif style == 'truncated':
+        text = text[:int(len(text) * 0.8)]
+    return f"Here is the analysis of the meeting.\n\n```json\n{text}\n```\n\nLet me know if you need changes."
@@ -0,0 +1,146 @@
+"""
+Timing, reports and regression comparison for the benchmarks.
+"""
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+
+@dataclass
+class BenchCase:
+    stage: str
+    name: str                    # Unique across the suite, e.g. "vtt.parse.240min"
+    func: Callable[[], object]   # One timed run
+    items: int = 1               # Work items per run (emails, cues, IDs, ...)
+
+
+@dataclass
+class BenchResult:
+    stage: str
+    name: str
+    items: int
+    repeats: int
+    median_ms: float
+    p95_ms: float
+    min_ms: float
+    per_item_us: float
+    items_per_sec: float
+
+
+def measure(case: BenchCase, repeats: int = 5, min_time: float = 0.0) -> BenchResult:
+    """
+    Time case.func after one warm-up run.
+
+    Args:
+        repeats: Timed runs (at least)
+        min_time: Keep repeating until this many seconds were measured
+    """
+    case.func()  # Warm-up (imports, caches, compiled regexes)
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(timings) < repeats or sum(timings) < min_time:
+            started = time.perf_counter()
+            case.func()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    timings.sort()
+    median = statistics.median(timings)
+    p95 = timings[min(len(timings) - 1, int(round(0.95 * (len(timings) - 1))))]
+    return BenchResult(
+        stage=case.stage, name=case.name, items=case.items, repeats=len(timings),
+        median_ms=round(median * 1000, 4), p95_ms=round(p95 * 1000, 4), min_ms=round(timings[0] * 1000, 4),
+        per_item_us=round(median * 1e6 / max(1, case.items), 3),
+        items_per_sec=round(case.items / median, 1) if median else 0.0,
+    )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+                              timeout=5, check=True).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def make_report(results: List[BenchResult], label: Optional[str] = None) -> Dict:
+    return {
+        'label': label or git_revision() or 'unlabelled',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {result.name: asdict(result) for result in results},
+    }
+
+
+def write_report(report: Dict, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(baseline: Dict, current: Dict, threshold: float = 0.15) -> List[Dict]:
+    """
+    Compare median times of the benchmarks both reports contain.
+
+    Args:
+        threshold: Relative slowdown (0.15 = 15%) that counts as a regression
+
+    Returns:
+        One row per benchmark: name, baseline_ms, current_ms, change, status
+        ('regression', 'improvement', 'ok', 'new' or 'missing')
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+    current_results = current.get('results', {})
+    for name in sorted(set(base_results) | set(current_results)):
+        base = base_results.get(name)
+        now = current_results.get(name)
+        if base is None or now is None:
+            rows.append({'name': name, 'baseline_ms': base and base['median_ms'],
+                         'current_ms': now and now['median_ms'], 'change': None,
+                         'status': 'new' if base is None else 'missing'})
+            continue
+        change = (now['median_ms'] - base['median_ms']) / base['median_ms'] if base['median_ms'] else 0.0
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline_ms': base['median_ms'], 'current_ms': now['median_ms'],
+                     'change': round(change, 4), 'status': status})
+    return rows
+
+
+def format_results(results: List[BenchResult]) -> str:
+    lines = [f"{'benchmark':<44} {'items':>7} {'median ms':>11} {'p95 ms':>10} {'µs/item':>10} {'items/s':>12}"]
+    for r in results:
+        lines.append(f"{r.name:<44} {r.items:>7} {r.median_ms:>11.3f} {r.p95_ms:>10.3f} "
+                     f"{r.per_item_us:>10.2f} {r.items_per_sec:>12,.0f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<44} {'baseline ms':>12} {'current ms':>11} {'change':>8}  status"]
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row['change'] is not None else '-'
+        base = f"{row['baseline_ms']:.3f}" if row['baseline_ms'] is not None else '-'
+        now = f"{row['current_ms']:.3f}" if row['current_ms'] is not None else '-'
+        lines.append(f"{row['name']:<44} {base:>12} {now:>11} {change:>8}  {row['status']}")
+    return "\n".join(lines)
@@ -0,0 +1,174 @@
+"""
+Benchmark cases, one group per pipeline stage.
+
+Each stage function builds its corpus up front (outside the timed part)
+and returns BenchCase objects whose func runs the production code once.
+Nothing touches the network, Outlook or an LLM.
+"""
+
+from typing import Callable, Dict, List
+import json
+import os
+
+from benchmarks import corpus
+from benchmarks.harness import BenchCase
+
+from jira_payloads_v2 import build_issue_payload, drafts_from_structured
+from llm_response_parser_v2 import parse_llm_response
+from meeting_classifier_v2 import classify_meeting
+from meeting_pipeline_v2 import MeetingPipeline
+from meeting_prompts_v2 import SYSTEM_PROMPT, get_prompt_builder
+from outlook_extractor_v2_config import ConfigManager
+from token_estimator_v2 import estimate_tokens
+from transcript_compaction_v2 import compact_transcript
+from transcript_v2 import cues_to_text, parse_vtt_cues
+
+
+def _quiet(*_):
+    pass
+
+
+def _pipeline(workdir) -> MeetingPipeline:
+    """Pipeline on a throwaway config dir (its extraction helpers are what is measured)"""
+    config_manager = ConfigManager(config_dir=os.path.join(workdir, 'pipeline'))
+    config_manager.config['webex_digest_enabled'] = False
+    return MeetingPipeline(config_manager, credentials=lambda name: None, log_callback=_quiet)
+
+
+def html_extraction(quick, workdir) -> List[BenchCase]:
+    pipeline = _pipeline(workdir)
+    emails = corpus.notification_corpus(100 if quick else 400)
+
+    def extract_info():
+        for subject, body in emails:
+            pipeline.extract_webex_info_from_body(subject, body)
+
+    def embedded_transcript():
+        for _, body in emails:
+            pipeline.check_for_embedded_transcript(body)
+
+    return [
+        BenchCase('html', 'html.extract_webex_info', extract_info, len(emails)),
+        BenchCase('html', 'html.check_embedded_transcript', embedded_transcript, len(emails)),
+    ]
+
+
+def id_extraction(quick, workdir) -> List[BenchCase]:
+    pipeline = _pipeline(workdir)
+    emails = corpus.notification_corpus(200 if quick else 1000)
+    urls = [body.split('href="', 1)[1].split('"', 1)[0] for _, body in emails]
+    recordings = corpus.recordings_list_json(100 if quick else 1000)
+
+    def recording_ids():
+        for url in urls:
+            pipeline.extract_recording_id(url)
+
+    def meeting_ids():
+        for _, body in emails:
+            pipeline.extract_meeting_id_from_email(body)
+
+    def titles():
+        for subject, _ in emails:
+            pipeline.normalize_title(subject)
+
+    return [
+        BenchCase('ids', 'ids.recording_id', recording_ids, len(urls)),
+        BenchCase('ids', 'ids.meeting_id', meeting_ids, len(emails)),
+        BenchCase('ids', 'ids.normalize_title', titles, len(emails)),
+        BenchCase('ids', 'ids.recordings_list_json', lambda: json.loads(recordings)['items'],
+                  len(json.loads(recordings)['items'])),
+    ]
+
+
+def vtt_parsing(quick, workdir) -> List[BenchCase]:
+    cases = []
+    for minutes in ((5, 30) if quick else (5, 30, 60, 240)):
+        vtt = corpus.vtt_transcript(minutes, seed=minutes)
+        cue_count = len(parse_vtt_cues(vtt))
+        cases.append(BenchCase('vtt', f'vtt.parse.{minutes}min', lambda vtt=vtt: parse_vtt_cues(vtt), cue_count))
+        cases.append(BenchCase('vtt', f'vtt.parse_to_text.{minutes}min',
+                               lambda vtt=vtt: cues_to_text(parse_vtt_cues(vtt)), cue_count))
+    return cases
+
+
+def classification(quick, workdir) -> List[BenchCase]:
+    cases = []
+    for minutes in ((5, 60) if quick else (5, 60, 240)):
+        text = cues_to_text(parse_vtt_cues(corpus.vtt_transcript(minutes, seed=minutes)))
+        cases.append(BenchCase('classify', f'classify.{minutes}min',
+                               lambda text=text: classify_meeting("Backlog Refinement", text)))
+    return cases
+
+
+def prompts(quick, workdir) -> List[BenchCase]:
+    cases = []
+    for minutes in ((30,) if quick else (30, 240)):
+        cues = parse_vtt_cues(corpus.vtt_transcript(minutes, seed=minutes))
+        text = cues_to_text(cues)
+
+        def build(text=text):
+            prompt = get_prompt_builder('mixed')("Backlog Refinement", text)
+            return estimate_tokens(SYSTEM_PROMPT + prompt)
+
+        cases.append(BenchCase('prompt', f'prompt.build_and_estimate.{minutes}min', build))
+        cases.append(BenchCase('prompt', f'prompt.compact.{minutes}min',
+                               lambda cues=cues: compact_transcript(cues), len(cues)))
+    return cases
+
+
+def response_parsing(quick, workdir) -> List[BenchCase]:
+    cases = []
+    size = 10 if quick else 40
+    for style in ('clean', 'fenced', 'trailing_commas', 'truncated'):
+        text = corpus.llm_response(size, size, seed=size, style=style)
+        cases.append(BenchCase('parse', f'parse.{style}.{size * 2}items',
+                               lambda text=text: parse_llm_response(text, 'mixed'), size * 2))
+    return cases
+
+
+def jira_payloads(quick, workdir) -> List[BenchCase]:
+    size = 20 if quick else 100
+    structured = corpus.structured_analysis(size, size, seed=size)
+
+    def build():
+        for draft in drafts_from_structured(structured):
+            build_issue_payload(draft, 'PROJ')
+
+    return [BenchCase('jira', f'jira.payloads.{size * 2}issues', build, size * 2)]
+
+
+def config_state(quick, workdir) -> List[BenchCase]:
+    cases = []
+    for count in ((1_000, 10_000) if quick else (1_000, 10_000, 100_000)):
+        config_dir = os.path.join(workdir, f'state_{count}')
+        config_manager = ConfigManager(config_dir=config_dir)
+        config_manager.config['processed_emails'] = [f"00000000{i:032X}" for i in range(count)]
+        config_manager._reindex()
+        config_manager.save_config()
+        probes = [f"00000000{i:032X}" for i in range(0, 2 * count, max(1, count // 500))]
+        fresh = iter(f"NEW{i:040d}" for i in range(10 ** 9))
+        label = f"{count // 1000}k"
+
+        def lookups(config_manager=config_manager, probes=probes):
+            for entry_id in probes:
+                config_manager.is_email_handled(entry_id)
+
+        cases += [
+            BenchCase('state', f'state.load.{label}', lambda config_dir=config_dir: ConfigManager(config_dir)),
+            BenchCase('state', f'state.is_handled.{label}', lookups, len(probes)),
+            BenchCase('state', f'state.add_processed.{label}',
+                      lambda config_manager=config_manager, fresh=fresh: config_manager.add_processed_email(next(fresh))),
+        ]
+    return cases
+
+
+STAGES: Dict[str, Callable[[bool, str], List[BenchCase]]] = {
+    'html': html_extraction,
+    'ids': id_extraction,
+    'vtt': vtt_parsing,
+    'classify': classification,
+    'prompt': prompts,
+    'parse': response_parsing,
+    'jira': jira_payloads,
+    'state': config_state,
+}
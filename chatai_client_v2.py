@@ -0,0 +1,91 @@
+"""
+Chat AI Client v2.0
+Cisco SSO (client credentials) + Chat AI chat completions, with token reuse
+"""
+
+import base64
+import threading
+import time
+
+from meeting_prompts_v2 import SYSTEM_PROMPT
+from llm_backends_v2 import OpenAICompatibleBackend
+
+DEFAULT_SSO_URL = 'https://id.cisco.com/oauth2/default/v1/token'
+DEFAULT_CHATAI_BASE_URL = 'https://chat-ai.cisco.com/openai/deployments'
+DEFAULT_MODEL = 'gemini-2.5-flash'
+
+
+class ChatAIClient(OpenAICompatibleBackend):
+    """Calls Chat AI, reusing the SSO access token until shortly before it expires"""
+
+    name = "Chat AI API"
+
+    def __init__(self, client_id, client_secret, app_key, model=DEFAULT_MODEL,
+                 base_url=DEFAULT_CHATAI_BASE_URL, sso_url=DEFAULT_SSO_URL,
+                 temperature=0.2, max_tokens=8000, timeout=180, log_callback=None):
+        super().__init__(base_url, model, temperature=temperature, max_tokens=max_tokens,
+                         timeout=timeout, log_callback=log_callback)
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.app_key = app_key
+        self.sso_url = sso_url
+
+        self._token = None
+        self._token_expiry = 0.0
+        self._token_lock = threading.Lock()
+
+    @property
+    def completions_url(self):
+        # One deployment per model
+        return f"{self.base_url}/{self.model}/chat/completions"
+
+    def get_access_token(self):
+        """Get a Chat AI access token from Cisco SSO (cached until near expiry)
+
+        Returns:
+            Access token string or None
+        """
+        with self._token_lock:
+            if self._token and time.time() < self._token_expiry:
+                return self._token
+
+            credentials = f"{self.client_id}:{self.client_secret}"
+            encoded = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
+
+            sso_response = self.session.post(
+                self.sso_url,
+                headers={
+                    'Authorization': f'Basic {encoded}',
+                    'Content-Type': 'application/x-www-form-urlencoded'
+                },
+                data='grant_type=client_credentials',
+                timeout=30
+            )
+
+            if sso_response.status_code != 200:
+                return None
+
+            token_data = sso_response.json()
+            self._token = token_data.get('access_token')
+            # 60s safety margin; SSO tokens are typically valid for an hour
+            self._token_expiry = time.time() + max(0, token_data.get('expires_in', 3600) - 60)
+            return self._token
+
+    def auth_headers(self):
+        access_token = self.get_access_token()
+        if not access_token:
+            self.log("  ✗ SSO authentication failed")
+            return None
+        return {'api-key': access_token}
+
+    def build_payload(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        """Chat completions request body for one prompt"""
+        return {
+            'messages': [
+                {'role': 'system', 'content': system_prompt},
+                {'role': 'user', 'content': user_prompt}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'user': f'{{"appkey": "{self.app_key}"}}'
+        }
@@ -0,0 +1,197 @@
+"""
+Chunked (Map-Reduce) Analysis v2.0
+Splits long transcripts into token-budgeted, overlapping windows on cue/speaker
+boundaries, analyzes the windows in parallel and merges the results.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import re
+
+from transcript_v2 import TranscriptCue, cues_to_text
+from llm_response_parser_v2 import ParseResult
+from meeting_prompts_v2 import build_chunk_user_prompt
+from token_estimator_v2 import estimate_tokens
+
+
+def split_into_windows(
+    cues: List[TranscriptCue],
+    max_tokens: int = 6000,
+    overlap_tokens: int = 300,
+) -> List[List[TranscriptCue]]:
+    """
+    Group cues into windows of at most max_tokens.
+
+    - Cues are never split.
+    - Once a window is 80% full it is closed at the next speaker change,
+      so a speaker's turn is kept together where possible.
+    - Each new window starts with the trailing cues of the previous one,
+      up to overlap_tokens, so items discussed across a boundary are seen whole.
+    """
+    windows: List[List[TranscriptCue]] = []
+    current: List[TranscriptCue] = []
+    current_tokens = 0
+    soft_limit = int(max_tokens * 0.8)
+
+    def overlap_tail(window):
+        tail, tokens = [], 0
+        for cue in reversed(window):
+            cost = estimate_tokens(cue.text)
+            if tokens + cost > overlap_tokens:
+                break
+            tail.insert(0, cue)
+            tokens += cost
+        return tail, tokens
+
+    fresh = 0  # cues in the current window that are not overlap
+    for cue in cues:
+        cost = estimate_tokens(cue.text)
+        speaker_changed = bool(current) and cue.speaker != current[-1].speaker
+
+        if fresh and (
+            current_tokens + cost > max_tokens
+            or (current_tokens >= soft_limit and speaker_changed)
+        ):
+            windows.append(current)
+            current, current_tokens = overlap_tail(current)
+            fresh = 0
+
+        current.append(cue)
+        current_tokens += cost
+        fresh += 1
+
+    if current:
+        windows.append(current)
+
+    return windows
+
+
+# --- Reduce step ------------------------------------------------------------
+
+def _normalize_key(value) -> str:
+    return re.sub(r'[^a-z0-9]+', ' ', str(value or '').lower()).strip()
+
+
+def _merge_list(into: List, items) -> None:
+    for item in items or []:
+        if item not in into:
+            into.append(item)
+
+
+def _merge_item(existing: Dict, new: Dict) -> None:
+    """Fold a duplicate story/action into the one already kept"""
+    for field, value in new.items():
+        if isinstance(value, list):
+            merged = list(existing.get(field) or [])
+            _merge_list(merged, value)
+            existing[field] = merged
+        elif field == 'description':
+            if len(str(value or '')) > len(str(existing.get(field) or '')):
+                existing[field] = value
+        elif existing.get(field) in (None, '') and value not in (None, ''):
+            existing[field] = value
+
+
+def merge_chunk_results(results: List[Dict], meeting_type: str) -> Dict:
+    """
+    Merge per-chunk JSON results into one result, de-duplicating stories by
+    summary and actions by title.
+    """
+    merged = {'meeting_type': meeting_type}
+    for collection, key_field in (('stories', 'summary'), ('actions', 'title')):
+        seen: Dict[str, Dict] = {}
+        ordered: List[Dict] = []
+        present = False
+        for result in results:
+            if collection not in result:
+                continue
+            present = True
+            for item in result.get(collection) or []:
+                if not isinstance(item, dict):
+                    continue
+                key = _normalize_key(item.get(key_field))
+                if key and key in seen:
+                    _merge_item(seen[key], item)
+                    continue
+                copy = dict(item)
+                ordered.append(copy)
+                if key:
+                    seen[key] = copy
+        if present:
+            merged[collection] = ordered
+
+    return merged
+
+
+# --- Map step ---------------------------------------------------------------
+
+class ChunkedAnalyzer:
+    """Runs per-window LLM extraction in parallel and reduces the results"""
+
+    def __init__(
+        self,
+        call_llm: Callable[[str], Optional[str]],
+        parse_response: Callable[[str], ParseResult],
+        max_workers: int = 4,
+        max_chunk_tokens: int = 6000,
+        overlap_tokens: int = 300,
+        log_callback=None,
+    ):
+        """
+        Args:
+            call_llm: Function taking a user prompt, returning the completion text (or None)
+            parse_response: Function turning completion text into a ParseResult
+            max_workers: Maximum concurrent LLM calls
+            max_chunk_tokens: Transcript token budget per window
+            overlap_tokens: Tokens repeated from the previous window
+            log_callback: Function to call for logging
+        """
+        self.call_llm = call_llm
+        self.parse_response = parse_response
+        self.max_workers = max_workers
+        self.max_chunk_tokens = max_chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.log = log_callback or print
+
+    def analyze(self, meeting_title: str, meeting_type: str,
+                cues: List[TranscriptCue]) -> Tuple[Optional[Dict], bool]:
+        """
+        Analyze a long transcript.
+
+        Returns:
+            (merged structured result or None if every window failed,
+             complete: False if any window failed or its JSON was repaired, cut off or salvaged)
+        """
+        windows = split_into_windows(cues, self.max_chunk_tokens, self.overlap_tokens)
+        total = len(windows)
+        self.log(f"  ✂️ Chunked analysis: {total} part(s), up to {self.max_workers} in parallel")
+
+        def run(indexed_window):
+            index, window = indexed_window
+            prompt = build_chunk_user_prompt(
+                meeting_type, meeting_title, cues_to_text(window), index, total
+            )
+            try:
+                output = self.call_llm(prompt)
+                parsed = self.parse_response(output) if output else None
+            except Exception as e:
+                self.log(f"     Part {index}/{total} failed: {str(e)}")
+                return None, False
+            if parsed is None or not isinstance(parsed.data, dict):
+                self.log(f"     Part {index}/{total} returned no usable JSON")
+                return None, False
+            if not parsed.clean:
+                self.log(f"     Part {index}/{total} JSON was repaired or cut off")
+            return parsed.data, parsed.clean
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            results = list(pool.map(run, enumerate(windows, 1)))
+
+        usable = [data for data, _ in results if data is not None]
+        if not usable:
+            return None, False
+        if len(usable) < total:
+            self.log(f"  ⚠ {total - len(usable)} of {total} part(s) failed - result may be incomplete")
+
+        complete = all(clean for _, clean in results)
+        return merge_chunk_results(usable, meeting_type), complete
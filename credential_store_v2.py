@@ -0,0 +1,59 @@
+"""
+Credential Store v2.0
+Looks up secrets without a UI: environment variables first, then the OS
+credential store (keyring, service "Producto") when it is installed.
+
+Store a secret once with:
+    python -c "import keyring; keyring.set_password('Producto', 'chatai_client_secret', '...')"
+"""
+
+from typing import Dict, Optional
+import os
+
+try:
+    import keyring
+    KEYRING_AVAILABLE = True
+except ImportError:
+    KEYRING_AVAILABLE = False
+
+KEYRING_SERVICE = 'Producto'
+
+# Credential name -> environment variable
+CREDENTIAL_ENV = {
+    'webex_access_token': 'WEBEX_ACCESS_TOKEN',
+    'webex_bot_token': 'WEBEX_BOT_TOKEN',
+    'chatai_client_id': 'CHATAI_CLIENT_ID',
+    'chatai_client_secret': 'CHATAI_CLIENT_SECRET',
+    'chatai_app_key': 'CHATAI_APP_KEY',
+    'jira_url': 'JIRA_URL',
+    'jira_email': 'JIRA_EMAIL',
+    'jira_api_token': 'JIRA_API_TOKEN',
+    'jira_project_key': 'JIRA_PROJECT_KEY',
+    'llm_api_key': 'LLM_API_KEY',  # openai LLM backend
+}
+
+
+def get_credential(name) -> Optional[str]:
+    """
+    Look up one credential.
+
+    Args:
+        name: Key of CREDENTIAL_ENV (e.g. 'webex_bot_token')
+
+    Returns:
+        The secret, or None if neither the environment nor keyring has it
+    """
+    value = os.getenv(CREDENTIAL_ENV.get(name, name.upper()))
+    if value:
+        return value
+    if KEYRING_AVAILABLE:
+        try:
+            return keyring.get_password(KEYRING_SERVICE, name) or None
+        except Exception:
+            return None  # No usable keyring backend (e.g. headless Linux)
+    return None
+
+
+def credential_status() -> Dict[str, bool]:
+    """Which credentials are available (never the values themselves)"""
+    return {name: bool(get_credential(name)) for name in CREDENTIAL_ENV}
@@ -0,0 +1,135 @@
+"""
+Delivery Ledger v2.0
+Remembers which Jira issues and Outlook tasks were already created for a
+meeting, so retries and re-processing do not create duplicates.
+
+Entries are keyed by a stable hash of (meeting id, item type, normalized
+title) and map to the created Jira key or Outlook task EntryID.
+"""
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+JIRA = 'jira'
+OUTLOOK_TASK = 'outlook_task'
+
+
+@dataclass
+class DeliveryRecord:
+    key: str
+    target: str             # JIRA or OUTLOOK_TASK
+    external_id: str        # Jira issue key or Outlook EntryID
+    meeting_id: str
+    item_type: str          # e.g. STORY, TASK, action
+    title: str
+    created_at: float
+    updated_at: float
+
+
+def normalize_title(title) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = re.sub(r'[^\w\s]', ' ', str(title or '').lower())
+    return ' '.join(text.split())
+
+
+def meeting_id_for(subject, received_time=None) -> str:
+    """Stable meeting id: subject plus meeting day, so weekly recurrences differ"""
+    meeting_id = ' '.join(str(subject or '').split())
+    if isinstance(received_time, datetime):
+        meeting_id += f"@{received_time:%Y-%m-%d}"
+    elif received_time:
+        meeting_id += f"@{str(received_time)[:10]}"
+    return meeting_id
+
+
+class DeliveryLedger:
+    """Thread-safe JSON ledger of delivered items"""
+
+    def __init__(self, path, log_callback=None):
+        """
+        Args:
+            path: JSON file to keep the ledger in
+            log_callback: Function to call for logging
+        """
+        self.path = path
+        self.log = log_callback or print
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = self._load()
+
+    @staticmethod
+    def make_key(meeting_id, item_type, title) -> str:
+        digest = hashlib.sha256()
+        for part in (meeting_id, str(item_type).lower(), normalize_title(title)):
+            digest.update(str(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def lookup(self, target, meeting_id, item_type, title) -> Optional[DeliveryRecord]:
+        """
+        Find an earlier delivery of the same item.
+
+        Returns:
+            DeliveryRecord or None if the item was never delivered to target
+        """
+        key = self.make_key(meeting_id, item_type, title)
+        with self._lock:
+            entry = self._entries.get(f"{target}:{key}")
+        return DeliveryRecord(**entry) if entry else None
+
+    def record(self, target, meeting_id, item_type, title, external_id) -> DeliveryRecord:
+        """Remember (or refresh) a delivered item and save the ledger"""
+        key = self.make_key(meeting_id, item_type, title)
+        now = time.time()
+        with self._lock:
+            previous = self._entries.get(f"{target}:{key}")
+            record = DeliveryRecord(
+                key=key, target=target, external_id=str(external_id), meeting_id=meeting_id,
+                item_type=str(item_type), title=str(title),
+                created_at=previous['created_at'] if previous else now, updated_at=now
+            )
+            self._entries[f"{target}:{key}"] = asdict(record)
+            self._save_locked()
+        return record
+
+    def forget(self, target, meeting_id, item_type, title) -> bool:
+        """Drop an entry (e.g. the Jira issue or task was deleted)"""
+        key = self.make_key(meeting_id, item_type, title)
+        with self._lock:
+            if self._entries.pop(f"{target}:{key}", None) is None:
+                return False
+            self._save_locked()
+        return True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    # --- Persistence ---------------------------------------------------------
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.log(f"Error loading delivery ledger: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_locked(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.log(f"Error writing delivery ledger: {e}")
@@ -0,0 +1,249 @@
+"""
+Jira Client v2.0
+Creates Jira Cloud issues in bulk (/rest/api/3/issue/bulk, up to 50 per
+request), falling back to parallel single-issue creation when the bulk
+endpoint is unavailable. Every result is mapped back to the position of its
+payload, so callers can tell exactly which selected issue failed and why.
+
+A bulk request whose outcome is unknown (read timeout, 5xx, unreadable
+response) is never repeated one by one: Jira may already have created the
+issues, so its issues are reported as failed and retried via the ledger.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+import base64
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+BULK_LIMIT = 50  # Jira Cloud maximum per bulk request
+
+
+def request_not_sent(error: requests.RequestException) -> bool:
+    """True if the request failed before reaching Jira (DNS, refused connection, connect timeout)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+@dataclass
+class JiraCreateResult:
+    index: int                  # Position in the payload list
+    key: Optional[str] = None   # e.g. "PROJ-123"
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.key is not None
+
+
+def format_jira_error(body) -> str:
+    """Flatten a Jira error body ({"errorMessages": [...], "errors": {...}})"""
+    if not isinstance(body, dict):
+        return str(body)[:200]
+    messages = list(body.get('errorMessages') or [])
+    messages += [f"{field}: {message}" for field, message in (body.get('errors') or {}).items()]
+    return "; ".join(messages) or "Unknown error"
+
+
+class JiraClient:
+    """Minimal Jira Cloud REST client for issue creation"""
+
+    def __init__(self, base_url, email, api_token, max_workers=4, timeout=30, log_callback=None):
+        """
+        Args:
+            base_url: e.g. https://your-domain.atlassian.net
+            email: Jira account email
+            api_token: Jira API token
+            max_workers: Concurrent requests when creating issues one by one
+            timeout: Per-request timeout in seconds
+            log_callback: Function to call for logging
+        """
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.log = log_callback or print
+
+        auth = base64.b64encode(f"{email}:{api_token}".encode('utf-8')).decode('utf-8')
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Basic {auth}',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        })
+        self.bulk_supported = True
+
+    def get_json(self, path: str, params: Optional[Dict] = None):
+        """GET a REST resource; parsed JSON or None on any failure"""
+        try:
+            response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            self.log(f"  ⚠ Jira request failed: {str(e)}")
+            return None
+        if response.status_code != 200:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def create_issues(self, payloads: List[Dict],
+                      on_progress: Optional[Callable[[int, int, JiraCreateResult], None]] = None
+                      ) -> List[JiraCreateResult]:
+        """
+        Create issues, in bulk where possible.
+
+        Args:
+            payloads: Issue payloads ({"fields": {...}}) as for /rest/api/3/issue
+            on_progress: Called with (done, total, result) as each issue is
+                resolved. May be called from worker threads.
+
+        Returns:
+            One JiraCreateResult per payload, in payload order
+        """
+        total = len(payloads)
+        results: List[Optional[JiraCreateResult]] = [None] * total
+        done = [0]
+        lock = threading.Lock()
+
+        def record(result):
+            with lock:
+                results[result.index] = result
+                done[0] += 1
+                count = done[0]
+            if on_progress:
+                on_progress(count, total, result)
+
+        for start in range(0, total, BULK_LIMIT):
+            indexes = list(range(start, min(start + BULK_LIMIT, total)))
+            if self.bulk_supported and len(indexes) > 1:
+                batch_results = self._create_bulk(payloads, indexes)
+                if batch_results is not None:
+                    for result in batch_results:
+                        record(result)
+                    continue
+            self._create_parallel(payloads, indexes, record)
+
+        return results
+
+    # --- Bulk ----------------------------------------------------------------
+
+    def _create_bulk(self, payloads, indexes) -> Optional[List[JiraCreateResult]]:
+        """
+        One bulk request.
+
+        Returns:
+            One result per index, or None if the request provably created
+            nothing and the issues can safely be created one by one
+        """
+        def unknown(reason):
+            self.log(f"  ⚠ Jira bulk request {reason} - issues may exist; check Jira before retrying")
+            return [JiraCreateResult(index, error=f"Bulk create outcome unknown ({reason})") for index in indexes]
+
+        try:
+            response = self.session.post(
+                f"{self.base_url}/rest/api/3/issue/bulk",
+                json={'issueUpdates': [payloads[i] for i in indexes]},
+                timeout=self.timeout * 2
+            )
+        except requests.RequestException as e:
+            if request_not_sent(e):
+                self.log(f"  ⚠ Jira bulk request failed ({str(e)}) - creating issues one by one")
+                return None
+            return unknown(f"failed: {str(e)}")
+
+        if response.status_code in (403, 404, 405):
+            self.bulk_supported = False
+            self.log(f"  ⚠ Jira bulk endpoint unavailable ({response.status_code}) - creating issues one by one")
+            return None
+        if response.status_code >= 500:
+            return unknown(f"returned {response.status_code}")
+        if response.status_code not in (200, 201, 400):
+            # Rejected before anything was created (401, 413, 429, ...)
+            self.log(f"  ⚠ Jira bulk request returned {response.status_code} - creating issues one by one")
+            return None
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            return unknown(f"returned an unreadable {response.status_code} response")
+
+        # Created issues are listed in request order, skipping the failed elements
+        failures = {}
+        for error in body.get('errors') or []:
+            position = error.get('failedElementNumber')
+            if isinstance(position, int) and 0 <= position < len(indexes):
+                failures[position] = format_jira_error(error.get('elementErrors') or error)
+
+        created = iter(body.get('issues') or [])
+        results = []
+        for position, index in enumerate(indexes):
+            if position in failures:
+                results.append(JiraCreateResult(index, error=failures[position]))
+                continue
+            issue = next(created, None)
+            if issue is None:
+                results.append(JiraCreateResult(index, error=f"Not created (HTTP {response.status_code})"))
+            else:
+                results.append(JiraCreateResult(index, key=issue.get('key')))
+        return results
+
+    # --- One by one ------------------------------------------------------------
+
+    def create_issue(self, payload: Dict, index: int = 0) -> JiraCreateResult:
+        """Create a single issue (retries once if Jira rate limits us)"""
+        for attempt in range(2):
+            try:
+                response = self.session.post(f"{self.base_url}/rest/api/3/issue",
+                                             json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                return JiraCreateResult(index, error=str(e))
+
+            if response.status_code == 429 and attempt == 0:
+                try:
+                    delay = float(response.headers.get('Retry-After', 2))
+                except ValueError:
+                    delay = 2.0
+                time.sleep(min(delay, 10))
+                continue
+
+            if response.status_code == 201:
+                return JiraCreateResult(index, key=response.json().get('key', 'Unknown'))
+            try:
+                detail = format_jira_error(response.json())
+            except ValueError:
+                detail = response.text[:100]
+            return JiraCreateResult(index, error=f"{response.status_code} - {detail}")
+
+        return JiraCreateResult(index, error="429 - rate limited")
+
+    def update_issue(self, key: str, payload: Dict, index: int = 0) -> JiraCreateResult:
+        """Overwrite the fields of an existing issue (PUT /rest/api/3/issue/{key})"""
+        fields = {name: value for name, value in payload.get('fields', {}).items()
+                  if name not in ('project', 'issuetype')}
+        try:
+            response = self.session.put(f"{self.base_url}/rest/api/3/issue/{key}",
+                                        json={'fields': fields}, timeout=self.timeout)
+        except requests.RequestException as e:
+            return JiraCreateResult(index, error=str(e))
+
+        if response.status_code in (200, 204):
+            return JiraCreateResult(index, key=key)
+        try:
+            detail = format_jira_error(response.json())
+        except ValueError:
+            detail = response.text[:100]
+        return JiraCreateResult(index, error=f"{response.status_code} - {detail}")
+
+    def _create_parallel(self, payloads, indexes, record) -> None:
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(indexes))) as pool:
+            for result in pool.map(lambda i: self.create_issue(payloads[i], i), indexes):
+                record(result)
@@ -0,0 +1,293 @@
+"""
+Jira Metadata v2.0
+Per-project cache of Jira create metadata (issue types, create-screen fields,
+required fields, allowed option values) and field definitions, persisted
+with a TTL. Field names resolve to IDs locally and payloads are validated
+before they are sent, so a wrong field or value fails fast instead of as a
+400 per issue.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+import json
+import os
+import re
+import threading
+import time
+
+# Field IDs used before metadata lookup existed; fallback when Jira is unreachable
+LEGACY_FIELD_IDS = {
+    'work type': 'customfield_10106',
+    'team': 'customfield_10001',
+    'acceptance criteria': 'customfield_10107',
+}
+
+# Set by the client or by Jira itself; never flagged as missing
+IMPLICIT_FIELDS = ('project', 'issuetype', 'reporter')
+
+
+@dataclass
+class JiraProjectMetadata:
+    project_key: str
+    fetched_at: float
+    fields: Dict[str, Dict] = field(default_factory=dict)       # id -> {name, type, custom}
+    issue_types: Dict[str, Dict] = field(default_factory=dict)  # name -> {id, fields: {id: {...}}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'JiraProjectMetadata':
+        return cls(**data)
+
+
+class JiraMetadataCache:
+    """Fetches createmeta and field definitions once per project, kept for ttl_hours"""
+
+    def __init__(self, cache_dir, ttl_hours=24, log_callback=None):
+        """
+        Args:
+            cache_dir: Directory to persist metadata in
+            ttl_hours: Refetch metadata older than this
+            log_callback: Function to call for logging
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.log = log_callback or print
+        self._lock = threading.Lock()
+        self._memory: Dict[str, JiraProjectMetadata] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, base_url, project_key):
+        site = re.sub(r'[^\w.-]', '_', re.sub(r'^https?://', '', base_url.rstrip('/')))
+        return os.path.join(self.cache_dir, f"{site}_{project_key.upper()}.json")
+
+    def get(self, client, project_key, refresh=False) -> Optional[JiraProjectMetadata]:
+        """
+        Metadata for a project, from memory, disk or Jira (in that order).
+
+        Args:
+            client: JiraClient used when the metadata has to be fetched
+            project_key: Jira project key
+            refresh: Ignore cached metadata
+
+        Returns:
+            JiraProjectMetadata or None if it could not be fetched
+        """
+        path = self._path(client.base_url, project_key)
+        with self._lock:
+            if not refresh:
+                metadata = self._memory.get(path) or self._load(path)
+                if metadata and time.time() - metadata.fetched_at < self.ttl_seconds:
+                    self._memory[path] = metadata
+                    return metadata
+
+            metadata = self._fetch(client, project_key)
+            if metadata is None:
+                return None
+            self._memory[path] = metadata
+            self._save(path, metadata)
+            return metadata
+
+    def invalidate(self, client, project_key) -> None:
+        path = self._path(client.base_url, project_key)
+        with self._lock:
+            self._memory.pop(path, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # --- Fetching ------------------------------------------------------------
+
+    def _fetch(self, client, project_key) -> Optional[JiraProjectMetadata]:
+        self.log(f"  Fetching Jira metadata for project {project_key}...")
+        all_fields = client.get_json("/rest/api/3/field")
+        if not isinstance(all_fields, list):
+            self.log("  ⚠ Could not fetch Jira field definitions")
+            return None
+
+        metadata = JiraProjectMetadata(project_key=project_key, fetched_at=time.time())
+        for item in all_fields:
+            metadata.fields[item.get('id')] = {
+                'name': item.get('name', ''),
+                'type': (item.get('schema') or {}).get('type', ''),
+                'custom': bool(item.get('custom')),
+            }
+
+        issue_types = self._fetch_issue_types(client, project_key)
+        if issue_types is None:
+            self.log(f"  ⚠ Could not fetch Jira create metadata for {project_key}")
+            return None
+        metadata.issue_types = issue_types
+        self.log(f"  ✓ Jira metadata: {len(metadata.fields)} field(s), "
+                 f"{len(issue_types)} issue type(s) in {project_key}")
+        return metadata
+
+    def _fetch_issue_types(self, client, project_key) -> Optional[Dict[str, Dict]]:
+        """Create-screen fields per issue type (current API, then the legacy expand form)"""
+        listing = client.get_json(f"/rest/api/3/issue/createmeta/{project_key}/issuetypes")
+        if isinstance(listing, dict) and 'issueTypes' in listing:
+            issue_types = {}
+            for issue_type in listing['issueTypes']:
+                detail = client.get_json(
+                    f"/rest/api/3/issue/createmeta/{project_key}/issuetypes/{issue_type['id']}",
+                    params={'maxResults': 200})
+                if not isinstance(detail, dict):
+                    return None
+                issue_types[issue_type['name']] = {
+                    'id': issue_type['id'],
+                    'fields': {f['fieldId']: self._field_meta(f) for f in detail.get('fields', [])}
+                }
+            return issue_types
+
+        legacy = client.get_json("/rest/api/3/issue/createmeta",
+                                 params={'projectKeys': project_key, 'expand': 'projects.issuetypes.fields'})
+        if not isinstance(legacy, dict) or not legacy.get('projects'):
+            return None
+        return {
+            issue_type['name']: {
+                'id': issue_type['id'],
+                'fields': {field_id: self._field_meta(meta)
+                           for field_id, meta in issue_type.get('fields', {}).items()}
+            }
+            for issue_type in legacy['projects'][0].get('issuetypes', [])
+        }
+
+    @staticmethod
+    def _field_meta(meta: Dict) -> Dict:
+        allowed = []
+        for value in meta.get('allowedValues') or []:
+            label = value.get('value') or value.get('name')
+            if label:
+                allowed.append(label)
+        return {
+            'name': meta.get('name', ''),
+            'required': bool(meta.get('required')) and not meta.get('hasDefaultValue'),
+            'allowed': allowed,
+        }
+
+    # --- Persistence ---------------------------------------------------------
+
+    def _load(self, path) -> Optional[JiraProjectMetadata]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return JiraProjectMetadata.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _save(self, path, metadata) -> None:
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(metadata), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.log(f"Error writing Jira metadata cache: {e}")
+
+
+class FieldResolver:
+    """Resolves field names to IDs and validates payloads against project metadata"""
+
+    def __init__(self, metadata: Optional[JiraProjectMetadata] = None):
+        """
+        Args:
+            metadata: Project metadata; None resolves through LEGACY_FIELD_IDS
+                and skips validation
+        """
+        self.metadata = metadata
+        self._by_name: Dict[str, List[str]] = {}
+        self._warned = set()
+        if metadata:
+            for field_id, info in metadata.fields.items():
+                self._by_name.setdefault(info['name'].strip().lower(), []).append(field_id)
+
+    def screen_fields(self, issue_type: str) -> Optional[Dict[str, Dict]]:
+        if not self.metadata:
+            return None
+        info = self.metadata.issue_types.get(issue_type)
+        if info is None:
+            for name, candidate in self.metadata.issue_types.items():
+                if name.lower() == str(issue_type).lower():
+                    info = candidate
+                    break
+        return info['fields'] if info else None
+
+    def resolve(self, name_or_id: str, issue_type: Optional[str] = None) -> Optional[str]:
+        """
+        Field ID for a field name (case-insensitive) or ID.
+
+        When several fields share a name, the one on the issue type's create
+        screen wins.
+        """
+        key = str(name_or_id).strip()
+        if not self.metadata:
+            if key.startswith('customfield_') or key in IMPLICIT_FIELDS:
+                return key
+            return LEGACY_FIELD_IDS.get(key.lower())
+
+        if key in self.metadata.fields:
+            return key
+        candidates = self._by_name.get(key.lower(), [])
+        screen = self.screen_fields(issue_type) if issue_type else None
+        if screen:
+            on_screen = [field_id for field_id in candidates if field_id in screen]
+            if on_screen:
+                return on_screen[0]
+        return candidates[0] if candidates else None
+
+    def resolve_values(self, values: Dict, issue_type: Optional[str] = None) -> Tuple[Dict, List[str]]:
+        """
+        Map {field name or ID: value} to {field ID: value}.
+
+        Fields that do not exist, or are not on the issue type's create screen,
+        are dropped with a warning instead of failing the whole request. Each
+        warning is only returned once per resolver.
+
+        Returns:
+            (resolved values, new warnings)
+        """
+        resolved, warnings = {}, []
+        screen = self.screen_fields(issue_type) if issue_type else None
+        for name, value in (values or {}).items():
+            field_id = self.resolve(name, issue_type)
+            if not field_id:
+                warnings.append(f"Unknown Jira field '{name}'")
+            elif screen is not None and field_id not in screen:
+                warnings.append(f"Field '{name}' ({field_id}) is not on the {issue_type} create screen")
+            else:
+                resolved[field_id] = value
+        warnings = [warning for warning in warnings if warning not in self._warned]
+        self._warned.update(warnings)
+        return resolved, warnings
+
+    def validate(self, payload: Dict) -> List[str]:
+        """
+        Check an issue payload before it is sent.
+
+        Returns:
+            List of problems (empty if the payload looks valid or no metadata is loaded)
+        """
+        if not self.metadata:
+            return []
+        fields = payload.get('fields', {})
+        issue_type = (fields.get('issuetype') or {}).get('name', '')
+        screen = self.screen_fields(issue_type)
+        if screen is None:
+            return [f"Issue type '{issue_type}' does not exist in project {self.metadata.project_key}"]
+
+        errors = []
+        for field_id, meta in screen.items():
+            if meta['required'] and field_id not in IMPLICIT_FIELDS and not fields.get(field_id):
+                errors.append(f"Missing required field '{meta['name']}' ({field_id})")
+
+        for field_id, value in fields.items():
+            if field_id in IMPLICIT_FIELDS:
+                continue
+            meta = screen.get(field_id)
+            if meta is None:
+                errors.append(f"Field {field_id} is not on the {issue_type} create screen")
+                continue
+            if meta['allowed'] and isinstance(value, dict):
+                label = value.get('value') or value.get('name')
+                if label and label not in meta['allowed']:
+                    errors.append(f"'{label}' is not an allowed value for '{meta['name']}' "
+                                  f"(allowed: {', '.join(meta['allowed'][:5])})")
+        return errors
@@ -0,0 +1,225 @@
+"""
+Jira Payloads v2.0
+Builds Jira issue payloads (Atlassian Document Format) straight from the
+structured stories/actions returned by the analysis, instead of rendering
+them to markdown and re-parsing that text.
+
+Acceptance criteria become a real ADF bullet list. The markdown parser
+(draft_from_text) is kept for completions that never produced valid JSON.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import re
+
+from jira_metadata_v2 import FieldResolver
+
+SUMMARY_LIMIT = 255        # Jira summary limit
+TEXT_LIMIT = 32000         # Jira rich-text field limit
+ESTIMATE_FIELD_NAMES = ('Story point estimate', 'Story Points')
+
+
+@dataclass
+class JiraIssueDraft:
+    issue_type: str                      # "Story" or "Task"
+    summary: str
+    description: str = ""
+    acceptance_criteria: List[str] = field(default_factory=list)
+    labels: List[str] = field(default_factory=list)
+    estimate_points: Optional[int] = None
+    assignees: List[str] = field(default_factory=list)
+    owner: Optional[str] = None
+    due_date_hint: Optional[str] = None
+    related_decision: Optional[str] = None
+
+    def to_text(self) -> str:
+        """Readable rendering for review (same layout as the markdown analysis)"""
+        lines = [f"### [{self.issue_type.upper()}] {self.summary}", "", "**Description:**",
+                 self.description or "-"]
+        if self.acceptance_criteria:
+            lines += ["", "**Acceptance Criteria:**"] + [f"- {item}" for item in self.acceptance_criteria]
+        details = []
+        if self.estimate_points is not None:
+            details.append(f"**Estimate:** {self.estimate_points} point(s)")
+        if self.assignees:
+            details.append(f"**Assignees:** {', '.join(self.assignees)}")
+        if self.owner:
+            details.append(f"**Owner:** {self.owner}")
+        if self.due_date_hint:
+            details.append(f"**Due:** {self.due_date_hint}")
+        if self.related_decision:
+            details.append(f"**Related Decision:** {self.related_decision}")
+        if self.labels:
+            details.append(f"**Labels:** {', '.join(self.labels)}")
+        if details:
+            lines += [""] + details
+        return "\n".join(lines)
+
+
+def drafts_from_structured(structured_data: Optional[Dict]) -> List[JiraIssueDraft]:
+    """Stories become Jira Stories, action items become Tasks"""
+    drafts = []
+    for story in (structured_data or {}).get('stories', []):
+        drafts.append(JiraIssueDraft(
+            issue_type="Story",
+            summary=story.get('summary') or "Untitled story",
+            description=story.get('description') or "",
+            acceptance_criteria=[str(item) for item in story.get('acceptance_criteria') or [] if item],
+            labels=list(story.get('labels') or []),
+            estimate_points=story.get('estimate_points'),
+            assignees=list(story.get('assignees') or []),
+        ))
+    for action in (structured_data or {}).get('actions', []):
+        drafts.append(JiraIssueDraft(
+            issue_type="Task",
+            summary=action.get('title') or "Untitled task",
+            description=action.get('description') or "",
+            owner=action.get('owner'),
+            due_date_hint=action.get('due_date_hint'),
+            related_decision=action.get('related_decision'),
+        ))
+    return drafts
+
+
+def draft_from_text(issue_text: str) -> JiraIssueDraft:
+    """
+    Parse one "### [STORY|TASK] title" block of a markdown analysis.
+
+    Raises:
+        ValueError: if the block has no issue header
+    """
+    header_match = re.search(r'###\s+(?:\d+\.\s+)?\[(STORY|TASK)\]\s+(.+?)(?:\n|$)', issue_text)
+    if not header_match:
+        raise ValueError("Could not parse issue header")
+
+    description_match = re.search(r'\*\*Description:\*\*\s*\n(.+?)(?:\n\n\*\*|$)', issue_text, re.DOTALL)
+    criteria_match = re.search(r'\*\*Acceptance Criteria:\*\*\s*\n(.+?)(?:\n\n\*\*|$)', issue_text, re.DOTALL)
+
+    criteria = []
+    if criteria_match:
+        for line in criteria_match.group(1).splitlines():
+            line = re.sub(r'^\s*(?:[-*•]|\d+[.)])\s*', '', line).strip()
+            if line:
+                criteria.append(line)
+
+    return JiraIssueDraft(
+        issue_type="Story" if header_match.group(1) == "STORY" else "Task",
+        summary=header_match.group(2).strip(),
+        description=description_match.group(1).strip() if description_match else issue_text,
+        acceptance_criteria=criteria,
+    )
+
+
+# --- ADF ---------------------------------------------------------------------
+
+def adf_text(text: str) -> Dict:
+    return {"type": "text", "text": text}
+
+
+def adf_paragraph(text: str) -> Dict:
+    return {"type": "paragraph", "content": [adf_text(text)] if text else []}
+
+
+def adf_bullet_list(items: List[str]) -> Dict:
+    return {
+        "type": "bulletList",
+        "content": [{"type": "listItem", "content": [adf_paragraph(item)]} for item in items]
+    }
+
+
+def adf_doc(blocks: List[Dict]) -> Dict:
+    return {"type": "doc", "version": 1, "content": blocks or [adf_paragraph("")]}
+
+
+def _paragraphs(text: str) -> List[Dict]:
+    return [adf_paragraph(block.strip()) for block in re.split(r'\n\s*\n', text or '') if block.strip()]
+
+
+def _text_length(node: Dict) -> int:
+    return len(node.get('text', '')) + sum(_text_length(child) for child in node.get('content', []))
+
+
+def _truncate_blocks(blocks: List[Dict], limit: int = TEXT_LIMIT) -> List[Dict]:
+    """Keep whole blocks while the text fits the field limit"""
+    kept, used = [], 0
+    for block in blocks:
+        size = _text_length(block)
+        if kept and used + size > limit:
+            break
+        kept.append(block)
+        used += size
+    return kept
+
+
+# --- Payloads ----------------------------------------------------------------
+
+def build_issue_payload(draft: JiraIssueDraft, project_key: str,
+                        custom_field_values: Optional[Dict] = None,
+                        resolver: Optional[FieldResolver] = None,
+                        acceptance_criteria_field: str = 'Acceptance Criteria') -> Tuple[Dict, List[str]]:
+    """
+    Build a /rest/api/3/issue payload for one draft.
+
+    Args:
+        draft: Issue to create
+        project_key: Jira project key
+        custom_field_values: {field name or ID: value} set on every issue
+        resolver: FieldResolver for the project (None = legacy field IDs)
+        acceptance_criteria_field: Name or ID of the acceptance criteria field
+
+    Returns:
+        (payload, warnings about fields that could not be set)
+    """
+    resolver = resolver or FieldResolver()
+    screen = resolver.screen_fields(draft.issue_type)
+
+    def on_screen(field_id):
+        return bool(field_id) and (screen is None or field_id in screen)
+
+    description = _paragraphs(draft.description[:TEXT_LIMIT])
+    details = []
+    if draft.assignees:
+        details.append(f"Assignees: {', '.join(draft.assignees)}")
+    if draft.owner:
+        details.append(f"Owner: {draft.owner}")
+    if draft.due_date_hint:
+        details.append(f"Due: {draft.due_date_hint}")
+    if draft.related_decision:
+        details.append(f"Related Decision: {draft.related_decision}")
+    if details:
+        description.append(adf_bullet_list(details))
+
+    fields = {
+        "project": {"key": project_key},
+        "summary": draft.summary[:SUMMARY_LIMIT],
+        "issuetype": {"name": draft.issue_type},
+    }
+
+    # Acceptance criteria go in their own field when the project has one,
+    # otherwise they are appended to the description
+    if draft.acceptance_criteria:
+        criteria_field = resolver.resolve(acceptance_criteria_field, draft.issue_type)
+        if on_screen(criteria_field):
+            fields[criteria_field] = adf_doc([adf_bullet_list(draft.acceptance_criteria)])
+        else:
+            description += [adf_paragraph("Acceptance Criteria:"), adf_bullet_list(draft.acceptance_criteria)]
+
+    fields["description"] = adf_doc(_truncate_blocks(description))
+
+    if draft.labels and on_screen('labels'):
+        # Jira labels cannot contain spaces
+        fields["labels"] = [re.sub(r'\s+', '-', label.strip()) for label in draft.labels if label.strip()]
+
+    if draft.estimate_points is not None and resolver.metadata:
+        for name in ESTIMATE_FIELD_NAMES:
+            estimate_field = resolver.resolve(name, draft.issue_type)
+            if on_screen(estimate_field):
+                fields[estimate_field] = draft.estimate_points
+                break
+
+    values = {key: value for key, value in (custom_field_values or {}).items()
+              if not key.startswith('__')}  # Skip internal tracking keys
+    resolved, warnings = resolver.resolve_values(values, draft.issue_type)
+    fields.update(resolved)
+
+    return {"fields": fields}, warnings
@@ -0,0 +1,411 @@
+"""
+LLM Backends v2.0
+One interface for every way the analysis pipeline can get a completion:
+
+- chatai  : Cisco Chat AI (SSO client credentials), see chatai_client_v2
+- openai  : Any OpenAI-compatible /chat/completions endpoint (bearer key)
+- stub    : In-process canned completions with simulated latency / errors
+- replay  : Completions played back from a recording (JSONL)
+
+Any backend can also record its completions for later replay.
+Selected by AnalysisConfig.llm_backend (see create_backend).
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import requests
+
+from meeting_prompts_v2 import SYSTEM_PROMPT
+from llm_stream_parser_v2 import iter_completion_deltas, stream_items
+from token_estimator_v2 import estimate_tokens
+
+BACKENDS = ('chatai', 'openai', 'stub', 'replay')
+
+# Responses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = (429, 503)
+
+
+class LLMThrottled(Exception):
+    """The endpoint asked us to back off (429 / 503); the request may be retried"""
+
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"throttled ({status})")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMBackend:
+    """Base class: complete() must be implemented, streaming falls back to it"""
+
+    name = "LLM"
+
+    def __init__(self, log_callback=None):
+        self.log = log_callback or print
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        """Send one prompt
+
+        Returns:
+            Completion text or None if the request failed
+
+        Raises:
+            LLMThrottled: The endpoint is rate limiting / overloaded
+        """
+        raise NotImplementedError
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT):
+        """Send one prompt, handing each story/action to on_item(collection, item)
+
+        Returns:
+            Full completion text or None if the request failed
+        """
+        text = self.complete(user_prompt, system_prompt)
+        if text is None:
+            return None
+        return stream_items([text], self._safe_callback(on_item))
+
+    def _safe_callback(self, on_item):
+        if not on_item:
+            return None
+
+        def deliver(collection, item):
+            try:
+                on_item(collection, item)
+            except Exception as e:
+                self.log(f"  Error handling streamed item from '{collection}': {str(e)}")
+
+        return deliver
+
+
+# --- HTTP ----------------------------------------------------------------------
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Chat completions over HTTP with a bearer key (OpenAI, vLLM, Ollama, LiteLLM...)"""
+
+    name = "LLM API"
+
+    def __init__(self, base_url, model, api_key=None, temperature=0.2, max_tokens=8000,
+                 timeout=180, log_callback=None):
+        super().__init__(log_callback)
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.api_key = api_key
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    @property
+    def completions_url(self):
+        return f"{self.base_url}/chat/completions"
+
+    def auth_headers(self):
+        """Headers that authenticate a request (None if authentication failed)"""
+        return {'Authorization': f'Bearer {self.api_key}'} if self.api_key else {}
+
+    def build_payload(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        """Chat completions request body for one prompt"""
+        return {
+            'model': self.model,
+            'messages': [
+                {'role': 'system', 'content': system_prompt},
+                {'role': 'user', 'content': user_prompt}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+        }
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        headers = self.auth_headers()
+        if headers is None:
+            return None
+
+        response = self.session.post(
+            self.completions_url,
+            headers={'Content-Type': 'application/json', **headers},
+            json=self.build_payload(user_prompt, system_prompt),
+            timeout=self.timeout
+        )
+
+        if response.status_code in THROTTLE_STATUSES:
+            raise LLMThrottled(response.status_code, _retry_after(response))
+        if response.status_code != 200:
+            self.log(f"  ✗ {self.name} failed: {response.status_code}")
+            return None
+
+        return response.json()['choices'][0]['message']['content']
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT):
+        """Send one prompt as a streaming (SSE) completion
+
+        Each story/action object is handed to on_item(collection, item) as soon
+        as the model has finished writing it, before the completion is done.
+
+        Returns:
+            Full completion text or None if the request failed
+        """
+        headers = self.auth_headers()
+        if headers is None:
+            return None
+
+        payload = self.build_payload(user_prompt, system_prompt)
+        payload['stream'] = True
+        deliver = self._safe_callback(on_item)
+
+        with self.session.post(
+            self.completions_url,
+            headers={'Content-Type': 'application/json', **headers},
+            json=payload,
+            timeout=self.timeout,
+            stream=True
+        ) as response:
+            if response.status_code in THROTTLE_STATUSES:
+                raise LLMThrottled(response.status_code, _retry_after(response))
+            if response.status_code != 200:
+                self.log(f"  ✗ {self.name} failed: {response.status_code}")
+                return None
+
+            # Endpoint ignored "stream" and answered in one piece
+            if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                content = response.json()['choices'][0]['message']['content']
+                return stream_items([content], deliver)
+
+            return stream_items(iter_completion_deltas(response.iter_lines()), deliver)
+
+
+# --- Offline -------------------------------------------------------------------
+
+_MEETING_TYPE = re.compile(r'meeting_type:\s*"(\w+)"')
+_MEETING_TITLE = re.compile(r'Meeting title:\s*"([^"]*)"')
+_BATCH_KEY = re.compile(r'^=== MEETING (\S+) ===$', re.MULTILINE)
+
+
+def _canned_analysis(prompt):
+    meeting_type = (_MEETING_TYPE.search(prompt) or [None, "mixed"])[1]
+    title = (_MEETING_TITLE.search(prompt) or [None, "Meeting"])[1]
+    result = {'meeting_type': meeting_type}
+    if meeting_type in ('refinement', 'mixed'):
+        result['stories'] = [{
+            'summary': f"Follow-up story from {title}",
+            'description': "Canned story returned by the offline LLM backend.",
+            'acceptance_criteria': ["Given the stub backend, when analysis runs, then this story is returned"],
+            'estimate_points': 3,
+            'assignees': [],
+            'labels': ["AIGen-ReviewRqd"],
+        }]
+    if meeting_type in ('general', 'mixed'):
+        result['actions'] = [{
+            'title': f"Send notes for {title}",
+            'description': "Canned action returned by the offline LLM backend.",
+            'owner': None,
+            'due_date_hint': None,
+            'related_decision': None,
+        }]
+    return result
+
+
+def canned_completion(user_prompt):
+    """
+    Deterministic completion in the shape the prompt asks for (single,
+    chunked or batched prompts). Used by StubBackend and mock_server_v2.
+    """
+    keys = _BATCH_KEY.findall(user_prompt)
+    if keys:
+        sections = re.split(r'^=== (?:END )?MEETING \S+ ===$', user_prompt, flags=re.MULTILINE)
+        # split gives [preamble, m1, between, m2, ...]
+        prompts = sections[1::2]
+        data = {key: _canned_analysis(prompt) for key, prompt in zip(keys, prompts)}
+    else:
+        data = _canned_analysis(user_prompt)
+    return "```json\n" + json.dumps(data, indent=2) + "\n```"
+
+
+# Roughly one token: a run of up to 4 word characters or one other character,
+# with the whitespace in front of it
+_TOKEN_PIECE = re.compile(r'\s*(?:\w{1,4}|[^\w\s])|\s+')
+
+
+class StubBackend(LLMBackend):
+    """Canned completions with simulated latency, token rate and error rate
+
+    Output is produced in token-sized pieces paced by tokens_per_sec, so
+    stream_complete hands items on as they close (time-to-first-item).
+    """
+
+    name = "Stub LLM"
+
+    def __init__(self, latency_ms=0, tokens_per_sec=0, error_rate=0.0, seed=None, log_callback=None):
+        """
+        Args:
+            latency_ms: Delay before the first token
+            tokens_per_sec: Output speed (0 = instant)
+            error_rate: Fraction of calls that are throttled with a 429 (0.0 - 1.0)
+            seed: Random seed for reproducible error injection
+            log_callback: Function to call for logging
+        """
+        super().__init__(log_callback)
+        self.latency_ms = latency_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        return ''.join(self._generate(user_prompt))
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT):
+        return stream_items(self._generate(user_prompt), self._safe_callback(on_item))
+
+    def _generate(self, user_prompt):
+        """Wait out the latency (or throw the injected 429), then yield the completion piece by piece"""
+        with self._lock:
+            self.calls += 1
+            failed = self._random.random() < self.error_rate
+
+        time.sleep(self.latency_ms / 1000.0)
+        if failed:
+            raise LLMThrottled(429)
+
+        text = canned_completion(user_prompt)
+        if not self.tokens_per_sec:
+            yield text
+            return
+
+        pieces = _TOKEN_PIECE.findall(text)
+        interval = estimate_tokens(text) / self.tokens_per_sec / max(1, len(pieces))
+        started = time.monotonic()
+        for count, piece in enumerate(pieces, 1):
+            yield piece
+            # Sleep against a deadline so short sleeps don't add up to drift
+            wait = started + count * interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+
+def prompt_key(user_prompt, system_prompt=SYSTEM_PROMPT):
+    """Recording key for one request"""
+    return hashlib.sha256(f"{system_prompt}\n\n{user_prompt}".encode('utf-8')).hexdigest()
+
+
+class ReplayBackend(LLMBackend):
+    """Plays back completions recorded by RecordingBackend"""
+
+    name = "Replay"
+
+    def __init__(self, recording_path, fallback=None, log_callback=None):
+        """
+        Args:
+            recording_path: JSONL file written by RecordingBackend
+            fallback: Backend to use for prompts that were never recorded (optional)
+            log_callback: Function to call for logging
+        """
+        super().__init__(log_callback)
+        self.recording_path = recording_path
+        self.fallback = fallback
+        self.recordings = {}
+        if os.path.exists(recording_path):
+            with open(recording_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.recordings[entry['key']] = entry['completion']
+                    except (ValueError, KeyError):
+                        continue
+        self.log(f"  ▶ Replay: {len(self.recordings)} recorded completion(s) from {recording_path}")
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        completion = self.recordings.get(prompt_key(user_prompt, system_prompt))
+        if completion is not None:
+            return completion
+        if self.fallback is not None:
+            return self.fallback.complete(user_prompt, system_prompt)
+        self.log(f"  ✗ {self.name}: no recording for this prompt")
+        return None
+
+
+class RecordingBackend(LLMBackend):
+    """Wraps another backend and appends every successful completion to a JSONL file"""
+
+    def __init__(self, inner, recording_path, log_callback=None):
+        super().__init__(log_callback)
+        self.inner = inner
+        self.name = inner.name
+        self.recording_path = recording_path
+        self._lock = threading.Lock()
+
+    def _record(self, user_prompt, system_prompt, completion):
+        if completion is None:
+            return
+        line = json.dumps({
+            'key': prompt_key(user_prompt, system_prompt),
+            'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'completion': completion,
+        })
+        with self._lock:
+            with open(self.recording_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        completion = self.inner.complete(user_prompt, system_prompt)
+        self._record(user_prompt, system_prompt, completion)
+        return completion
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT):
+        completion = self.inner.stream_complete(user_prompt, on_item, system_prompt)
+        self._record(user_prompt, system_prompt, completion)
+        return completion
+
+
+# --- Factory -------------------------------------------------------------------
+
+def create_backend(config, log_callback=None):
+    """
+    Build the backend selected by config.llm_backend.
+
+    Args:
+        config: AnalysisConfig
+        log_callback: Function to call for logging
+
+    Returns:
+        LLMBackend
+    """
+    kind = (config.llm_backend or 'chatai').lower()
+    if kind == 'openai':
+        backend = OpenAICompatibleBackend(
+            config.llm_base_url, config.model, api_key=config.llm_api_key,
+            temperature=config.temperature, max_tokens=config.max_tokens,
+            log_callback=log_callback
+        )
+    elif kind == 'stub':
+        backend = StubBackend(latency_ms=config.stub_latency_ms, tokens_per_sec=config.stub_tokens_per_sec,
+                              error_rate=config.stub_error_rate, log_callback=log_callback)
+    elif kind == 'replay':
+        backend = ReplayBackend(config.llm_replay_path, log_callback=log_callback)
+    elif kind == 'chatai':
+        from chatai_client_v2 import ChatAIClient
+        backend = ChatAIClient(
+            config.chatai_client_id, config.chatai_client_secret, config.chatai_app_key,
+            model=config.model, base_url=config.chatai_base_url, sso_url=config.sso_url,
+            temperature=config.temperature, max_tokens=config.max_tokens,
+            log_callback=log_callback
+        )
+    else:
+        raise ValueError(f"Unknown LLM backend '{config.llm_backend}' (expected one of {', '.join(BACKENDS)})")
+
+    if config.llm_record_path:
+        backend = RecordingBackend(backend, config.llm_record_path, log_callback=log_callback)
+    return backend
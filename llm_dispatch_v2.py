@@ -0,0 +1,241 @@
+"""
+LLM Dispatch v2.0
+Coalesces small, concurrent analysis requests into one multi-meeting Chat AI
+call (one SSO token check, one TLS round trip, one request overhead), then
+splits the keyed JSON response back out per meeting.
+
+Requests that are too large, or that would push a batch over its token
+budget, are sent on their own. Anything missing from a batch response is
+retried as a single request.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import itertools
+import json
+import threading
+import time
+
+from meeting_prompts_v2 import build_batch_user_prompt
+from llm_response_parser_v2 import find_json_span, strip_trailing_commas, value_end
+from token_estimator_v2 import estimate_tokens
+
+
+@dataclass
+class DispatchRequest:
+    key: str
+    user_prompt: str
+    tokens: int
+    priority: int = 0
+    future: Future = field(default_factory=Future)
+
+
+def split_batch_response(text: Optional[str], keys: List[str]) -> Dict[str, str]:
+    """
+    Split a keyed multi-meeting completion into per-meeting JSON strings.
+
+    If the document does not parse (e.g. it was cut off at max_tokens), only
+    the meeting objects that closed are kept; a partial one is left out so
+    its meeting is retried on its own instead of silently losing items.
+
+    Returns:
+        {meeting id: JSON text} for every complete meeting in the response
+    """
+    if not text:
+        return {}
+    start, end = find_json_span(text)
+    if start == -1:
+        return {}
+
+    fragment = text[start:end]
+    try:
+        data = json.loads(fragment)
+    except ValueError:
+        try:
+            data = json.loads(strip_trailing_commas(fragment))
+        except ValueError:
+            data = _closed_members(fragment)
+    if not isinstance(data, dict):
+        return {}
+
+    return {key: json.dumps(data[key]) for key in keys if isinstance(data.get(key), dict)}
+
+
+def _closed_members(fragment: str) -> Dict:
+    """Top-level "key": {...} members of a broken JSON object whose value closed"""
+    decoder = json.JSONDecoder()
+    members = {}
+    if not fragment.startswith('{'):
+        return members
+
+    i = 1
+    try:
+        while True:
+            while i < len(fragment) and fragment[i] in ' \t\r\n,':
+                i += 1
+            if i >= len(fragment) or fragment[i] == '}':
+                break
+            key, i = decoder.raw_decode(fragment, i)
+            while fragment[i] in ' \t\r\n:':
+                i += 1
+            if fragment[i] in '{[':
+                end = value_end(fragment, i)
+                if end == -1:
+                    break  # Cut off inside this value
+                try:
+                    members[key] = json.loads(strip_trailing_commas(fragment[i:end + 1]))
+                except ValueError:
+                    pass  # Malformed inside; that meeting is retried
+                i = end + 1
+            else:
+                _, i = decoder.raw_decode(fragment, i)
+    except (ValueError, IndexError):
+        pass
+    return members
+
+
+class BatchingDispatcher:
+    """
+    Sends completions through a client, batching small concurrent requests.
+
+    complete() blocks the caller until its own result is available. A batch
+    is sent when it is full (max_batch_size), when the next request would not
+    fit max_batch_tokens, or max_wait_ms after its first request arrived.
+    """
+
+    def __init__(self, client, max_batch_size=4, max_wait_ms=500, max_batch_tokens=12000,
+                 max_request_tokens=3000, model=None, max_parallel_batches=2, log_callback=None):
+        """
+        Args:
+            client: Object with complete(user_prompt) -> text or None (e.g. ChatAIClient)
+            max_batch_size: Most meetings in one request
+            max_wait_ms: How long the first request in a batch waits for company
+            max_batch_tokens: Token budget for a combined prompt
+            max_request_tokens: Larger requests are never batched
+            model: Model name for token estimates
+            max_parallel_batches: Batches in flight at once
+            log_callback: Function to call for logging
+        """
+        self.client = client
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0, max_wait_ms) / 1000.0
+        self.max_batch_tokens = max_batch_tokens
+        self.max_request_tokens = max_request_tokens
+        self.model = model
+        self.log = log_callback or print
+
+        self._pending: List[DispatchRequest] = []
+        self._pending_tokens = 0
+        self._deadline = 0.0
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_parallel_batches))
+
+        self.batches_sent = 0
+        self.meetings_batched = 0
+        self.single_requests = 0
+
+    def complete(self, user_prompt: str, priority: int = 0) -> Optional[str]:
+        """
+        Get the completion for one meeting prompt (batched when possible).
+
+        Args:
+            user_prompt: Single-meeting user prompt
+            priority: Queue priority for rate-limited clients (lower runs first)
+
+        Returns:
+            Completion text or None if the request failed
+        """
+        tokens = estimate_tokens(user_prompt, self.model)
+        if self.max_batch_size == 1 or tokens > self.max_request_tokens or self._closed:
+            return self._single(user_prompt, priority)
+
+        request = DispatchRequest(key=f"m{next(self._ids)}", user_prompt=user_prompt, tokens=tokens,
+                                  priority=priority)
+        with self._condition:
+            if self._pending and self._pending_tokens + tokens > self.max_batch_tokens:
+                self._flush_locked()
+            if not self._pending:
+                self._deadline = time.monotonic() + self.max_wait
+            self._pending.append(request)
+            self._pending_tokens += tokens
+            if len(self._pending) >= self.max_batch_size:
+                self._flush_locked()
+            self._ensure_worker()
+            self._condition.notify()
+
+        return request.future.result()
+
+    def close(self) -> None:
+        """Send whatever is pending and stop the worker"""
+        with self._condition:
+            self._closed = True
+            if self._pending:
+                self._flush_locked()
+            self._condition.notify()
+        self._executor.shutdown(wait=True)
+
+    # --- Internals -----------------------------------------------------------
+
+    def _client(self, priority: int):
+        if hasattr(self.client, 'for_priority'):
+            return self.client.for_priority(priority)
+        return self.client
+
+    def _single(self, user_prompt: str, priority: int = 0) -> Optional[str]:
+        self.single_requests += 1
+        return self._client(priority).complete(user_prompt)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        """Flushes a partial batch once its first request has waited max_wait"""
+        with self._condition:
+            while not self._closed:
+                if not self._pending:
+                    if not self._condition.wait(timeout=30) and not self._pending:
+                        self._worker = None  # Idle; restarted on the next request
+                        return
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(timeout=remaining)
+                    continue
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if batch:
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: List[DispatchRequest]) -> None:
+        try:
+            if len(batch) == 1:
+                batch[0].future.set_result(self._single(batch[0].user_prompt, batch[0].priority))
+                return
+
+            self.batches_sent += 1
+            self.meetings_batched += len(batch)
+            self.log(f"  📦 Sending {len(batch)} meetings in one Chat AI request")
+            prompt = build_batch_user_prompt([(r.key, r.user_prompt) for r in batch])
+            client = self._client(min(r.priority for r in batch))
+            outputs = split_batch_response(client.complete(prompt), [r.key for r in batch])
+
+            missing = [r for r in batch if r.key not in outputs]
+            if missing:
+                self.log(f"  ⚠ Batch response missing {len(missing)} meeting(s) - retrying them one by one")
+            for request in batch:
+                if request.key in outputs:
+                    request.future.set_result(outputs[request.key])
+            for request in missing:
+                request.future.set_result(self._single(request.user_prompt, request.priority))
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
@@ -0,0 +1,344 @@
+"""
+LLM Response Parser v2.0
+Finds, repairs and validates the JSON returned by Chat AI for meeting analysis.
+
+- Linear scan for the outermost JSON object/array (fenced or not)
+- Repairs trailing commas and output truncated by max_tokens
+- Validates stories/actions against the shapes promised in meeting_prompts_v2
+- Salvages every complete item when the document as a whole cannot be recovered
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import json
+
+from llm_stream_parser_v2 import IncrementalItemParser
+
+# Expected item shapes (see meeting_prompts_v2): field -> (types, default)
+STORY_FIELDS = {
+    'summary': ((str,), None),
+    'description': ((str,), ""),
+    'acceptance_criteria': ((list,), []),
+    'estimate_points': ((int, type(None)), None),
+    'assignees': ((list,), []),
+    'labels': ((list,), []),
+}
+
+ACTION_FIELDS = {
+    'title': ((str,), None),
+    'description': ((str,), ""),
+    'owner': ((str, type(None)), None),
+    'due_date_hint': ((str, type(None)), None),
+    'related_decision': ((str, type(None)), None),
+}
+
+COLLECTIONS = {
+    'stories': ('summary', STORY_FIELDS),
+    'actions': ('title', ACTION_FIELDS),
+}
+
+EXPECTED_COLLECTIONS = {
+    'refinement': ('stories',),
+    'general': ('actions',),
+    'mixed': ('stories', 'actions'),
+    'unknown': ('stories', 'actions'),
+}
+
+REVIEW_LABEL = "AIGen-ReviewRqd"
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+@dataclass
+class ParseResult:
+    data: Optional[Dict]
+    errors: List[str] = field(default_factory=list)
+    repaired: bool = False   # JSON had to be fixed up before it parsed
+    truncated: bool = False  # Document was cut off; open structures were closed
+    salvaged: bool = False   # Only individual items could be recovered
+    dropped_items: int = 0   # Items that failed validation
+
+    @property
+    def ok(self) -> bool:
+        return self.data is not None
+
+    @property
+    def clean(self) -> bool:
+        """Parsed as sent: nothing repaired, closed or salvaged"""
+        return not (self.repaired or self.truncated or self.salvaged)
+
+
+# --- Locating and repairing JSON ---------------------------------------------
+
+def _scan(text: str, start: int) -> Tuple[int, List[Tuple[int, str]]]:
+    """
+    Scan one JSON value starting at text[start] (which must be '{' or '[').
+
+    Returns:
+        (end index or -1 if it never closes,
+         cut points as (index, open brackets) where a truncated document can
+         be cut and closed: just after an opening bracket or just before a comma)
+    """
+    stack: List[str] = []
+    cuts: List[Tuple[int, str]] = []
+    in_string = False
+    escape = False
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append(ch)
+            cuts.append((i + 1, ''.join(stack)))
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            if not stack:
+                return i, cuts
+        elif ch == ',':
+            cuts.append((i, ''.join(stack)))
+
+    return -1, cuts
+
+
+def value_end(text: str, start: int) -> int:
+    """Index of the bracket closing the object/array at text[start], or -1 if it never closes"""
+    return _scan(text, start)[0]
+
+
+def find_json_span(text: str) -> Tuple[int, int]:
+    """
+    Locate the outermost JSON object/array in an LLM response.
+
+    Returns:
+        (start, end) where end is exclusive and may be len(text) if the
+        document is truncated; (-1, -1) if there is no JSON at all
+    """
+    fence = text.find('```')
+    search_from = fence if fence != -1 else 0
+    candidates = [i for i in (text.find('{', search_from), text.find('[', search_from)) if i != -1]
+    if not candidates and search_from:
+        candidates = [i for i in (text.find('{'), text.find('[')) if i != -1]
+    if not candidates:
+        return -1, -1
+
+    start = min(candidates)
+    end, _ = _scan(text, start)
+    return start, (end + 1 if end != -1 else len(text))
+
+
+def strip_trailing_commas(fragment: str) -> str:
+    """Remove commas directly before a closing bracket (outside strings)"""
+    out: List[str] = []
+    in_string = False
+    escape = False
+    pending_comma: Optional[int] = None
+
+    for ch in fragment:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == ',':
+            pending_comma = len(out)
+        elif ch in '}]' and pending_comma is not None:
+            del out[pending_comma]
+            pending_comma = None
+        elif not ch.isspace():
+            pending_comma = None
+        if ch == '"':
+            in_string = True
+        out.append(ch)
+
+    return ''.join(out)
+
+
+def close_truncated(fragment: str, max_attempts: int = 25):
+    """
+    Close a JSON document that was cut off mid-way.
+
+    Tries the latest cut points first (dropping the partial element after
+    them) and closes every open bracket.
+
+    Returns:
+        Parsed value or None
+    """
+    start = 0
+    while start < len(fragment) and fragment[start] not in '{[':
+        start += 1
+    if start == len(fragment):
+        return None
+
+    _, cuts = _scan(fragment, start)
+    for cut, open_brackets in reversed(cuts[-max_attempts:]):
+        head = fragment[start:cut].rstrip()
+        candidate = strip_trailing_commas(head + ''.join(_CLOSERS[b] for b in reversed(open_brackets)))
+        try:
+            return json.loads(candidate)
+        except ValueError:
+            continue
+    return None
+
+
+# --- Validation --------------------------------------------------------------
+
+def _coerce_field(name: str, value, types, default):
+    if value is None:
+        return default if type(None) not in types else None
+    if isinstance(value, types) and not isinstance(value, bool):
+        if list in types:
+            return [str(v) for v in value if v not in (None, "")]
+        return value
+    if list in types:
+        return [str(value)] if str(value).strip() else []
+    if str in types and isinstance(value, list):
+        return ", ".join(str(v) for v in value) or default
+    if int in types:
+        try:
+            return int(float(str(value).strip().split()[0]))
+        except (ValueError, IndexError):
+            return None
+    if str in types:
+        return str(value)
+    return default
+
+
+def validate_item(item, fields: Dict, key_field: str) -> Optional[Dict]:
+    """Coerce an item to the expected shape; None if it is unusable"""
+    if not isinstance(item, dict):
+        return None
+    key_value = item.get(key_field)
+    if not isinstance(key_value, str) or not key_value.strip():
+        return None
+
+    clean = dict(item)
+    for name, (types, default) in fields.items():
+        clean[name] = _coerce_field(name, item.get(name), types, default)
+    clean[key_field] = key_value.strip()
+
+    if 'labels' in fields and REVIEW_LABEL not in clean['labels']:
+        clean['labels'] = [REVIEW_LABEL] + clean['labels']
+    return clean
+
+
+def _guess_collection(items: List) -> Optional[str]:
+    for item in items:
+        if isinstance(item, dict):
+            if 'summary' in item:
+                return 'stories'
+            if 'title' in item:
+                return 'actions'
+    return None
+
+
+def validate_analysis(data, meeting_type: Optional[str], result: ParseResult) -> Optional[Dict]:
+    """Validate the overall document; keeps valid items and records what was dropped"""
+    if isinstance(data, list):
+        collection = _guess_collection(data)
+        if not collection:
+            result.errors.append("Top-level array does not contain stories or actions")
+            return None
+        data = {collection: data}
+    if not isinstance(data, dict):
+        result.errors.append("Response JSON is not an object")
+        return None
+
+    clean = dict(data)
+    clean['meeting_type'] = data.get('meeting_type') or meeting_type or "unknown"
+
+    expected = EXPECTED_COLLECTIONS.get(meeting_type or clean['meeting_type'], ())
+    for collection, (key_field, fields) in COLLECTIONS.items():
+        if collection not in data:
+            if collection in expected:
+                clean[collection] = []
+            continue
+
+        items = data[collection]
+        if not isinstance(items, list):
+            result.errors.append(f"'{collection}' is not a list")
+            clean[collection] = []
+            continue
+
+        valid = []
+        for index, item in enumerate(items):
+            checked = validate_item(item, fields, key_field)
+            if checked is None:
+                result.dropped_items += 1
+                result.errors.append(f"{collection}[{index}] has no usable '{key_field}'")
+            else:
+                valid.append(checked)
+        clean[collection] = valid
+
+    return clean
+
+
+# --- Entry point -------------------------------------------------------------
+
+def parse_llm_response(text: Optional[str], meeting_type: Optional[str] = None) -> ParseResult:
+    """
+    Parse an analysis completion into validated structured data.
+
+    Args:
+        text: Raw completion text
+        meeting_type: Classified meeting type (decides which arrays must exist)
+
+    Returns:
+        ParseResult (data is None only if nothing at all could be recovered)
+    """
+    result = ParseResult(data=None)
+    if not text:
+        result.errors.append("Empty response")
+        return result
+
+    start, end = find_json_span(text)
+    if start == -1:
+        result.errors.append("No JSON found in response")
+        return result
+
+    fragment = text[start:end]
+    parsed = None
+    try:
+        parsed = json.loads(fragment)
+    except ValueError:
+        result.repaired = True
+        try:
+            parsed = json.loads(strip_trailing_commas(fragment))
+        except ValueError:
+            # Closing open structures only makes sense for a document that was cut off;
+            # a complete but malformed one goes to item salvage so no items are lost
+            if _scan(text, start)[0] == -1:
+                parsed = close_truncated(fragment)
+                if parsed is not None:
+                    result.truncated = True
+                    result.errors.append("Response was truncated; closed open structures")
+
+    if parsed is None:
+        # Last resort: keep every complete story/action object
+        salvaged: Dict[str, List] = {}
+        for collection, item in IncrementalItemParser().feed(fragment):
+            salvaged.setdefault(collection, []).append(item)
+        if not salvaged:
+            result.errors.append("Response JSON could not be repaired")
+            return result
+        result.salvaged = True
+        result.errors.append("Response JSON could not be repaired; salvaged complete items")
+        parsed = salvaged
+
+    result.data = validate_analysis(parsed, meeting_type, result)
+    return result
@@ -0,0 +1,168 @@
+"""
+LLM Streaming Support v2.0
+Server-sent-event (SSE) reader for chat completion streams and an incremental
+JSON parser that emits each story/action object as soon as it is complete.
+"""
+
+import json
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Top-level arrays whose elements are emitted as they close
+ITEM_COLLECTIONS = ('stories', 'actions')
+
+
+def iter_sse_data(lines: Iterable) -> Iterator[str]:
+    """
+    Yield the data payload of each server-sent event.
+    Stops at the OpenAI-style "[DONE]" sentinel.
+    """
+    data_lines: List[str] = []
+    for raw in lines:
+        line = raw.decode('utf-8') if isinstance(raw, bytes) else raw
+        line = line.rstrip('\r')
+
+        if not line:
+            # Blank line terminates an event
+            if data_lines:
+                payload = '\n'.join(data_lines)
+                data_lines = []
+                if payload.strip() == '[DONE]':
+                    return
+                yield payload
+            continue
+
+        if line.startswith('data:'):
+            data_lines.append(line[5:].lstrip(' '))
+
+    if data_lines:
+        payload = '\n'.join(data_lines)
+        if payload.strip() != '[DONE]':
+            yield payload
+
+
+def iter_completion_deltas(lines: Iterable) -> Iterator[str]:
+    """Yield content deltas from a chat completions SSE stream"""
+    for payload in iter_sse_data(lines):
+        try:
+            chunk = json.loads(payload)
+        except ValueError:
+            continue
+        for choice in chunk.get('choices') or []:
+            delta = choice.get('delta') or choice.get('message') or {}
+            content = delta.get('content')
+            if content:
+                yield content
+
+
+class IncrementalItemParser:
+    """
+    Scans a JSON document as it streams in and returns every element of the
+    top-level "stories" / "actions" arrays the moment its closing brace arrives.
+
+    Anything before the first '{' (e.g. a ```json fence) is ignored. Only the
+    text of the item currently being read is buffered.
+    """
+
+    def __init__(self, collections=ITEM_COLLECTIONS):
+        self.collections = tuple(collections)
+        self._stack: List[Tuple[str, Optional[str]]] = []  # (bracket, key it belongs to)
+        self._in_string = False
+        self._escape = False
+        self._string_chars: List[str] = []
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._item_chars: Optional[List[str]] = None
+        self._item_collection: Optional[str] = None
+        self._started = False
+        self._done = False
+
+    def feed(self, text: str) -> List[Tuple[str, dict]]:
+        """
+        Consume the next piece of completion text.
+
+        Returns:
+            List of (collection, item) for items completed by this piece
+        """
+        completed = []
+        for ch in text:
+            if self._done:
+                break
+
+            if self._item_chars is not None:
+                self._item_chars.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_string = ''.join(self._string_chars)
+                elif len(self._stack) == 1:
+                    self._string_chars.append(ch)
+                continue
+
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._stack.append(('{', None))
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_chars = []
+            elif ch == ':' and len(self._stack) == 1:
+                self._current_key = self._last_string
+            elif ch in '{[':
+                parent_bracket, parent_key = self._stack[-1]
+                if (ch == '{' and len(self._stack) == 2 and parent_bracket == '['
+                        and parent_key in self.collections):
+                    self._item_chars = ['{']
+                    self._item_collection = parent_key
+                key = self._current_key if len(self._stack) == 1 else None
+                self._stack.append((ch, key))
+            elif ch in '}]':
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if ch == '}' and len(self._stack) == 2 and self._item_chars is not None:
+                    item = self._finish_item()
+                    if item is not None:
+                        completed.append((self._item_collection, item))
+                    self._item_chars = None
+                    self._item_collection = None
+                if not self._stack:
+                    self._done = True
+
+        return completed
+
+    def _finish_item(self) -> Optional[dict]:
+        try:
+            item = json.loads(''.join(self._item_chars))
+        except ValueError:
+            return None
+        return item if isinstance(item, dict) else None
+
+
+def stream_items(deltas: Iterable[str],
+                 on_item: Optional[Callable[[str, dict], None]] = None) -> str:
+    """
+    Drive an IncrementalItemParser over completion deltas.
+
+    Args:
+        deltas: Iterable of content deltas
+        on_item: Called with (collection, item) as each item completes
+
+    Returns:
+        The full completion text
+    """
+    parser = IncrementalItemParser()
+    parts: List[str] = []
+    for delta in deltas:
+        parts.append(delta)
+        for collection, item in parser.feed(delta):
+            if on_item:
+                on_item(collection, item)
+    return ''.join(parts)
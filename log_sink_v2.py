@@ -0,0 +1,134 @@
+"""
+Log Sink v2.0
+Thread-safe logging for the Tk UI, built on the logging module.
+
+Any thread logs through a standard Logger. Records go onto a lock-free
+SimpleQueue (QueueHandler); the Tk thread drains it on a timer and inserts
+each batch with a single widget call. The widget only ever holds the last
+max_lines lines. An optional rotating file handler keeps the full history.
+"""
+
+from collections import deque
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Optional
+import logging
+import queue
+
+LOGGER_NAME = 'producto'
+LINE_FORMAT = '[%(asctime)s] %(message)s'
+TIME_FORMAT = '%H:%M:%S'
+
+
+class TkLogSink:
+    """Queues log records from any thread and flushes them into a Tk Text widget in batches"""
+
+    def __init__(self, max_lines=2000, interval_ms=100, max_batch=500):
+        """
+        Args:
+            max_lines: Lines kept in the widget (ring buffer)
+            interval_ms: How often the Tk thread drains the queue
+            max_batch: Most records inserted per drain (the rest wait for the next tick)
+        """
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+
+        self.queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.handler = QueueHandler(self.queue)
+        self.handler.setFormatter(logging.Formatter(LINE_FORMAT, TIME_FORMAT))
+        self.lines = deque(maxlen=max_lines)
+
+        self.root = None
+        self.widget = None
+        self._job = None
+        self.dropped_lines = 0
+
+    def attach(self, root, widget) -> None:
+        """Start draining into widget (call on the Tk thread)"""
+        self.root = root
+        self.widget = widget
+        self._schedule()
+
+    def detach(self) -> None:
+        if self.root is not None and self._job is not None:
+            self.root.after_cancel(self._job)
+        self._job = None
+        self.widget = None
+
+    def text(self) -> str:
+        """Everything currently visible"""
+        return "\n".join(self.lines)
+
+    # --- Tk thread -----------------------------------------------------------
+
+    def _schedule(self) -> None:
+        self._job = self.root.after(self.interval_ms, self._drain)
+
+    def _drain(self) -> None:
+        batch = []
+        try:
+            while len(batch) < self.max_batch:
+                batch.append(self.queue.get_nowait().getMessage())
+        except queue.Empty:
+            pass
+
+        if batch and self.widget is not None:
+            self._insert(batch)
+        if self.widget is not None:
+            self._schedule()
+
+    def _insert(self, batch) -> None:
+        widget = self.widget
+        at_bottom = widget.yview()[1] >= 0.999
+
+        # Only the newest max_lines lines can ever be visible
+        if len(batch) > self.max_lines:
+            self.dropped_lines += len(batch) - self.max_lines
+            batch = batch[-self.max_lines:]
+        overflow = max(0, len(self.lines) + len(batch) - self.max_lines)
+        self.lines.extend(batch)
+
+        if overflow:
+            widget.delete('1.0', f'{overflow + 1}.0')
+        widget.insert('end', "\n".join(batch) + "\n")
+        if at_bottom:
+            widget.see('end')
+
+
+def setup_logging(sink: Optional[TkLogSink], log_file: Optional[str] = None, max_mb=5, backups=3,
+                  level=logging.INFO, stream=None) -> logging.Logger:
+    """
+    Configure the application logger.
+
+    Args:
+        sink: TkLogSink feeding the log widget (None when running headless)
+        log_file: Also write to this rotating file (None = no file)
+        max_mb: Rotate the file at this size
+        backups: Rotated files to keep
+        stream: Also write to this stream, e.g. sys.stderr (None = no console)
+
+    Returns:
+        Logger to log through
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    if sink is not None:
+        logger.addHandler(sink.handler)
+    if stream is not None:
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(logging.Formatter(LINE_FORMAT, TIME_FORMAT))
+        logger.addHandler(stream_handler)
+    if log_file:
+        try:
+            file_handler = RotatingFileHandler(log_file, maxBytes=int(max_mb * 1024 * 1024),
+                                               backupCount=backups, encoding='utf-8')
+            file_handler.setFormatter(logging.Formatter('%(asctime)s %(threadName)s %(message)s'))
+            logger.addHandler(file_handler)
+        except OSError as e:
+            logger.warning(f"Could not open log file {log_file}: {e}")
+    return logger
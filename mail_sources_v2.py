@@ -0,0 +1,348 @@
+"""
+Mail Sources v2.0
+Where meeting notification emails come from, behind one interface:
+
+- outlook : A live Outlook folder (pywin32 COM, Windows only)
+- dir     : A directory of .eml / .msg files (e.g. exported notifications)
+- mbox    : An mbox archive
+- fake    : In-memory messages for tests and benchmarks
+
+Every source yields MailMessage objects whose to_email_data() is the dict
+EmailMonitor and MeetingPipeline already use (entry_id, subject,
+received_time, body), so the rest of the pipeline is unchanged. Bodies are
+read lazily, so listing and de-duplicating a large corpus stays cheap.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email import policy
+from email.parser import BytesParser
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional
+import itertools
+import mailbox
+import os
+
+try:
+    import extract_msg  # Outlook .msg files
+    MSG_AVAILABLE = True
+except ImportError:
+    MSG_AVAILABLE = False
+
+SOURCES = ('outlook', 'dir', 'mbox', 'fake')
+
+
+@dataclass
+class MailMessage:
+    entry_id: str
+    subject: str
+    received_time: Optional[datetime]
+    load_body: Optional[Callable[[], str]] = field(default=None, repr=False)
+    _body: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def body(self) -> str:
+        if self._body is None:
+            self._body = (self.load_body() if self.load_body else None) or ""
+        return self._body
+
+    def to_email_data(self, read_body=True) -> Dict:
+        """Email dict as produced by EmailMonitor"""
+        email_data = {'entry_id': self.entry_id, 'subject': self.subject, 'received_time': self.received_time}
+        if read_body:
+            email_data['body'] = self.body
+        return email_data
+
+
+def restrict_filter(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    subject_pattern: str = '') -> str:
+    """
+    DASL filter for Outlook Items.Restrict: received in [start, end), subject containing subject_pattern.
+
+    Naive datetimes are local time; DASL compares in UTC.
+
+    Returns:
+        Filter string, or '' when there is nothing to restrict on
+    """
+    def utc(moment):
+        if moment.tzinfo is None:
+            moment = moment.astimezone()
+        return moment.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+    clauses = []
+    if start is not None:
+        clauses.append(f"\"urn:schemas:httpmail:datereceived\" >= '{utc(start)}'")
+    if end is not None:
+        clauses.append(f"\"urn:schemas:httpmail:datereceived\" < '{utc(end)}'")
+    if subject_pattern:
+        escaped = subject_pattern.replace("'", "''")
+        clauses.append(f"\"urn:schemas:httpmail:subject\" LIKE '%{escaped}%'")
+    return "@SQL=" + " AND ".join(clauses) if clauses else ''
+
+
+def local_naive(moment: Optional[datetime]) -> Optional[datetime]:
+    """Aware datetimes to naive local time (what comparisons and meeting ids expect)"""
+    if moment is not None and moment.tzinfo is not None:
+        return moment.astimezone().replace(tzinfo=None)
+    return moment
+
+
+class MailSource:
+    """Base class: iter_messages() must be implemented"""
+
+    name = "mail"
+
+    def __init__(self, log_callback=None):
+        self.log = log_callback or print
+
+    @property
+    def location(self) -> str:
+        """Identifies the source (e.g. in backfill checkpoints)"""
+        return self.name
+
+    def iter_messages(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      subject_pattern: str = '', newest_first=False, limit=None) -> Iterator[MailMessage]:
+        """
+        Messages received in [since, until) whose subject contains subject_pattern
+        (case-insensitive), ordered by received time.
+
+        Args:
+            since: Earliest received time (None = no lower bound)
+            until: Received times before this are included (None = no upper bound)
+            subject_pattern: Subject substring ('' = every message)
+            newest_first: Newest message first instead of oldest
+            limit: Stop after this many messages
+        """
+        raise NotImplementedError
+
+
+class _ListedMailSource(MailSource):
+    """Sources that list message headers up front and filter/sort them in Python"""
+
+    def _list(self) -> List[MailMessage]:
+        raise NotImplementedError
+
+    def iter_messages(self, since=None, until=None, subject_pattern='', newest_first=False, limit=None):
+        pattern = (subject_pattern or '').lower()
+        messages = []
+        for message in self._list():
+            received = message.received_time
+            if pattern not in message.subject.lower():
+                continue
+            if since is not None and (received is None or received < since):
+                continue
+            if until is not None and (received is None or received >= until):
+                continue
+            messages.append(message)
+
+        messages.sort(key=lambda m: m.received_time or datetime.min, reverse=newest_first)
+        return iter(messages[:limit] if limit else messages)
+
+
+def _html_or_text(message) -> str:
+    """HTML body of an email.message.EmailMessage, else its plain text body"""
+    part = message.get_body(preferencelist=('html', 'plain'))
+    if part is None:
+        return ""
+    try:
+        return part.get_content()
+    except (LookupError, ValueError):
+        return part.get_payload(decode=True).decode('utf-8', errors='replace')
+
+
+def _received_time(message) -> Optional[datetime]:
+    try:
+        return local_naive(parsedate_to_datetime(message['Date'])) if message['Date'] else None
+    except (TypeError, ValueError):
+        return None
+
+
+# --- Outlook -------------------------------------------------------------------
+
+class OutlookMailSource(MailSource):
+    """A live Outlook folder; use it only on the thread that created the folder object"""
+
+    name = "outlook"
+
+    def __init__(self, folder, log_callback=None):
+        """
+        Args:
+            folder: Outlook MAPIFolder (e.g. from EmailMonitor.get_folder)
+            log_callback: Function to call for logging
+        """
+        super().__init__(log_callback)
+        self.folder = folder
+
+    @property
+    def location(self) -> str:
+        return f"outlook:{getattr(self.folder, 'Name', '')}"
+
+    def iter_messages(self, since=None, until=None, subject_pattern='', newest_first=False, limit=None):
+        items = self.folder.Items
+        restriction = restrict_filter(since, until, subject_pattern)
+        if restriction:
+            items = items.Restrict(restriction)
+        items.Sort("[ReceivedTime]", newest_first)
+        pattern = (subject_pattern or '').lower()
+
+        count = 0
+        item = items.GetFirst()
+        while item is not None and (not limit or count < limit):
+            try:
+                received_time = item.ReceivedTime
+                subject = item.Subject or ""
+                if hasattr(received_time, 'strftime') and pattern in subject.lower():
+                    count += 1
+                    yield MailMessage(
+                        entry_id=item.EntryID, subject=subject, received_time=received_time,
+                        load_body=lambda item=item: item.HTMLBody if hasattr(item, 'HTMLBody') else item.Body
+                    )
+            except Exception as e:
+                # Skip problematic items (e.g. meeting requests without a body)
+                self.log(f"  ⚠ Skipped Outlook item: {str(e)}")
+            item = items.GetNext()
+
+
+# --- Files ---------------------------------------------------------------------
+
+class EmlDirectorySource(_ListedMailSource):
+    """A directory (searched recursively) of .eml and .msg files"""
+
+    name = "dir"
+
+    def __init__(self, path, log_callback=None):
+        super().__init__(log_callback)
+        self.path = path
+        self._messages: Optional[List[MailMessage]] = None
+        self._warned_msg = False
+
+    @property
+    def location(self) -> str:
+        return f"dir:{os.path.abspath(self.path)}"
+
+    def _list(self) -> List[MailMessage]:
+        if self._messages is None:
+            messages = []
+            for folder, _, files in os.walk(self.path):
+                for filename in sorted(files):
+                    file_path = os.path.join(folder, filename)
+                    extension = os.path.splitext(filename)[1].lower()
+                    try:
+                        if extension == '.eml':
+                            messages.append(self._read_eml(file_path))
+                        elif extension == '.msg':
+                            message = self._read_msg(file_path)
+                            if message:
+                                messages.append(message)
+                    except Exception as e:
+                        self.log(f"  ⚠ Could not read {file_path}: {str(e)}")
+            self._messages = messages
+        return self._messages
+
+    def _read_eml(self, file_path) -> MailMessage:
+        # Headers only; the body is parsed if and when it is needed
+        with open(file_path, 'rb') as f:
+            headers = BytesParser(policy=policy.default).parse(f, headersonly=True)
+
+        def load_body():
+            with open(file_path, 'rb') as f:
+                return _html_or_text(BytesParser(policy=policy.default).parse(f))
+
+        entry_id = str(headers['Message-ID'] or '').strip() or os.path.relpath(file_path, self.path)
+        return MailMessage(entry_id=entry_id, subject=str(headers['Subject'] or ''),
+                           received_time=_received_time(headers), load_body=load_body)
+
+    def _read_msg(self, file_path) -> Optional[MailMessage]:
+        if not MSG_AVAILABLE:
+            if not self._warned_msg:
+                self._warned_msg = True
+                self.log("  ⚠ Skipping .msg files (pip install extract-msg to read them)")
+            return None
+
+        msg = extract_msg.Message(file_path)
+        try:
+            body = msg.htmlBody
+            if isinstance(body, bytes):
+                body = body.decode('utf-8', errors='replace')
+            body = body or msg.body or ""
+            received = msg.date
+            if isinstance(received, str):
+                received = parsedate_to_datetime(received)
+            entry_id = (msg.messageId or '').strip() or os.path.relpath(file_path, self.path)
+            return MailMessage(entry_id=entry_id, subject=msg.subject or "",
+                               received_time=local_naive(received), _body=body)
+        finally:
+            msg.close()
+
+
+class MboxSource(_ListedMailSource):
+    """An mbox archive"""
+
+    name = "mbox"
+
+    def __init__(self, path, log_callback=None):
+        super().__init__(log_callback)
+        self.path = path
+        self._messages: Optional[List[MailMessage]] = None
+
+    @property
+    def location(self) -> str:
+        return f"mbox:{os.path.abspath(self.path)}"
+
+    def _list(self) -> List[MailMessage]:
+        if self._messages is None:
+            box = mailbox.mbox(self.path, factory=None, create=False)
+            messages = []
+            for key in box.iterkeys():
+                headers = BytesParser(policy=policy.default).parsebytes(box.get_bytes(key), headersonly=True)
+
+                def load_body(key=key):
+                    return _html_or_text(BytesParser(policy=policy.default).parsebytes(box.get_bytes(key)))
+
+                entry_id = str(headers['Message-ID'] or '').strip() or f"{os.path.basename(self.path)}#{key}"
+                messages.append(MailMessage(entry_id=entry_id, subject=str(headers['Subject'] or ''),
+                                            received_time=_received_time(headers), load_body=load_body))
+            self._messages = messages
+        return self._messages
+
+
+# --- Fake ----------------------------------------------------------------------
+
+class FakeMailSource(_ListedMailSource):
+    """In-memory mailbox"""
+
+    name = "fake"
+
+    def __init__(self, messages: Optional[List[MailMessage]] = None, log_callback=None):
+        super().__init__(log_callback)
+        self.messages: List[MailMessage] = list(messages or [])
+        self._ids = itertools.count(len(self.messages) + 1)
+
+    def add(self, subject, body, received_time=None, entry_id=None) -> MailMessage:
+        message = MailMessage(entry_id=entry_id or f"FAKE{next(self._ids):08d}", subject=subject,
+                              received_time=received_time or datetime.now(), _body=body)
+        self.messages.append(message)
+        return message
+
+    def _list(self) -> List[MailMessage]:
+        return self.messages
+
+
+def open_mail_source(spec: str, log_callback=None) -> MailSource:
+    """
+    File-based source from a CLI spec.
+
+    Args:
+        spec: "dir:PATH", "mbox:PATH", or a plain path (directory or mbox file)
+
+    Raises:
+        ValueError: for unknown kinds or missing paths (use OutlookMailSource for Outlook)
+    """
+    kind, _, path = spec.partition(':')
+    if kind not in ('dir', 'mbox') or not path:
+        kind, path = ('dir' if os.path.isdir(spec) else 'mbox'), spec
+    if not os.path.exists(path):
+        raise ValueError(f"Mail source not found: {path}")
+    if kind == 'dir':
+        return EmlDirectorySource(path, log_callback=log_callback)
+    return MboxSource(path, log_callback=log_callback)
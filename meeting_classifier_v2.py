@@ -120,6 +120,37 @@ def _score_matches(text: str, phrases: List[str], weight: float = 1.0) -> float:
     return score
 
 
+def _decide_meeting_type(
+    refinement_score: float,
+    action_score: float,
+    min_conf_threshold: float,
+    dominance_factor: float,
+) -> MeetingType:
+    """
+    Turn refinement/action scores into a meeting type.
+    Shared by classify_meeting and IncrementalMeetingClassifier so both
+    always agree on the same scores.
+    """
+    if refinement_score < 0.1 and action_score < 0.1:
+        return "unknown"
+
+    # Strongly refinement-leaning?
+    if (
+        refinement_score >= min_conf_threshold
+        and refinement_score >= action_score * dominance_factor
+    ):
+        return "refinement"
+
+    # Strongly action/general-leaning?
+    if (
+        action_score >= min_conf_threshold
+        and action_score >= refinement_score * dominance_factor
+    ):
+        return "general"
+
+    return "mixed"
+
+
 def classify_meeting(
     title: str,
     transcript: str,
@@ -166,27 +197,9 @@ def classify_meeting(
     refinement_score = title_score + refinement_body_score
     action_score = action_body_score
 
-    # --- Decide meeting type -----------------------------------------------
-
-    meeting_type: MeetingType = "unknown"
-
-    if refinement_score < 0.1 and action_score < 0.1:
-        meeting_type = "unknown"
-    else:
-        # Strongly refinement-leaning?
-        if (
-            refinement_score >= min_conf_threshold
-            and refinement_score >= action_score * dominance_factor
-        ):
-            meeting_type = "refinement"
-        # Strongly action/general-leaning?
-        elif (
-            action_score >= min_conf_threshold
-            and action_score >= refinement_score * dominance_factor
-        ):
-            meeting_type = "general"
-        else:
-            meeting_type = "mixed"
+    meeting_type = _decide_meeting_type(
+        refinement_score, action_score, min_conf_threshold, dominance_factor
+    )
 
     return MeetingClassification(
         meeting_type=meeting_type,
@@ -198,6 +211,128 @@ def classify_meeting(
     )
 
 
+def keyword_signal(text: str) -> int:
+    """
+    Number of refinement/action keyword occurrences in a piece of text.
+    Used to rank transcript segments by how much they matter to the analysis.
+    """
+    return int(
+        _score_matches(text or "", REFINEMENT_BODY_KEYWORDS)
+        + _score_matches(text or "", ACTION_BODY_KEYWORDS)
+    )
+
+
+# --- Incremental classification ---------------------------------------------
+
+class IncrementalMeetingClassifier:
+    """
+    Streaming counterpart of classify_meeting.
+
+    Feed transcript text as it arrives (e.g. VTT cue text while the file is
+    still downloading) and ask for a provisional classification at any time.
+    Keyword counts are kept per phrase, so the transcript never has to be held
+    in memory, and a short tail of the previous chunk is carried over so that
+    phrases split across chunk boundaries are still counted exactly once.
+
+    Once every chunk has been fed, classification() returns the same result as
+    classify_meeting(title, "".join(chunks)).
+    """
+
+    def __init__(
+        self,
+        title: str = "",
+        refinement_title_weight: float = 2.0,
+        refinement_body_weight: float = 1.0,
+        action_body_weight: float = 1.0,
+        min_conf_threshold: float = 1.5,
+        dominance_factor: float = 1.3,
+    ):
+        self.title = title or ""
+        self.refinement_body_weight = refinement_body_weight
+        self.action_body_weight = action_body_weight
+        self.min_conf_threshold = min_conf_threshold
+        self.dominance_factor = dominance_factor
+
+        # Title is known up front, score it once
+        self.title_hits = _find_matches(self.title, REFINEMENT_TITLE_KEYWORDS)
+        self.title_score = _score_matches(
+            self.title, REFINEMENT_TITLE_KEYWORDS, weight=refinement_title_weight
+        )
+
+        self._phrases = [p.lower() for p in REFINEMENT_BODY_KEYWORDS + ACTION_BODY_KEYWORDS]
+        self._counts: Dict[str, int] = {p: 0 for p in self._phrases}
+        # Absolute offset where the next non-overlapping match of each phrase may start
+        self._next_start: Dict[str, int] = {p: 0 for p in self._phrases}
+        self._tail = ""
+        self._tail_len = max(len(p) for p in self._phrases) - 1
+        self.chars_seen = 0
+        self.chunks_seen = 0
+
+    def feed(self, chunk: str) -> None:
+        """
+        Add the next piece of transcript text.
+        Chunks are concatenated as-is, so include separators (e.g. a trailing
+        space after each VTT cue) if the source text would have them.
+        """
+        if not chunk:
+            return
+
+        lower = chunk.lower()
+        buffer = self._tail + lower
+        base = self.chars_seen - len(self._tail)
+
+        for phrase in self._phrases:
+            pos = buffer.find(phrase, max(self._next_start[phrase] - base, 0))
+            while pos != -1:
+                self._counts[phrase] += 1
+                end = pos + len(phrase)
+                self._next_start[phrase] = base + end
+                pos = buffer.find(phrase, end)
+
+        self.chars_seen += len(lower)
+        self.chunks_seen += 1
+        self._tail = buffer[-self._tail_len:] if self._tail_len else ""
+
+    def _hits_and_score(self, phrases: List[str], weight: float):
+        hits = [p for p in phrases if self._counts[p.lower()]]
+        score = sum(self._counts[p.lower()] for p in phrases) * weight
+        return hits, score
+
+    def classification(self) -> MeetingClassification:
+        """Classification for everything fed so far."""
+        refinement_hits, refinement_body_score = self._hits_and_score(
+            REFINEMENT_BODY_KEYWORDS, self.refinement_body_weight
+        )
+        action_hits, action_score = self._hits_and_score(
+            ACTION_BODY_KEYWORDS, self.action_body_weight
+        )
+        refinement_score = self.title_score + refinement_body_score
+
+        return MeetingClassification(
+            meeting_type=_decide_meeting_type(
+                refinement_score, action_score,
+                self.min_conf_threshold, self.dominance_factor
+            ),
+            refinement_score=refinement_score,
+            action_score=action_score,
+            title_hits=list(self.title_hits),
+            refinement_hits=refinement_hits,
+            action_hits=action_hits,
+        )
+
+    @property
+    def provisional_meeting_type(self) -> MeetingType:
+        """Current best guess at the meeting type (may still change)."""
+        return self.classification().meeting_type
+
+    def is_confident(self) -> bool:
+        """
+        True once one side clearly dominates (refinement or general), i.e. the
+        point at which prompt building / token acquisition can safely start.
+        """
+        return self.provisional_meeting_type in ("refinement", "general")
+
+
 # --- Example usage ----------------------------------------------------------
 
 if __name__ == "__main__":
@@ -210,3 +345,8 @@ if __name__ == "__main__":
 
     result = classify_meeting(example_title, example_transcript)
     print(result.to_dict())
+
+    incremental = IncrementalMeetingClassifier(example_title)
+    for i in range(0, len(example_transcript), 7):
+        incremental.feed(example_transcript[i:i + 7])
+    print(incremental.classification().to_dict())
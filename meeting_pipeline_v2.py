@@ -0,0 +1,899 @@
+"""
+Meeting Pipeline v2.0
+Email -> transcript -> analysis -> delivery, with no UI dependencies.
+
+Shared by the Tk app (producto.py) and the headless runner
+(producto_headless.py). Settings come from ConfigManager; credentials and
+the live option toggles are read through callables, so the GUI can feed
+them from its entry widgets and the headless runner from the credential
+store.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Set
+import os
+import re
+import threading
+
+from bs4 import BeautifulSoup
+import requests
+
+from analysis_cache_v2 import AnalysisCache
+from analysis_engine_v2 import AnalysisEngine, AnalysisConfig, Transcript
+from credential_store_v2 import get_credential
+from delivery_ledger_v2 import DeliveryLedger, meeting_id_for, normalize_title
+from llm_response_parser_v2 import ACTION_FIELDS, validate_item
+from meeting_classifier_v2 import IncrementalMeetingClassifier
+from outlook_extractor_v2_integrations import WEBEX_API_BASE_URL, OutlookTasksIntegration, WebexBotIntegration
+from transcript_v2 import parse_vtt_cues, cues_to_text
+from webex_digest_v2 import WebexDigestScheduler
+
+# Config keys the GUI may override with its current checkbox/entry values
+OPTION_KEYS = ('enable_analysis', 'auto_create_tasks', 'auto_send_to_webex',
+               'bot_recipient_email', 'output_directory')
+
+COMPLETED = 'completed'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+@dataclass
+class PipelineResult:
+    entry_id: Optional[str]
+    subject: str
+    meeting_key: str
+    status: str                            # COMPLETED, SKIPPED or FAILED
+    recording_url: str = ''
+    analysis_file: Optional[str] = None
+    analysis_text: Optional[str] = None
+    structured_data: Optional[Dict] = None
+
+
+class MeetingPipeline:
+    """Processes one meeting notification email (or transcript file) end to end"""
+
+    def __init__(self, config_manager, credentials: Optional[Callable[[str], Optional[str]]] = None,
+                 options: Optional[Callable[[], Dict]] = None, log_callback=None):
+        """
+        Args:
+            config_manager: ConfigManager instance
+            credentials: Returns a secret by name (default: credential_store_v2.get_credential)
+            options: Returns current overrides for OPTION_KEYS (default: config values)
+            log_callback: Function to call for logging
+        """
+        self.config_manager = config_manager
+        self.credentials = credentials or get_credential
+        self.options = options
+        self.log = log_callback or print
+
+        config = config_manager.config
+        self.analysis_cache = AnalysisCache(
+            os.path.join(config_manager.config_dir, 'analysis_cache'),
+            max_entries=config['analysis_cache_max_entries'],
+            max_age_days=config['analysis_cache_max_age_days'],
+            max_mb=config['analysis_cache_max_mb']
+        )
+        self.delivery_ledger = None
+        if config.get('delivery_dedup_enabled', True):
+            self.delivery_ledger = DeliveryLedger(
+                os.path.join(config_manager.config_dir, 'delivery_ledger.json')
+            )
+        self.analysis_engine = None
+        self.analysis_engine_lock = threading.Lock()
+
+        # Webex digest (one consolidated bot message per window instead of one per meeting)
+        self.webex_digest = None
+        if config.get('webex_digest_enabled', False):
+            self.webex_digest = WebexDigestScheduler(
+                os.path.join(config_manager.config_dir, 'webex_digest.json'),
+                self.send_webex_digest,
+                window_minutes=config.get('webex_digest_window_minutes', 30),
+                max_meetings=config.get('webex_digest_max_meetings', 10),
+                log_callback=self.log
+            ).start()
+
+    def option(self, name, default=None):
+        """Current value of a setting (GUI override first, then config)"""
+        if self.options is not None:
+            overrides = self.options()
+            if name in overrides:
+                return overrides[name]
+        return self.config_manager.config.get(name, default)
+
+    def close(self, flush_digest=True) -> None:
+        """Stop background work (flushing any pending Webex digest and batched analyses)"""
+        if self.webex_digest:
+            self.webex_digest.stop(flush=flush_digest)
+        with self.analysis_engine_lock:
+            engine, self.analysis_engine = self.analysis_engine, None
+        if engine is not None:
+            engine.close()
+
+    # --- Email processing ----------------------------------------------------
+
+    def process_email(self, email_data) -> PipelineResult:
+        """
+        Process one notification email - full pipeline.
+
+        The email is marked as processed unless an unexpected error occurs.
+
+        Args:
+            email_data: Dict with entry_id, subject, body and received_time
+
+        Returns:
+            PipelineResult (analysis fields set when an analysis ran)
+        """
+        subject = email_data['subject']
+        body = email_data['body']
+        meeting_key = meeting_id_for(subject, email_data.get('received_time'))
+        result = PipelineResult(email_data.get('entry_id'), subject, meeting_key, SKIPPED)
+
+        try:
+            self.log(f"▶ Processing: {subject[:60]}...")
+
+            # Extract Webex info
+            webex_info = self.extract_webex_info_from_body(subject, body)
+
+            # Check if transcript is embedded in email (no recording URL)
+            has_embedded_transcript = self.check_for_embedded_transcript(body)
+
+            if not webex_info and not has_embedded_transcript:
+                self.log("  ✗ No Webex URL or embedded transcript found")
+                self.mark_processed(email_data)
+                return result
+
+            # Handle transcript-only emails (no recording)
+            if not webex_info and has_embedded_transcript:
+                self.log("  ℹ️ This is a transcript-only meeting (no recording)")
+                return self.process_transcript_only_email(email_data, subject, body)
+
+            # Download VTT using Webex Access Token
+            output_dir = self.option('output_directory')
+            os.makedirs(output_dir, exist_ok=True)
+
+            webex_access_token = self.credentials('webex_access_token')
+
+            if not webex_access_token:
+                self.log("  ✗ Webex Access Token not configured")
+                self.log("     Set WEBEX_ACCESS_TOKEN environment variable")
+                self.mark_processed(email_data)
+                return result
+
+            # Classify cue text while the VTT streams in
+            classifier = IncrementalMeetingClassifier(subject)
+            vtt_file = self.download_vtt_from_webex(webex_info, output_dir, subject, webex_access_token,
+                                                    classifier=classifier)
+
+            if not vtt_file or not vtt_file.endswith('.vtt'):
+                self.log("  ✗ Could not download VTT")
+                self.mark_processed(email_data)
+                return result
+
+            self.log(f"  ✓ Downloaded VTT: {vtt_file}")
+            result.recording_url = webex_info.get('url', '')
+
+            # Analyze with AI
+            if self.option('enable_analysis', True):
+                classification = classifier.classification() if classifier.chars_seen else None
+                on_item, streamed_titles = self.make_streamed_task_creator(subject, meeting_key)
+                analysis_result = self.analyze_vtt_file(output_dir, vtt_file, subject,
+                                                        classification=classification, on_item=on_item)
+
+                if analysis_result:
+                    result.analysis_file, result.analysis_text, result.structured_data = analysis_result
+                    self.log("  ✓ AI analysis complete")
+                    self.deliver(result.structured_data, subject, meeting_key, result.recording_url,
+                                 streamed_titles)
+
+            # Mark as processed
+            self.mark_processed(email_data)
+            result.status = COMPLETED
+            self.log(f"✓ Completed: {subject[:60]}")
+
+        except Exception as e:
+            result.status = FAILED
+            self.log(f"✗ Error: {str(e)}")
+            import traceback
+            self.log(traceback.format_exc()[:300])
+
+        return result
+
+    def mark_processed(self, email_data) -> None:
+        if email_data.get('entry_id'):
+            self.config_manager.add_processed_email(email_data['entry_id'])
+
+    def deliver(self, structured_data, subject, meeting_key, recording_url='', streamed_titles=()) -> None:
+        """Create Outlook tasks and notify the Webex bot for one analysed meeting
+
+        Args:
+            streamed_titles: Normalized titles of actions already created while streaming
+        """
+        # Create Outlook Tasks (for actions not already created while streaming)
+        if self.option('auto_create_tasks', False) and structured_data:
+            actions = [a for a in structured_data.get('actions', [])
+                       if normalize_title(a.get('title')) not in streamed_titles]
+            if actions:
+                tasks_integration = self.make_tasks_integration()
+                tasks_integration.create_tasks_from_actions(actions, subject, meeting_key)
+
+        # Send to Webex bot
+        auto_send = self.option('auto_send_to_webex', False)
+        self.log(f"  Checking Webex bot integration...")
+        self.log(f"    Auto-send enabled: {auto_send}")
+        self.log(f"    Has structured data: {bool(structured_data)}")
+
+        if auto_send and structured_data:
+            bot_token = self.credentials('webex_bot_token')
+            self.log(f"    Bot token configured: {bool(bot_token)}")
+
+            if bot_token:
+                recipient_email = self.option('bot_recipient_email', 'qschalle@cisco.com')
+                if self.webex_digest:
+                    self.webex_digest.add(recipient_email, structured_data, subject, recording_url)
+                else:
+                    self.make_webex_integration(bot_token).send_analysis_summary(
+                        structured_data, subject, recording_url, recipient_email
+                    )
+            else:
+                self.log("  ⚠️ Webex Bot Token not configured - skipping bot notification")
+        else:
+            if not auto_send:
+                self.log("  ℹ️ Auto-send to Webex Bot is disabled (check Settings)")
+            if not structured_data:
+                self.log("  ℹ️ No structured data to send to bot")
+
+    def check_for_embedded_transcript(self, body):
+        """Check if email mentions transcript (will fetch from Webex API)"""
+        # Look for transcript indicators AND Webex meeting links
+        transcript_indicators = [
+            'transcript',
+            'meeting notes',
+            'conversation summary',
+            'meeting summary',
+            'closed captions',
+            'captions'
+        ]
+
+        body_lower = body.lower()
+        has_transcript_mention = any(indicator in body_lower for indicator in transcript_indicators)
+
+        # Also check for Webex meeting links (not recording links)
+        has_webex_link = 'webex.com/meet/' in body_lower or 'webex.com/m/' in body_lower
+
+        return has_transcript_mention or has_webex_link
+
+    def process_transcript_only_email(self, email_data, subject, body) -> PipelineResult:
+        """Process email that has transcript but no recording"""
+        meeting_key = meeting_id_for(subject, email_data.get('received_time'))
+        result = PipelineResult(email_data.get('entry_id'), subject, meeting_key, SKIPPED)
+        try:
+            self.log("  Fetching transcript from Webex...")
+
+            webex_access_token = self.credentials('webex_access_token')
+
+            if not webex_access_token:
+                self.log("  ✗ Webex Access Token not configured")
+                self.log("     Set WEBEX_ACCESS_TOKEN environment variable")
+                self.mark_processed(email_data)
+                return result
+
+            # Extract meeting ID from email
+            meeting_id = self.extract_meeting_id_from_email(body)
+            if not meeting_id:
+                self.log("  ✗ Could not extract meeting ID from email")
+                # Fallback: try to extract from email body text
+                self.log("  Attempting to extract transcript from email body as fallback...")
+                soup = BeautifulSoup(body, 'html.parser')
+                text = soup.get_text()
+                transcript_text = self.extract_transcript_from_email_text(text)
+
+                if not transcript_text or len(transcript_text) < 100:
+                    self.log("  ✗ No transcript found in email body either")
+                    self.mark_processed(email_data)
+                    return result
+            else:
+                # Fetch transcript from Webex API
+                transcript_text = self.fetch_transcript_from_webex(meeting_id, webex_access_token)
+
+                if not transcript_text:
+                    self.log("  ✗ Could not fetch transcript from Webex API")
+                    self.mark_processed(email_data)
+                    return result
+
+            self.log(f"  ✓ Retrieved {len(transcript_text)} characters of transcript")
+
+            # Save transcript as text file
+            output_dir = self.option('output_directory')
+            os.makedirs(output_dir, exist_ok=True)
+
+            safe_title = re.sub(r'[^\w\s-]', '', subject)[:50]
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            txt_filename = f"{safe_title}_{timestamp}_transcript.txt"
+            txt_filepath = os.path.join(output_dir, txt_filename)
+
+            with open(txt_filepath, 'w', encoding='utf-8') as f:
+                f.write(f"Meeting: {subject}\n")
+                f.write(f"Extracted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write("=" * 80 + "\n\n")
+                f.write(transcript_text)
+
+            self.log(f"  ✓ Saved transcript: {txt_filename}")
+
+            # Analyze with AI if enabled
+            if self.option('enable_analysis', True):
+                self.log("  Analyzing transcript with AI...")
+                on_item, streamed_titles = self.make_streamed_task_creator(subject, meeting_key)
+                analysis_result = self.analyze_transcript_text(transcript_text, subject, output_dir, safe_title,
+                                                               on_item=on_item)
+
+                if analysis_result:
+                    result.analysis_text, result.structured_data = analysis_result
+                    self.log("  ✓ AI analysis complete")
+                    self.deliver(result.structured_data, subject, meeting_key, '', streamed_titles)
+
+            # Mark as processed
+            self.mark_processed(email_data)
+            result.status = COMPLETED
+            self.log(f"✓ Completed: {subject[:60]}")
+
+        except Exception as e:
+            result.status = FAILED
+            self.log(f"  Error processing transcript: {str(e)}")
+            self.mark_processed(email_data)
+
+        return result
+
+    # --- Transcript files ----------------------------------------------------
+
+    def analyze_file(self, path, meeting_title=None, deliver=False) -> PipelineResult:
+        """
+        Analyze a local .vtt or plain-text transcript.
+
+        Args:
+            path: Transcript file
+            meeting_title: Title to analyze under (default: file name)
+            deliver: Also create tasks / notify the bot per the current settings
+
+        Returns:
+            PipelineResult (entry_id is None)
+        """
+        base_name = os.path.splitext(os.path.basename(path))[0]
+        title = meeting_title or base_name
+        meeting_key = meeting_id_for(title)
+        result = PipelineResult(None, title, meeting_key, FAILED)
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            self.log(f"✗ Could not read {path}: {e}")
+            return result
+
+        if path.lower().endswith('.vtt'):
+            transcript = Transcript.from_vtt(title, content, base_name=base_name)
+        else:
+            transcript = Transcript.from_text(title, content, base_name=base_name)
+
+        output_dir = self.option('output_directory') or os.path.dirname(os.path.abspath(path))
+        os.makedirs(output_dir, exist_ok=True)
+
+        on_item, streamed_titles = self.make_streamed_task_creator(title, meeting_key) if deliver else (None, set())
+        try:
+            analysis = self.get_analysis_engine(output_dir).analyze(transcript, on_item=on_item)
+        except Exception as e:
+            self.log(f"  Analysis error: {str(e)}")
+            return result
+        if not analysis:
+            return result
+
+        result.analysis_file = analysis.analysis_file
+        result.analysis_text = analysis.analysis_text
+        result.structured_data = analysis.structured_data
+        result.status = COMPLETED
+        if deliver:
+            self.deliver(result.structured_data, title, meeting_key, '', streamed_titles)
+        return result
+
+    # --- Webex ---------------------------------------------------------------
+
+    def webex_api_url(self, path):
+        """Webex REST URL under webex_api_base_url (so load tests can target mock_server_v2)"""
+        base_url = self.config_manager.config.get('webex_api_base_url') or WEBEX_API_BASE_URL
+        return f"{base_url.rstrip('/')}/{path}"
+
+    def extract_meeting_id_from_email(self, body):
+        """Extract Webex meeting ID from email body"""
+        # Look for meeting ID patterns in the email
+        # Pattern 1: Meeting number
+        meeting_patterns = [
+            r'Meeting\s+(?:number|ID|#)[\s:]+(\d{9,15})',
+            r'meetingKey["\']?\s*[:=]\s*["\']?([a-f0-9]{32})',
+            r'webex\.com/meet/([a-zA-Z0-9\-_]+)',
+            r'webex\.com/m/([a-zA-Z0-9\-_]+)',
+            r'meetingUUID["\']?\s*[:=]\s*["\']?([a-f0-9\-]{36})',
+        ]
+
+        for pattern in meeting_patterns:
+            match = re.search(pattern, body, re.IGNORECASE)
+            if match:
+                meeting_id = match.group(1)
+                self.log(f"  Found meeting ID: {meeting_id[:20]}...")
+                return meeting_id
+
+        return None
+
+    def fetch_transcript_from_webex(self, meeting_id, access_token):
+        """Fetch transcript from Webex API using meeting ID"""
+        try:
+            self.log(f"  Calling Webex Meetings API...")
+            headers = {
+                'Authorization': f'Bearer {access_token}',
+                'Content-Type': 'application/json'
+            }
+
+            # Try to get meeting details first
+            # Note: Webex transcript API may require specific scopes
+            # This is a simplified approach - may need adjustment based on actual API
+
+            # Option 1: Try meetings API
+            meetings_url = self.webex_api_url(f'meetings/{meeting_id}')
+            response = requests.get(meetings_url, headers=headers, timeout=30)
+
+            if response.status_code == 200:
+                meeting_data = response.json()
+                self.log(f"  ✓ Got meeting details")
+
+                # Check if transcript is available
+                # Note: Actual field names may vary
+                transcript_url = meeting_data.get('transcriptUrl') or meeting_data.get('transcript')
+
+                if transcript_url:
+                    self.log(f"  Downloading transcript...")
+                    transcript_response = requests.get(transcript_url, headers=headers, timeout=60)
+                    if transcript_response.status_code == 200:
+                        return transcript_response.text
+
+            # Option 2: Try recordings API to find transcript
+            self.log(f"  Trying recordings API...")
+            recordings_url = self.webex_api_url('recordings')
+
+            # Search for recordings with this meeting ID
+            # This is similar to the VTT download logic
+            now = datetime.now(timezone.utc)
+            search_from = (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            search_to = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+            params = {'max': 100, 'from': search_from, 'to': search_to}
+            response = requests.get(recordings_url, headers=headers, params=params, timeout=30)
+
+            if response.status_code == 200:
+                recordings = response.json().get('items', [])
+                self.log(f"  Found {len(recordings)} recordings")
+
+                for rec in recordings:
+                    # Try to match by meeting ID
+                    if str(meeting_id) in str(rec.get('meetingId', '')):
+                        rec_id = rec.get('id')
+                        self.log(f"  Found matching recording: {rec_id}")
+
+                        # Get recording details
+                        detail_url = self.webex_api_url(f'recordings/{rec_id}')
+                        detail_response = requests.get(detail_url, headers=headers, timeout=30)
+
+                        if detail_response.status_code == 200:
+                            rec_full = detail_response.json()
+                            links = rec_full.get('temporaryDirectDownloadLinks', {})
+                            transcript_link = links.get('transcriptDownloadLink')
+
+                            if transcript_link:
+                                self.log(f"  Downloading transcript...")
+                                transcript_response = requests.get(transcript_link, timeout=60)
+                                if transcript_response.status_code == 200:
+                                    # Convert VTT to plain text
+                                    return self.extract_text_from_vtt(transcript_response.text)
+
+            self.log(f"  ✗ No transcript found via API")
+            return None
+
+        except Exception as e:
+            self.log(f"  Error fetching transcript: {str(e)}")
+            return None
+
+    def extract_transcript_from_email_text(self, text):
+        """Extract transcript content from email plain text (fallback)"""
+        # Remove excessive whitespace
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+        # Try to find where transcript starts
+        # Common headers: "Transcript:", "Meeting Notes:", etc.
+        transcript_start_idx = 0
+        for idx, line in enumerate(lines):
+            if any(marker in line.lower() for marker in ['transcript', 'meeting notes', 'conversation']):
+                transcript_start_idx = idx + 1
+                break
+
+        # Take everything after the header
+        transcript_lines = lines[transcript_start_idx:]
+
+        # Filter out common email footer junk
+        filtered_lines = []
+        for line in transcript_lines:
+            # Skip lines that are likely email metadata
+            if any(skip in line.lower() for skip in [
+                'unsubscribe', 'privacy', 'cisco.com', 'copyright',
+                'do not reply', 'automatic message', 'webex teams'
+            ]):
+                continue
+            filtered_lines.append(line)
+
+        return '\n'.join(filtered_lines)
+
+    def extract_webex_info_from_body(self, subject, body):
+        """Extract Webex URL and password from email"""
+        self.log("  Extracting Webex info from email body...")
+
+        soup = BeautifulSoup(body, 'html.parser')
+        text = soup.get_text()
+
+        # Log first 500 chars of body for debugging
+        body_preview = body[:500] if body else "(empty)"
+        self.log(f"  Body preview (first 500 chars): {body_preview[:200]}...")
+
+        webex_patterns = [
+            r'https://[\w\-]+\.webex\.com/[\w\-]+/ldr\.php?[^\s"<>]+',
+            r'https://[\w\-]+\.webex\.com/[\w\-]+/lsr\.php?[^\s"<>]+',
+            r'https://[\w\-]+\.webex\.com/webappng/sites/[\w\-]+/recording/[^\s"<>]+',
+            r'https://[\w\-]+\.webex\.com/recordingservice/sites/[\w\-]+/recording/playback/[^\s"<>]+',
+        ]
+
+        meeting_url = None
+        for idx, pattern in enumerate(webex_patterns):
+            match = re.search(pattern, body, re.IGNORECASE)
+            if match:
+                meeting_url = match.group(0)
+                self.log(f"  ✓ Found URL with pattern {idx+1}: {meeting_url[:80]}...")
+                break
+
+        if not meeting_url:
+            self.log("  ✗ No Webex URL found in email body")
+            self.log(f"  Searched {len(webex_patterns)} patterns")
+            return None
+
+        password_patterns = [
+            r'Password[\s:]+([a-zA-Z0-9]+)',
+            r'password[\s:]+([a-zA-Z0-9]+)',
+            r'Recording password[\s:]+([a-zA-Z0-9]+)',
+        ]
+
+        password = None
+        for pattern in password_patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                password = match.group(1).strip()
+                self.log(f"  ✓ Found password: {password[:3]}***")
+                break
+
+        if not password:
+            self.log("  ⚠ No password found (may not be required)")
+
+        return {'url': meeting_url, 'password': password}
+
+    def download_vtt_from_webex(self, webex_info, output_dir, subject, access_token, classifier=None):
+        """Download VTT from Webex API - simplified version
+
+        If an IncrementalMeetingClassifier is passed, cue text is fed to it
+        while the file streams in, so a provisional meeting type is known
+        by the time the download finishes.
+        """
+        try:
+            recording_url = webex_info['url']
+            normalized_title = self.normalize_title(subject)
+
+            self.log(f"  Recording URL: {recording_url[:80]}...")
+            self.log(f"  Normalized title: {normalized_title}")
+
+            rcid = self.extract_recording_id(recording_url)
+            if not rcid:
+                self.log("  ✗ Could not extract recording ID from URL")
+                return None
+
+            self.log(f"  Recording ID: {rcid}")
+
+            headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
+            self.log(f"  Using token length: {len(access_token)}")
+
+            # Search last 30 days
+            now = datetime.now(timezone.utc)
+            search_from = (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            search_to = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+            # List recordings
+            list_url = self.webex_api_url('recordings')
+            params = {'max': 100, 'from': search_from, 'to': search_to}
+            self.log(f"  Calling Webex API to list recordings...")
+            response = requests.get(list_url, headers=headers, params=params, timeout=30)
+
+            self.log(f"  API Response: {response.status_code}")
+
+            if response.status_code != 200:
+                self.log(f"  ✗ API Error: {response.text[:200]}")
+                return None
+
+            recordings = response.json().get('items', [])
+            self.log(f"  Found {len(recordings)} recordings in last 30 days")
+
+            # Find best match (simplified - just use title matching)
+            best_match = None
+            best_score = 0
+
+            self.log(f"  Searching for match to: '{normalized_title}'")
+
+            for rec in recordings:
+                topic = rec.get('topic', '').lower()
+                title_words = set(normalized_title.lower().split())
+                topic_words = set(topic.split())
+
+                # Score by word overlap
+                overlap = len(title_words.intersection(topic_words))
+                if overlap > best_score:
+                    best_score = overlap
+                    best_match = rec
+                    self.log(f"    Better match: '{rec.get('topic', 'N/A')}' (score: {overlap})")
+
+            if not best_match or best_score < 1:
+                self.log(f"  ✗ No good match found (best score: {best_score})")
+                if recordings:
+                    self.log(f"    Available recordings: {[r.get('topic', 'N/A')[:40] for r in recordings[:3]]}")
+                return None
+
+            self.log(f"  ✓ Best match: '{best_match.get('topic', 'N/A')}' (score: {best_score})")
+
+            # Get VTT download link
+            rec_id = best_match.get('id')
+            detail_url = self.webex_api_url(f'recordings/{rec_id}')
+            self.log(f"  Getting recording details...")
+            detail_response = requests.get(detail_url, headers=headers, timeout=30)
+
+            if detail_response.status_code != 200:
+                self.log(f"  ✗ Failed to get recording details: {detail_response.status_code}")
+                return None
+
+            rec_full = detail_response.json()
+            links = rec_full.get('temporaryDirectDownloadLinks', {})
+            vtt_url = links.get('transcriptDownloadLink')
+
+            if not vtt_url:
+                self.log(f"  ✗ No transcript download link available")
+                self.log(f"    Available links: {list(links.keys())}")
+                return None
+
+            self.log(f"  ✓ Found transcript link")
+
+            # Download VTT (streamed straight to disk)
+            self.log(f"  Downloading VTT file...")
+            vtt_response = requests.get(vtt_url, timeout=60, stream=True)
+            if vtt_response.status_code != 200:
+                self.log(f"  ✗ VTT download failed: {vtt_response.status_code}")
+                return None
+
+            safe_title = re.sub(r'[^\w\s-]', '', normalized_title)[:50]
+            filename = f"{safe_title}_{rec_id}.vtt"
+            filepath = os.path.join(output_dir, filename)
+
+            downloaded = 0
+            pending = b''
+            expect_text = False
+            announced = False
+            with open(filepath, 'wb') as f:
+                for chunk in vtt_response.iter_content(chunk_size=8192):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    downloaded += len(chunk)
+
+                    if classifier is None:
+                        continue
+                    pending += chunk
+                    *lines, pending = pending.split(b'\n')
+                    expect_text = self.feed_vtt_lines(lines, classifier, expect_text)
+
+                    if not announced and classifier.is_confident():
+                        announced = True
+                        self.log(f"  📊 Provisional classification after {downloaded} bytes: "
+                                 f"{classifier.provisional_meeting_type.upper()}")
+
+                if classifier is not None and pending:
+                    self.feed_vtt_lines([pending], classifier, expect_text)
+
+            self.log(f"  ✓ Downloaded {downloaded} bytes")
+
+            return filename
+
+        except Exception as e:
+            self.log(f"  Error downloading VTT: {str(e)}")
+            return None
+
+    def normalize_title(self, subject):
+        """Clean up email subject"""
+        if not subject:
+            return "Untitled"
+
+        prefixes = ["Fw:", "Re:", "FW:", "RE:", "Fwd:", "Webex:", "Recording:",
+                    "Recording of", "Recording available:", "Your Webex meeting content is available:"]
+
+        title = subject.strip()
+        for prefix in prefixes:
+            if title.lower().startswith(prefix.lower()):
+                title = title[len(prefix):].strip()
+
+        return ' '.join(title.split()) if title else "Untitled"
+
+    def extract_recording_id(self, url):
+        """Extract recording ID from URL"""
+        patterns = [r'RCID=([a-f0-9\-]+)', r'/recording/([a-f0-9\-]+)',
+                    r'recordingId=([a-f0-9\-]+)', r'/playback/([a-f0-9\-]+)']
+
+        for pattern in patterns:
+            match = re.search(pattern, url, re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+
+    # --- Analysis ------------------------------------------------------------
+
+    def get_analysis_engine(self, output_dir):
+        """Analysis engine configured from the current credentials and settings
+
+        The engine (and its cached Chat AI token) is reused until the settings change.
+        """
+        config = AnalysisConfig.from_settings(
+            self.config_manager.config,
+            chatai_client_id=self.credentials('chatai_client_id') or '',
+            chatai_client_secret=self.credentials('chatai_client_secret') or '',
+            chatai_app_key=self.credentials('chatai_app_key') or '',
+            llm_api_key=self.credentials('llm_api_key') or '',
+            output_dir=output_dir
+        )
+
+        replaced = None
+        with self.analysis_engine_lock:
+            if self.analysis_engine is None or self.analysis_engine.config != config:
+                replaced = self.analysis_engine
+                self.analysis_engine = AnalysisEngine(config, cache=self.analysis_cache, log_callback=self.log)
+            engine = self.analysis_engine
+        if replaced is not None:
+            replaced.close()
+        return engine
+
+    def analyze_transcript_text(self, transcript_text, meeting_title, output_dir, safe_title, on_item=None):
+        """Analyze transcript text using Chat AI (similar to VTT analysis)"""
+        try:
+            transcript = Transcript.from_text(meeting_title, transcript_text, base_name=safe_title)
+            result = self.get_analysis_engine(output_dir).analyze(transcript, on_item=on_item)
+
+            if not result:
+                return None
+
+            return (result.analysis_text, result.structured_data)
+
+        except Exception as e:
+            self.log(f"  Analysis error: {str(e)}")
+            return None
+
+    def analyze_vtt_file(self, output_dir, vtt_filename, meeting_title, classification=None, on_item=None):
+        """Analyze VTT with Chat AI - simplified
+
+        classification may be supplied by the streaming download to skip
+        re-scanning the full transcript; on_item receives stories/actions
+        as they stream in from Chat AI.
+        """
+        try:
+            # Read VTT
+            vtt_filepath = os.path.join(output_dir, vtt_filename)
+            with open(vtt_filepath, 'r', encoding='utf-8') as f:
+                vtt_content = f.read()
+
+            base_filename = vtt_filename.replace('.vtt', '')
+            transcript = Transcript.from_vtt(meeting_title, vtt_content, base_name=base_filename)
+            result = self.get_analysis_engine(output_dir).analyze(transcript, classification=classification,
+                                                                  on_item=on_item)
+
+            if not result:
+                return None
+
+            return (result.analysis_file, result.analysis_text, result.structured_data)
+
+        except Exception as e:
+            self.log(f"  Analysis error: {str(e)}")
+            return None
+
+    def extract_text_from_vtt(self, vtt_content):
+        """Extract text from VTT"""
+        return cues_to_text(parse_vtt_cues(vtt_content))
+
+    def feed_vtt_lines(self, raw_lines, classifier, expect_text=False):
+        """Feed cue text from raw VTT lines to an incremental classifier
+
+        Mirrors extract_text_from_vtt (the first line after each timing line
+        is the cue text) but works on lines as they arrive.
+
+        Args:
+            raw_lines: List of VTT lines as bytes
+            classifier: IncrementalMeetingClassifier to feed
+            expect_text: True if the previous batch ended on a timing line
+
+        Returns:
+            expect_text state to pass with the next batch
+        """
+        for raw in raw_lines:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if expect_text:
+                expect_text = False
+                if line:
+                    classifier.feed(line + ' ')
+            if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
+                continue
+            if '-->' in line:
+                expect_text = True
+
+        return expect_text
+
+    # --- Integrations --------------------------------------------------------
+
+    def make_webex_integration(self, bot_token):
+        """Webex bot integration using the configured delivery mode"""
+        return WebexBotIntegration(
+            bot_token, log_callback=self.log,
+            delivery_mode=self.config_manager.config.get('webex_delivery_mode', 'split'),
+            api_base_url=self.config_manager.config.get('webex_api_base_url')
+        )
+
+    def send_webex_digest(self, recipient_email, meetings, **resume):
+        """Deliver a pending digest (called from the digest scheduler thread)
+
+        resume holds sent_at / start_part / on_part from the scheduler, so a
+        partly delivered digest continues where it stopped.
+        """
+        bot_token = self.credentials('webex_bot_token')
+        if not bot_token:
+            self.log("  ⚠️ Webex Bot Token not configured - digest kept for later")
+            return False
+        return self.make_webex_integration(bot_token).send_digest(recipient_email, meetings, **resume)
+
+    def make_tasks_integration(self):
+        """Outlook Tasks integration that skips (or updates) actions already delivered"""
+        return OutlookTasksIntegration(
+            log_callback=self.log,
+            ledger=self.delivery_ledger,
+            update_existing=self.config_manager.config.get('delivery_update_existing', False)
+        )
+
+    def make_streamed_task_creator(self, subject, meeting_key=None):
+        """Create Outlook tasks for action items as they stream in from Chat AI
+
+        Streamed items are validated like the final parse, and remembered by
+        normalized title (the delivery ledger's key) so deliver() skips them.
+
+        Returns:
+            (on_item callback or None, set of normalized titles already created as tasks)
+        """
+        created: Set[str] = set()
+        if not self.option('auto_create_tasks', False):
+            return None, created
+
+        tasks_integration = self.make_tasks_integration()
+
+        def on_item(collection, item):
+            if collection != 'actions':
+                return
+            action = validate_item(item, ACTION_FIELDS, 'title')
+            if action is None:
+                return
+            title = normalize_title(action['title'])
+            if title in created:
+                return
+            tasks_integration.create_tasks_from_actions([action], subject, meeting_key)
+            created.add(title)
+
+        return on_item, created
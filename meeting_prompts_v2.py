@@ -1,8 +1,15 @@
 """
 LLM Prompt Templates for Meeting Analysis v2.0
 Provides structured prompts for refinement (stories) vs general (action items) meetings
+
+Templates are compiled once into a registry (PROMPT_TEMPLATES); each has a
+content-hash version that is stamped into saved analyses and cache keys.
 """
 
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import hashlib
+import re
+
 SYSTEM_PROMPT = """
 You are a structured assistant that turns meeting transcripts into JSON
 for a product team.
@@ -18,9 +25,7 @@ Use that to decide whether to generate user stories or action items.
 """.strip()
 
 
-def build_refinement_user_prompt(meeting_title: str, transcript: str) -> str:
-    """Build prompt for refinement meetings -> user stories"""
-    return f"""
+REFINEMENT_USER_TEMPLATE = """
 meeting_type: "refinement"
 
 Project context:
@@ -55,32 +60,30 @@ Task:
 Output:
 Return ONLY valid JSON in this exact shape:
 
-{{
+{
   "meeting_type": "refinement",
   "stories": [
-    {{
+    {
       "summary": "string",
       "description": "string",
       "acceptance_criteria": ["string"],
       "estimate_points": null,
       "assignees": [],
       "labels": []
-    }}
+    }
   ]
-}}
+}
 
 If no clear stories are present, return:
 
-{{
+{
   "meeting_type": "refinement",
   "stories": []
-}}
+}
 """.strip()
 
 
-def build_general_user_prompt(meeting_title: str, transcript: str) -> str:
-    """Build prompt for general meetings -> action items"""
-    return f"""
+GENERAL_USER_TEMPLATE = """
 meeting_type: "general"
 
 Project context:
@@ -113,31 +116,29 @@ Task:
 Output:
 Return ONLY valid JSON in this exact shape:
 
-{{
+{
   "meeting_type": "general",
   "actions": [
-    {{
+    {
       "title": "string",
       "description": "string",
       "owner": null,
       "due_date_hint": null,
       "related_decision": null
-    }}
+    }
   ]
-}}
+}
 
 If no clear action items are present, return:
 
-{{
+{
   "meeting_type": "general",
   "actions": []
-}}
+}
 """.strip()
 
 
-def build_mixed_user_prompt(meeting_title: str, transcript: str) -> str:
-    """Build prompt for mixed meetings -> both stories and action items"""
-    return f"""
+MIXED_USER_TEMPLATE = """
 meeting_type: "mixed"
 
 Project context:
@@ -160,28 +161,218 @@ Task:
 Output:
 Return ONLY valid JSON in this exact shape:
 
-{{
+{
   "meeting_type": "mixed",
   "stories": [
-    {{
+    {
       "summary": "string",
       "description": "string",
       "acceptance_criteria": ["string"],
       "estimate_points": null,
       "assignees": [],
       "labels": []
-    }}
+    }
   ],
   "actions": [
-    {{
+    {
       "title": "string",
       "description": "string",
       "owner": null,
       "due_date_hint": null,
       "related_decision": null
-    }}
+    }
   ]
-}}
+}
 
 If no stories or actions are found, return empty arrays for each.
 """.strip()
+
+
+# --- Template registry --------------------------------------------------------
+
+class PromptTemplate:
+    """
+    A user prompt template compiled once into literal segments and slots.
+
+    render() fills the slots and joins everything in a single pass, so the
+    transcript (or its cue texts) is copied exactly once into the prompt.
+    """
+
+    SLOTS = ('meeting_title', 'transcript')
+
+    def __init__(self, name: str, text: str, system_prompt: str = SYSTEM_PROMPT):
+        self.name = name
+        self.text = text
+        self.system_prompt = system_prompt
+        self.version = _content_version(system_prompt, text)
+
+        # "a {meeting_title} b {transcript} c" -> ["a ", "title", " b ", "transcript", " c"]
+        self._parts: List[str] = []
+        self._slot_positions: Dict[str, List[int]] = {slot: [] for slot in self.SLOTS}
+        pattern = re.compile(r'\{(' + '|'.join(self.SLOTS) + r')\}')
+        position = 0
+        for match in pattern.finditer(text):
+            self._parts.append(text[position:match.start()])
+            self._slot_positions[match.group(1)].append(len(self._parts))
+            self._parts.append("")
+            position = match.end()
+        self._parts.append(text[position:])
+
+    def render(self, meeting_title: str, transcript: Union[str, Sequence[str]],
+               preamble: Optional[str] = None) -> str:
+        """
+        Args:
+            meeting_title: Meeting title
+            transcript: Transcript text, or cue texts to be joined with spaces
+            preamble: Text placed before the prompt (e.g. chunk position)
+
+        Returns:
+            The rendered user prompt
+        """
+        parts = list(self._parts)
+        for index in self._slot_positions['meeting_title']:
+            parts[index] = meeting_title
+        if isinstance(transcript, str):
+            for index in self._slot_positions['transcript']:
+                parts[index] = transcript
+        else:
+            pieces = list(transcript)
+            # Splice the cue texts in place of the slot (last slot first, so indexes hold)
+            for index in reversed(self._slot_positions['transcript']):
+                spaced = [None] * (2 * len(pieces) - 1) if pieces else []
+                spaced[0::2] = pieces
+                spaced[1::2] = [' '] * (len(pieces) - 1)
+                parts[index:index + 1] = spaced
+        if preamble:
+            parts[0:0] = [preamble, "\n\n"]
+        return ''.join(parts)
+
+
+def _content_version(system_prompt: str, template: str) -> str:
+    digest = hashlib.sha256(f"{system_prompt}\n\n{template}".encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class PromptTemplateRegistry:
+    """Compiled user prompt templates by meeting type, with content-hash versions"""
+
+    def __init__(self, fallback: str = "mixed"):
+        self.fallback = fallback
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._versions: Dict[Tuple[str, bool], str] = {}
+
+    def register(self, meeting_type: str, text: str) -> PromptTemplate:
+        template = PromptTemplate(meeting_type, text)
+        self._templates[meeting_type] = template
+        self._versions = {}
+        return template
+
+    def get(self, meeting_type: str) -> PromptTemplate:
+        """Template for a meeting type (unknown types use the fallback)"""
+        return self._templates.get(meeting_type) or self._templates[self.fallback]
+
+    def version(self, meeting_type: str, chunked: bool = False) -> str:
+        key = (meeting_type, chunked)
+        if key not in self._versions:
+            template = self.get(meeting_type)
+            if chunked:
+                self._versions[key] = _content_version(
+                    template.system_prompt, f"{CHUNK_PREAMBLE}\n\n{template.text}"
+                )
+            else:
+                self._versions[key] = template.version
+        return self._versions[key]
+
+    def versions(self) -> Dict[str, str]:
+        """{meeting type: version} for every registered template"""
+        return {name: template.version for name, template in self._templates.items()}
+
+
+PROMPT_TEMPLATES = PromptTemplateRegistry()
+PROMPT_TEMPLATES.register("refinement", REFINEMENT_USER_TEMPLATE)
+PROMPT_TEMPLATES.register("general", GENERAL_USER_TEMPLATE)
+PROMPT_TEMPLATES.register("mixed", MIXED_USER_TEMPLATE)
+
+
+def build_refinement_user_prompt(meeting_title: str, transcript: str) -> str:
+    """Build prompt for refinement meetings -> user stories"""
+    return PROMPT_TEMPLATES.get("refinement").render(meeting_title, transcript)
+
+
+def build_general_user_prompt(meeting_title: str, transcript: str) -> str:
+    """Build prompt for general meetings -> action items"""
+    return PROMPT_TEMPLATES.get("general").render(meeting_title, transcript)
+
+
+def build_mixed_user_prompt(meeting_title: str, transcript: str) -> str:
+    """Build prompt for mixed meetings -> both stories and action items"""
+    return PROMPT_TEMPLATES.get("mixed").render(meeting_title, transcript)
+
+
+def get_prompt_builder(meeting_type: str):
+    """Return the user prompt builder for a meeting type (unknown -> mixed)"""
+    if meeting_type == "refinement":
+        return build_refinement_user_prompt
+    if meeting_type == "general":
+        return build_general_user_prompt
+    return build_mixed_user_prompt
+
+
+CHUNK_PREAMBLE = """
+chunk: part {part} of {total_parts}
+
+This transcript is one part of a longer meeting that has been split into
+overlapping parts. Only extract items that are discussed in THIS part.
+The start of this part may repeat the end of the previous part; do not
+worry about duplicates, they are merged afterwards.
+""".strip()
+
+
+def build_chunk_user_prompt(
+    meeting_type: str, meeting_title: str, transcript: str, part: int, total_parts: int
+) -> str:
+    """Build prompt for one part of a long meeting (map step of chunked analysis)"""
+    preamble = CHUNK_PREAMBLE.format(part=part, total_parts=total_parts)
+    return PROMPT_TEMPLATES.get(meeting_type).render(meeting_title, transcript, preamble=preamble)
+
+
+def get_prompt_template_version(meeting_type: str, chunked: bool = False) -> str:
+    """
+    Short content hash of the system prompt + user prompt template used for
+    a meeting type. Any wording change produces a new version, so results
+    produced by an older template are never reused.
+    """
+    return PROMPT_TEMPLATES.version(meeting_type, chunked)
+
+
+BATCH_PREAMBLE = """
+batch: {count} meetings
+
+Below are {count} separate, unrelated meetings, each between
+"=== MEETING <id> ===" and "=== END MEETING <id> ===". Handle each meeting
+exactly as its own instructions say, without mixing content between them.
+
+Return ONLY one JSON object keyed by meeting id, where each value is the
+JSON that meeting's instructions ask for:
+
+{{
+{keys}
+}}
+""".strip()
+
+
+def build_batch_user_prompt(meeting_prompts) -> str:
+    """
+    Combine several single-meeting user prompts into one request.
+
+    Args:
+        meeting_prompts: List of (meeting id, user prompt) pairs
+
+    Returns:
+        User prompt asking for a JSON object keyed by meeting id
+    """
+    keys = ",\n".join(f'  "{key}": {{ ... }}' for key, _ in meeting_prompts)
+    parts = [BATCH_PREAMBLE.format(count=len(meeting_prompts), keys=keys)]
+    for key, prompt in meeting_prompts:
+        parts.append(f"=== MEETING {key} ===\n{prompt}\n=== END MEETING {key} ===")
+    return "\n\n".join(parts)
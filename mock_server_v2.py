@@ -0,0 +1,569 @@
+"""
+Mock Server v2.0
+Local stand-in for every service the pipeline talks to (Webex, Cisco SSO,
+Chat AI and Jira) so throughput and tail latency can be measured on a
+laptop with no network access.
+
+Chat AI / SSO:
+- POST .../token                          -> client-credentials access token
+- POST .../chat/completions               -> canned completion (plain JSON or SSE stream)
+
+Webex (webex_api_base_url = <base>/v1):
+- POST /v1/access_token                   -> Service App token
+- GET  /v1/recordings                     -> paged list (max, from, to; Link: rel="next")
+- GET  /v1/recordings/{id}                -> details with temporaryDirectDownloadLinks
+- GET  /v1/meetings/{id}                  -> meeting with a transcriptUrl
+- POST /v1/messages                       -> bot message (JSON or multipart)
+- GET  /downloads/{id}.vtt                -> synthetic transcript
+
+Jira (JIRA_URL = <base>):
+- GET  /rest/api/3/field, /rest/api/3/issue/createmeta/{project}/issuetypes[/{id}]
+- POST /rest/api/3/issue, /rest/api/3/issue/bulk; PUT /rest/api/3/issue/{key}
+
+- GET  /health                            -> request / error counters
+
+Latency (with jitter) applies to every request; the error rate to
+completions and the Webex / Jira APIs (429 with Retry-After, or 503).
+Recordings and transcripts come from the seeded corpora in
+benchmarks/corpus.py, and --write-eml exports one notification email per
+recording so a headless backfill can be pointed at the lot.
+
+Usage:
+    python mock_server_v2.py --port 8765 --latency-ms 800 --tokens-per-sec 80 --error-rate 0.05
+    python analysis_engine_v2.py meeting.vtt --base-url http://127.0.0.1:8765/openai/deployments \\
+        --sso-url http://127.0.0.1:8765/oauth2/default/v1/token
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+
+from benchmarks.corpus import SUBJECT_PREFIX, TOPICS, vtt_transcript
+from llm_backends_v2 import canned_completion
+from token_estimator_v2 import estimate_tokens
+
+SSO_PATH = '/oauth2/default/v1/token'
+CHATAI_PATH = '/openai/deployments'
+WEBEX_PATH = '/v1'
+WEBEX_PAGE_MAX = 100  # Largest page /v1/recordings returns, as on webexapis.com
+
+JIRA_FIELDS = [
+    {'id': 'summary', 'name': 'Summary', 'custom': False, 'schema': {'type': 'string'}},
+    {'id': 'description', 'name': 'Description', 'custom': False, 'schema': {'type': 'string'}},
+    {'id': 'labels', 'name': 'Labels', 'custom': False, 'schema': {'type': 'array'}},
+    {'id': 'assignee', 'name': 'Assignee', 'custom': False, 'schema': {'type': 'user'}},
+    {'id': 'customfield_10016', 'name': 'Story Points', 'custom': True, 'schema': {'type': 'number'}},
+    {'id': 'customfield_10100', 'name': 'Acceptance Criteria', 'custom': True, 'schema': {'type': 'string'}},
+]
+JIRA_ISSUE_TYPES = {
+    '10001': ('Story', ['summary', 'description', 'labels', 'assignee', 'customfield_10016', 'customfield_10100']),
+    '10002': ('Task', ['summary', 'description', 'labels', 'assignee']),
+}
+
+
+class MockServer:
+    """Threaded HTTP server with Webex, SSO, Chat AI and Jira routes"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, tokens_per_sec=0,
+                 error_rate=0.0, seed=None, log_callback=None, jitter_ms=0, page_size=WEBEX_PAGE_MAX,
+                 recordings=50, transcript_minutes=30):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = pick a free port)
+            latency_ms: Delay before every response
+            tokens_per_sec: Output speed of completions (0 = instant)
+            error_rate: Fraction of completion / Webex / Jira requests answered with 429/503
+            seed: Random seed for reproducible error injection and corpora
+            log_callback: Function to call for logging
+            jitter_ms: Extra random delay (0..jitter_ms) on top of latency_ms
+            page_size: Most recordings per /v1/recordings page
+            recordings: Synthetic recordings listed by the Webex API
+            transcript_minutes: Length of each synthetic transcript
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.page_size = max(1, min(page_size, WEBEX_PAGE_MAX))
+        self.transcript_minutes = transcript_minutes
+        self.seed = seed or 0
+        self.log = log_callback or print
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'token_requests': 0, 'completion_requests': 0, 'errors_injected': 0,
+                      'webex_token_requests': 0, 'recording_lists': 0, 'recording_details': 0,
+                      'meeting_details': 0, 'transcript_downloads': 0, 'messages_posted': 0,
+                      'jira_metadata_requests': 0, 'jira_issues_created': 0, 'jira_bulk_requests': 0,
+                      'jira_issues_updated': 0}
+
+        self.recordings = []
+        self._transcripts = {}
+        self._issue_numbers = itertools.count(1)
+        corpus_random = random.Random(self.seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        for index in range(recordings):
+            created = now - timedelta(minutes=corpus_random.randint(60, 7 * 24 * 60))
+            self.add_recording(f"{corpus_random.choice(TOPICS)} #{index}", created)
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def chatai_base_url(self):
+        return self.base_url + CHATAI_PATH
+
+    @property
+    def sso_url(self):
+        return self.base_url + SSO_PATH
+
+    @property
+    def webex_api_base_url(self):
+        return self.base_url + WEBEX_PATH
+
+    @property
+    def jira_url(self):
+        return self.base_url
+
+    def config_overrides(self):
+        """Config values that point the pipeline at this server"""
+        return {'chatai_base_url': self.chatai_base_url, 'chatai_sso_url': self.sso_url,
+                'webex_api_base_url': self.webex_api_base_url}
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def delay(self):
+        """Sleep for the configured latency (plus jitter)"""
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        if self.latency_ms or jitter:
+            time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def injected_error(self):
+        """Status code to fail this request with (None = serve it)"""
+        with self._lock:
+            if self._random.random() >= self.error_rate:
+                return None
+            self.stats['errors_injected'] += 1
+            return self._random.choice((429, 503))
+
+    # --- Corpus --------------------------------------------------------------
+
+    def add_recording(self, topic, created=None):
+        """
+        List a recording (e.g. one matching a specific notification email).
+
+        Returns:
+            The recording dict as /v1/recordings returns it
+        """
+        created = created or datetime.now(timezone.utc).replace(microsecond=0)
+        recording_id = uuid.uuid5(uuid.NAMESPACE_URL, f"{self.seed}/{topic}/{created.isoformat()}").hex
+        recording = {
+            'id': recording_id,
+            'meetingId': f"{uuid.uuid5(uuid.NAMESPACE_OID, recording_id).hex}_I_{len(self.recordings) + 1}",
+            'topic': topic,
+            'createTime': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'timeRecorded': created.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'durationSeconds': self.transcript_minutes * 60,
+            'format': 'ARF',
+            'status': 'available',
+        }
+        with self._lock:
+            self.recordings.append(recording)
+            self.recordings.sort(key=lambda item: item['createTime'], reverse=True)  # Newest first, as Webex
+        return recording
+
+    def transcript(self, key):
+        """Synthetic VTT for a recording / meeting id (generated once)"""
+        with self._lock:
+            text = self._transcripts.get(key)
+        if text is None:
+            text = vtt_transcript(self.transcript_minutes, seed=int(uuid.uuid5(uuid.NAMESPACE_URL, key)) % 2 ** 32)
+            with self._lock:
+                self._transcripts[key] = text
+        return text
+
+    def notification_email(self, recording) -> EmailMessage:
+        """The "meeting content is available" email Webex sends for a recording"""
+        link = f"https://mock.webex.com/webappng/sites/mock/recording/{recording['id']}/playback"
+        message = EmailMessage()
+        message['Subject'] = SUBJECT_PREFIX + recording['topic']
+        message['From'] = "Webex <messenger@webex.com>"
+        message['Date'] = format_datetime(datetime.strptime(recording['createTime'], '%Y-%m-%dT%H:%M:%SZ')
+                                          .replace(tzinfo=timezone.utc))
+        message['Message-ID'] = make_msgid(idstring=recording['id'], domain='mock.webex.com')
+        message.set_content(f"{recording['topic']}\nView recording: {link}\nPassword: Mock1234\n")
+        message.add_alternative(
+            f"<html><body><h2>{recording['topic']}</h2><p><a href=\"{link}\">View recording</a> {link}</p>"
+            "<p>Recording password: Mock1234</p></body></html>", subtype='html')
+        return message
+
+    def write_notifications(self, directory) -> int:
+        """Write one .eml notification per recording (for backfill/run --source DIR)"""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            recordings = list(self.recordings)
+        for recording in recordings:
+            with open(os.path.join(directory, f"{recording['id']}.eml"), 'wb') as f:
+                f.write(bytes(self.notification_email(recording)))
+        return len(recordings)
+
+    def recordings_page(self, params):
+        """(items, next offset or None) of one /v1/recordings page"""
+        def parse(name):
+            value = params.get(name)
+            if not value:
+                return None
+            return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S').strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        try:
+            since, until = parse('from'), parse('to')
+            size = min(int(params.get('max') or self.page_size), self.page_size)
+            offset = int(params.get('cursor') or 0)
+        except ValueError:
+            return None, None
+        with self._lock:
+            matching = [item for item in self.recordings
+                        if (since is None or item['createTime'] >= since)
+                        and (until is None or item['createTime'] < until)]
+        end = offset + max(1, size)
+        return matching[offset:end], (end if end < len(matching) else None)
+
+    # --- Request handling ----------------------------------------------------
+
+    def _make_handler(server):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass  # Keep load tests quiet
+
+            def _send_json(self, status, body, headers=None):
+                data = json.dumps(body).encode('utf-8') if body is not None else b''
+                self.send_response(status)
+                if body is not None:
+                    self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, status, text, content_type='text/vtt'):
+                data = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                return self.rfile.read(length) if length else b''
+
+            def _read_json(self):
+                try:
+                    return json.loads(self._read_body() or b'{}')
+                except ValueError:
+                    return None
+
+            def _failed(self):
+                """Answer with an injected error; True if one was sent"""
+                status = server.injected_error()
+                if status == 429:
+                    self._send_json(429, {'message': 'rate limited'}, {'Retry-After': '1'})
+                elif status:
+                    self._send_json(503, {'message': 'service unavailable'})
+                return status is not None
+
+            def _split(self):
+                parts = urlsplit(self.path)
+                params = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+                return parts.path.rstrip('/'), params
+
+            def do_GET(self):
+                path, params = self._split()
+                if path == '/health':
+                    self._send_json(200, {'status': 'ok', **server.stats})
+                    return
+
+                server.delay()
+                match = re.fullmatch(r'/downloads/([\w\-]+)\.vtt', path)
+                if match:
+                    server.count('transcript_downloads')
+                    self._send_text(200, server.transcript(match.group(1)))
+                    return
+                if self._failed():
+                    return
+
+                if path == f'{WEBEX_PATH}/recordings':
+                    server.count('recording_lists')
+                    self._recordings(params)
+                elif path.startswith(f'{WEBEX_PATH}/recordings/'):
+                    server.count('recording_details')
+                    self._recording(path.rsplit('/', 1)[1])
+                elif path.startswith(f'{WEBEX_PATH}/meetings/'):
+                    server.count('meeting_details')
+                    meeting_id = path.rsplit('/', 1)[1]
+                    self._send_json(200, {'id': meeting_id, 'title': f"Meeting {meeting_id}",
+                                          'transcriptUrl': f"{server.base_url}/downloads/{meeting_id}.vtt"})
+                elif path.startswith('/rest/api/3/'):
+                    server.count('jira_metadata_requests')
+                    self._jira_metadata(path)
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                path, _ = self._split()
+                server.delay()
+
+                if path == f'{WEBEX_PATH}/access_token':
+                    self._read_body()
+                    server.count('webex_token_requests')
+                    self._send_json(200, {'access_token': f"mock-webex-{uuid.uuid4().hex}", 'token_type': 'Bearer',
+                                          'expires_in': 1209600, 'refresh_token': 'mock-refresh'})
+                elif path.endswith('/token'):
+                    self._read_body()
+                    server.count('token_requests')
+                    self._send_json(200, {
+                        'access_token': f"mock-token-{int(time.time())}",
+                        'token_type': 'Bearer',
+                        'expires_in': 3600,
+                    })
+                elif path.endswith('/chat/completions'):
+                    server.count('completion_requests')
+                    self._completion(self._read_body())
+                elif path == f'{WEBEX_PATH}/messages':
+                    self._read_body()  # JSON or multipart (markdown attachment)
+                    if not self._failed():
+                        server.count('messages_posted')
+                        self._send_json(200, {'id': uuid.uuid4().hex, 'created': datetime.now(timezone.utc)
+                                              .strftime('%Y-%m-%dT%H:%M:%S.000Z')})
+                elif path == '/rest/api/3/issue':
+                    payload = self._read_json()
+                    if not self._failed():
+                        self._create_issue(payload)
+                elif path == '/rest/api/3/issue/bulk':
+                    payload = self._read_json()
+                    if not self._failed():
+                        server.count('jira_bulk_requests')
+                        self._create_bulk(payload)
+                else:
+                    self._read_body()
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_PUT(self):
+                path, _ = self._split()
+                payload = self._read_json()
+                server.delay()
+                if not re.fullmatch(r'/rest/api/3/issue/[\w\-]+', path):
+                    self._send_json(404, {'error': 'not found'})
+                elif not self._failed():
+                    if not isinstance(payload, dict) or not isinstance(payload.get('fields'), dict):
+                        self._send_json(400, {'errorMessages': ['fields are required'], 'errors': {}})
+                        return
+                    server.count('jira_issues_updated')
+                    self._send_json(204, None)
+
+            # --- Webex ---------------------------------------------------------
+
+            def _recordings(self, params):
+                items, next_offset = server.recordings_page(params)
+                if items is None:
+                    self._send_json(400, {'message': 'invalid max or cursor'})
+                    return
+                headers = {}
+                if next_offset is not None:
+                    query = urlencode({**params, 'cursor': next_offset})
+                    headers['Link'] = f'<{server.webex_api_base_url}/recordings?{query}>; rel="next"'
+                self._send_json(200, {'items': items}, headers)
+
+            def _recording(self, recording_id):
+                recording = next((item for item in server.recordings if item['id'] == recording_id), None)
+                if recording is None:
+                    self._send_json(404, {'message': 'recording not found'})
+                    return
+                self._send_json(200, {**recording, 'temporaryDirectDownloadLinks': {
+                    'recordingDownloadLink': f"{server.base_url}/downloads/{recording_id}.mp4",
+                    'transcriptDownloadLink': f"{server.base_url}/downloads/{recording_id}.vtt",
+                    'expiration': (datetime.now(timezone.utc) + timedelta(hours=3)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                }})
+
+            # --- Jira ----------------------------------------------------------
+
+            def _jira_metadata(self, path):
+                if path == '/rest/api/3/field':
+                    self._send_json(200, JIRA_FIELDS)
+                    return
+                match = re.fullmatch(r'/rest/api/3/issue/createmeta/[\w\-]+/issuetypes(?:/(\w+))?', path)
+                if not match:
+                    self._send_json(404, {'errorMessages': ['not found']})
+                elif match.group(1) is None:
+                    self._send_json(200, {'issueTypes': [{'id': type_id, 'name': name}
+                                                         for type_id, (name, _) in JIRA_ISSUE_TYPES.items()]})
+                elif match.group(1) in JIRA_ISSUE_TYPES:
+                    names = {item['id']: item['name'] for item in JIRA_FIELDS}
+                    _, field_ids = JIRA_ISSUE_TYPES[match.group(1)]
+                    self._send_json(200, {'fields': [{'fieldId': field_id, 'name': names[field_id],
+                                                      'required': field_id == 'summary'}
+                                                     for field_id in field_ids]})
+                else:
+                    self._send_json(404, {'errorMessages': ['issue type not found']})
+
+            def _issue_error(self, payload):
+                """Jira-style validation error for an issue payload (None = valid)"""
+                fields = payload.get('fields') if isinstance(payload, dict) else None
+                if not isinstance(fields, dict) or not fields.get('summary'):
+                    return {'errorMessages': [], 'errors': {'summary': 'You must specify a summary of the issue.'}}
+                return None
+
+            def _new_issue(self, payload):
+                number = next(server._issue_numbers)
+                project = ((payload['fields'].get('project') or {}).get('key')) or 'MOCK'
+                key = f"{project}-{number}"
+                return {'id': str(10000 + number), 'key': key, 'self': f"{server.base_url}/rest/api/3/issue/{key}"}
+
+            def _create_issue(self, payload):
+                error = self._issue_error(payload)
+                if error:
+                    self._send_json(400, error)
+                    return
+                server.count('jira_issues_created')
+                self._send_json(201, self._new_issue(payload))
+
+            def _create_bulk(self, payload):
+                updates = payload.get('issueUpdates') if isinstance(payload, dict) else None
+                if not isinstance(updates, list) or not updates:
+                    self._send_json(400, {'errorMessages': ['issueUpdates is required'], 'errors': {}})
+                    return
+                issues, errors = [], []
+                for position, update in enumerate(updates):
+                    error = self._issue_error(update)
+                    if error:
+                        errors.append({'status': 400, 'elementErrors': error, 'failedElementNumber': position})
+                    else:
+                        server.count('jira_issues_created')
+                        issues.append(self._new_issue(update))
+                self._send_json(201 if issues else 400, {'issues': issues, 'errors': errors})
+
+            # --- Chat AI -------------------------------------------------------
+
+            def _completion(self, raw):
+                try:
+                    payload = json.loads(raw or b'{}')
+                    user_prompt = payload['messages'][-1]['content']
+                except (ValueError, KeyError, IndexError):
+                    self._send_json(400, {'error': 'invalid chat completions request'})
+                    return
+
+                if self._failed():
+                    return
+
+                text = canned_completion(user_prompt)
+                if payload.get('stream'):
+                    self._stream(text)
+                    return
+
+                if server.tokens_per_sec:
+                    time.sleep(estimate_tokens(text) / server.tokens_per_sec)
+                self._send_json(200, {
+                    'object': 'chat.completion',
+                    'model': payload.get('model', 'mock'),
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                                 'finish_reason': 'stop'}],
+                    'usage': {'prompt_tokens': estimate_tokens(user_prompt),
+                              'completion_tokens': estimate_tokens(text)},
+                })
+
+            def _stream(self, text):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                def write(data):
+                    chunk = data.encode('utf-8')
+                    self.wfile.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b"\r\n")
+                    self.wfile.flush()
+
+                step = 16  # ~4 tokens per event
+                delay = (4 / server.tokens_per_sec) if server.tokens_per_sec else 0
+                for i in range(0, len(text), step):
+                    event = {'choices': [{'index': 0, 'delta': {'content': text[i:i + step]}}]}
+                    write(f"data: {json.dumps(event)}\n\n")
+                    if delay:
+                        time.sleep(delay)
+                write("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local Webex / SSO / Chat AI / Jira stand-in for offline load testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=int, default=0, help="Delay before every response")
+    parser.add_argument('--jitter-ms', type=int, default=0, help="Extra random delay up to this many ms")
+    parser.add_argument('--tokens-per-sec', type=float, default=0, help="Completion output speed (0 = instant)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fraction of completion / Webex / Jira requests answered with 429/503")
+    parser.add_argument('--page-size', type=int, default=WEBEX_PAGE_MAX, help="Most recordings per list page")
+    parser.add_argument('--recordings', type=int, default=50, help="Synthetic recordings to serve")
+    parser.add_argument('--transcript-minutes', type=int, default=30, help="Length of each synthetic transcript")
+    parser.add_argument('--write-eml', metavar='DIR', help="Write a notification .eml per recording to DIR")
+    parser.add_argument('--seed', type=int, help="Random seed for error injection and corpora")
+    args = parser.parse_args(argv)
+
+    server = MockServer(args.host, args.port, args.latency_ms, args.tokens_per_sec, args.error_rate, args.seed,
+                        jitter_ms=args.jitter_ms, page_size=args.page_size, recordings=args.recordings,
+                        transcript_minutes=args.transcript_minutes)
+    print(f"Mock services listening on {server.base_url}")
+    for name, value in server.config_overrides().items():
+        print(f"  {name + ':':<20} {value}")
+    print(f"  {'JIRA_URL:':<20} {server.jira_url}")
+    if args.write_eml:
+        count = server.write_notifications(args.write_eml)
+        print(f"Wrote {count} notification email(s) to {args.write_eml}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
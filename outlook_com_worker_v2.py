@@ -0,0 +1,261 @@
+"""
+Outlook COM Worker v2.0
+One long-lived thread owns the Outlook.Application dispatch and the Tasks
+folder. Callers hand it batches of task writes over a queue instead of
+dispatching Outlook on whatever thread they happen to run on.
+
+Every property of a task is written in one tight loop on the owning thread,
+followed by a single Save(). Per-batch latency is logged and kept in stats().
+
+The COM layer is reached only through outlook_factory, so FakeOutlook (an
+in-memory stand-in for the Outlook object model) can replace it off Windows.
+"""
+
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import itertools
+import queue
+import threading
+import time
+
+OL_TASK_ITEM = 3        # olTaskItem
+OL_FOLDER_TASKS = 13    # olFolderTasks
+
+
+@dataclass
+class TaskWrite:
+    properties: Dict                    # Outlook TaskItem property -> value
+    entry_id: Optional[str] = None      # Update this task instead of creating one
+
+
+@dataclass
+class TaskWriteResult:
+    entry_id: Optional[str] = None
+    updated: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Job:
+    writes: List[TaskWrite]
+    future: Future = field(default_factory=Future)
+
+
+def dispatch_outlook():
+    """Default factory: the real Outlook application (Windows only)"""
+    import win32com.client
+    return win32com.client.Dispatch("Outlook.Application")
+
+
+class OutlookComWorker:
+    """Single COM thread that creates and updates Outlook tasks in batches"""
+
+    def __init__(self, outlook_factory: Optional[Callable] = None, log_callback=None):
+        """
+        Args:
+            outlook_factory: Returns an Outlook.Application-like object; called
+                on the worker thread (default: win32com Dispatch)
+            log_callback: Function to call for logging
+        """
+        self.outlook_factory = outlook_factory or dispatch_outlook
+        self.log = log_callback or print
+
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._outlook = None
+        self._namespace = None
+        self._tasks_folder = None
+
+        self.batches = 0
+        self.tasks_written = 0
+        self.last_batch_ms = 0.0
+        self.total_batch_ms = 0.0
+
+    def submit(self, writes: List[TaskWrite]) -> Future:
+        """
+        Queue a batch of task writes.
+
+        Returns:
+            Future resolving to one TaskWriteResult per write, in order
+        """
+        self._ensure_started()
+        job = _Job(list(writes))
+        self._queue.put(job)
+        return job.future
+
+    def write_tasks(self, writes: List[TaskWrite], timeout=120) -> List[TaskWriteResult]:
+        """Submit a batch and wait for it"""
+        return self.submit(writes).result(timeout=timeout)
+
+    def stop(self) -> None:
+        """Finish queued batches, release Outlook and end the thread"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            thread, self._thread = self._thread, None
+        thread.join(timeout=30)
+
+    def stats(self) -> Dict:
+        return {
+            'batches': self.batches,
+            'tasks_written': self.tasks_written,
+            'last_batch_ms': round(self.last_batch_ms, 1),
+            'avg_batch_ms': round(self.total_batch_ms / self.batches, 1) if self.batches else 0.0,
+        }
+
+    # --- Worker thread -------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="outlook-com", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        pythoncom = None
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass  # Not on Windows (FakeOutlook)
+
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                self._process(job)
+        finally:
+            self._outlook = self._namespace = self._tasks_folder = None
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def _connect(self) -> None:
+        """Dispatch Outlook and look up the Tasks folder once per worker"""
+        if self._outlook is None:
+            self._outlook = self.outlook_factory()
+            self._namespace = self._outlook.GetNamespace("MAPI")
+            self._tasks_folder = self._namespace.GetDefaultFolder(OL_FOLDER_TASKS)
+
+    def _process(self, job: _Job) -> None:
+        started = time.perf_counter()
+        try:
+            self._connect()
+        except Exception as e:
+            self._outlook = None
+            job.future.set_exception(e)
+            return
+
+        results = [self._write(write) for write in job.writes]
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.batches += 1
+        self.tasks_written += sum(1 for result in results if result.ok)
+        self.last_batch_ms = elapsed_ms
+        self.total_batch_ms += elapsed_ms
+        self.log(f"  Outlook batch: {len(results)} task(s) in {elapsed_ms:.0f} ms")
+        job.future.set_result(results)
+
+    def _write(self, write: TaskWrite) -> TaskWriteResult:
+        try:
+            task, updated = None, False
+            if write.entry_id:
+                try:
+                    task = self._namespace.GetItemFromID(write.entry_id)
+                    updated = True
+                except Exception:
+                    task = None  # Deleted since; create it again
+            if task is None:
+                task = self._tasks_folder.Items.Add(OL_TASK_ITEM)
+
+            for name, value in write.properties.items():
+                setattr(task, name, value)
+            task.Save()
+            return TaskWriteResult(entry_id=task.EntryID, updated=updated)
+        except Exception as e:
+            return TaskWriteResult(error=str(e))
+
+
+_shared_worker: Optional[OutlookComWorker] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_worker(log_callback=None) -> OutlookComWorker:
+    """Process-wide worker used by OutlookTasksIntegration"""
+    global _shared_worker
+    with _shared_lock:
+        if _shared_worker is None:
+            _shared_worker = OutlookComWorker(log_callback=log_callback)
+        return _shared_worker
+
+
+def stop_shared_worker() -> None:
+    """Stop the process-wide worker if one was started (e.g. on shutdown)"""
+    global _shared_worker
+    with _shared_lock:
+        worker, _shared_worker = _shared_worker, None
+    if worker is not None:
+        worker.stop()
+
+
+# --- Fake object model ---------------------------------------------------------
+
+class FakeTaskItem:
+    def __init__(self, store, entry_id):
+        self._store = store
+        self.EntryID = entry_id
+        self.saved = 0
+
+    def Save(self):
+        self.saved += 1
+        self._store[self.EntryID] = self
+
+
+class FakeItems:
+    def __init__(self, store):
+        self._store = store
+        self._ids = itertools.count(1)
+
+    def Add(self, item_type=OL_TASK_ITEM):
+        return FakeTaskItem(self._store, f"FAKE{next(self._ids):08d}")
+
+
+class FakeFolder:
+    def __init__(self, store):
+        self.Items = FakeItems(store)
+
+
+class FakeNamespace:
+    def __init__(self, store):
+        self._store = store
+        self._tasks = FakeFolder(store)
+
+    def GetDefaultFolder(self, folder_type):
+        return self._tasks
+
+    def GetItemFromID(self, entry_id):
+        try:
+            return self._store[entry_id]
+        except KeyError:
+            raise LookupError(f"No item with EntryID {entry_id}")
+
+
+class FakeOutlook:
+    """In-memory Outlook.Application with just enough surface for task writes"""
+
+    def __init__(self):
+        self.tasks: Dict[str, FakeTaskItem] = {}
+        self._namespace = FakeNamespace(self.tasks)
+
+    def GetNamespace(self, name):
+        return self._namespace
+
+    def CreateItem(self, item_type):
+        return self._namespace.GetDefaultFolder(OL_FOLDER_TASKS).Items.Add(item_type)
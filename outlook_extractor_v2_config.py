@@ -5,6 +5,7 @@ Handles persistent storage of settings and state
 
 import json
 import os
+import threading
 from datetime import datetime
 
 
@@ -16,13 +17,15 @@ class ConfigManager:
         if config_dir:
             self.config_dir = config_dir
         else:
-            # Default to %APPDATA%\OutlookVTTExtractor
-            appdata = os.getenv('APPDATA')
+            # Default to %APPDATA%\OutlookVTTExtractor (home directory off Windows)
+            appdata = os.getenv('APPDATA') or os.path.expanduser("~")
             self.config_dir = os.path.join(appdata, 'OutlookVTTExtractor')
         
         os.makedirs(self.config_dir, exist_ok=True)
         self.config_file = os.path.join(self.config_dir, 'config_v2.json')
+        self._lock = threading.RLock()  # Backfill workers mark emails concurrently
         self.config = self.load_config()
+        self._reindex()
     
     def load_config(self):
         """Load configuration from file"""
@@ -39,6 +42,60 @@ class ConfigManager:
             'auto_create_tasks': True,
             'auto_send_to_webex': True,
             'enable_analysis': True,
+            'analysis_cache_enabled': True,  # Reuse LLM results for identical transcripts
+            'analysis_cache_max_entries': 500,
+            'analysis_cache_max_age_days': 30,
+            'analysis_cache_max_mb': 50,
+            'chunked_analysis_enabled': True,  # Map-reduce analysis for long meetings
+            'chunked_analysis_threshold_tokens': 12000,
+            'chunk_max_tokens': 6000,
+            'chunk_overlap_tokens': 300,
+            'chunk_max_parallel': 4,
+            'chatai_streaming_enabled': True,  # Stream completions, create tasks as actions arrive
+            'transcript_compaction_enabled': True,  # Strip filler/duplicate captions before prompting
+            'transcript_target_tokens': 0,  # Drop low-signal segments above this budget (0 = off)
+            'llm_batching_enabled': True,  # Combine small meetings analyzed together into one request
+            'llm_batch_max_meetings': 4,
+            'llm_batch_max_wait_ms': 500,  # How long a request waits for others to batch with
+            'llm_batch_max_tokens': 12000,  # Combined prompt budget; larger batches are split
+            'llm_batch_max_meeting_tokens': 3000,  # Meetings above this are always sent alone
+            'llm_backend': 'chatai',  # chatai | openai | stub | replay
+            'chatai_model': 'gemini-2.5-flash',
+            'chatai_base_url': 'https://chat-ai.cisco.com/openai/deployments',  # Point at mock_server_v2 for load tests
+            'chatai_sso_url': 'https://id.cisco.com/oauth2/default/v1/token',
+            'webex_api_base_url': 'https://webexapis.com/v1',  # Point at mock_server_v2 for load tests
+            'llm_base_url': '',  # OpenAI-compatible endpoint (openai backend)
+            'llm_replay_path': '',  # Recording to play back (replay backend)
+            'llm_record_path': '',  # Append every completion here for later replay
+            'llm_stub_latency_ms': 0,  # Stub backend: per-call latency, output speed and 429 rate
+            'llm_stub_tokens_per_sec': 0,
+            'llm_stub_error_rate': 0.0,
+            'llm_rate_limit_enabled': True,  # Adaptive concurrency, retries on 429/503
+            'llm_initial_concurrency': 2,
+            'llm_max_concurrency': 8,
+            'llm_max_retries': 3,
+            'delivery_dedup_enabled': True,  # Never create the same Jira issue / Outlook task twice
+            'delivery_update_existing': False,  # Update previously delivered items instead of skipping them
+            'jira_field_values': {  # Custom field values by field name (or ID), resolved per project
+                'Work Type': {'value': 'RTB'},
+                'Team': '75ed17b2-21c7-405b-8534-57a2517f0dba-334'
+            },
+            'jira_acceptance_criteria_field': 'Acceptance Criteria',
+            'jira_metadata_ttl_hours': 24,  # Refetch Jira createmeta / field definitions after this
+            'webex_delivery_mode': 'split',  # 'split' into several bot messages or one 'attachment'
+            'webex_digest_enabled': False,  # Batch bot summaries into one digest per window
+            'webex_digest_window_minutes': 30,
+            'webex_digest_max_meetings': 10,  # Send the digest early once this many meetings are queued
+            'log_max_lines': 2000,  # Lines kept in the log window
+            'log_file_enabled': False,  # Also write a rotating producto.log in the config directory
+            'log_file_max_mb': 5,
+            'log_file_backups': 3,
+            'backfill_parallelism': 2,  # Emails processed at once by the backfill command
+            'backfill_window_days': 7,  # Outlook is queried one date window (page) at a time
+            'backfill_tokens_per_meeting': 9000,  # Dry-run estimate of transcript tokens per meeting
+            'backfill_output_tokens_per_meeting': 1500,
+            'llm_cost_per_1k_input_tokens': 0.0003,  # USD, for dry-run cost estimates
+            'llm_cost_per_1k_output_tokens': 0.0025,
             'bot_recipient_email': 'qschalle@cisco.com'  # Configurable Webex bot recipient
         }
         
@@ -46,6 +103,10 @@ class ConfigManager:
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     loaded = json.load(f)
+                    if loaded.pop('llm_api_key', None):
+                        # Secrets are not kept in config_v2.json; dropped here so the next save removes it
+                        print("Ignoring llm_api_key in config file: set LLM_API_KEY or store it with keyring "
+                              "(service 'Producto', name 'llm_api_key')")
                     default_config.update(loaded)
             except Exception as e:
                 print(f"Error loading config: {e}")
@@ -53,28 +114,55 @@ class ConfigManager:
         return default_config
     
     def save_config(self):
-        """Save configuration to file"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
-        except Exception as e:
-            print(f"Error saving config: {e}")
+        """Save configuration to file (written to a temp file, then swapped in)"""
+        with self._lock:
+            tmp_file = f"{self.config_file}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.config, f, indent=2)
+                os.replace(tmp_file, self.config_file)
+            except Exception as e:
+                print(f"Error saving config: {e}")
+    
+    def _reindex(self):
+        """Rebuild the set lookups behind is_email_handled"""
+        with self._lock:
+            self._processed_ids = set(self.config['processed_emails'])
+            self._ignored_ids = set(self.config['ignored_emails'])
     
     def add_processed_email(self, email_id):
         """Mark an email as processed"""
-        if email_id not in self.config['processed_emails']:
-            self.config['processed_emails'].append(email_id)
-            self.save_config()
+        with self._lock:
+            if email_id not in self._processed_ids:
+                self._processed_ids.add(email_id)
+                self.config['processed_emails'].append(email_id)
+                self.save_config()
     
     def add_ignored_email(self, email_id):
         """Mark an email as ignored"""
-        if email_id not in self.config['ignored_emails']:
-            self.config['ignored_emails'].append(email_id)
-            self.save_config()
+        with self._lock:
+            if email_id not in self._ignored_ids:
+                self._ignored_ids.add(email_id)
+                self.config['ignored_emails'].append(email_id)
+                self.save_config()
     
     def is_email_handled(self, email_id):
         """Check if email was already processed or ignored"""
-        return email_id in self.config['processed_emails'] or email_id in self.config['ignored_emails']
+        return email_id in self._processed_ids or email_id in self._ignored_ids
+    
+    def clear_handled_emails(self):
+        """Forget every processed/ignored email
+        
+        Returns:
+            (processed count, ignored count) that were removed
+        """
+        with self._lock:
+            counts = (len(self.config['processed_emails']), len(self.config['ignored_emails']))
+            self.config['processed_emails'] = []
+            self.config['ignored_emails'] = []
+            self._reindex()
+            self.save_config()
+        return counts
     
     def update_last_check_time(self):
         """Update the last check timestamp to now"""
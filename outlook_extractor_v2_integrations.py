@@ -3,23 +3,40 @@ Integrations Module for Outlook VTT Extractor v2.0
 Handles Outlook Tasks, Webex Bot, and other external integrations
 """
 
-import win32com.client
 import requests
+import threading
+import time
 from datetime import datetime, timedelta
 
+from delivery_ledger_v2 import OUTLOOK_TASK
+from outlook_com_worker_v2 import TaskWrite, get_shared_worker
+
 
 class OutlookTasksIntegration:
     """Creates and manages Outlook tasks (syncs to Microsoft To Do)"""
     
-    def __init__(self, log_callback=None):
+    def __init__(self, log_callback=None, ledger=None, update_existing=False, worker=None):
+        """
+        Args:
+            log_callback: Function to call for logging
+            ledger: Optional DeliveryLedger; actions already delivered are not created again
+            update_existing: Refresh previously created tasks instead of skipping them
+            worker: OutlookComWorker that owns Outlook (default: the shared worker)
+        """
         self.log = log_callback or print
+        self.ledger = ledger
+        self.update_existing = update_existing
+        self.worker = worker or get_shared_worker(self.log)
     
-    def create_tasks_from_actions(self, actions, meeting_title):
+    def create_tasks_from_actions(self, actions, meeting_title, meeting_id=None):
         """Create Outlook tasks from action items
         
+        All tasks are written as one batch on the Outlook COM worker thread.
+        
         Args:
             actions: List of action dictionaries from AI analysis
             meeting_title: Title of the meeting
+            meeting_id: Stable meeting id for de-duplication (defaults to the title)
             
         Returns:
             Number of tasks created
@@ -28,55 +45,69 @@ class OutlookTasksIntegration:
             self.log("No action items to create as tasks")
             return 0
         
-        try:
-            self.log(f"Creating {len(actions)} Outlook Task(s)...")
-            outlook = win32com.client.Dispatch("Outlook.Application")
-            
-            created_count = 0
-            for action in actions:
-                try:
-                    # Create task item
-                    task = outlook.CreateItem(3)  # 3 = olTaskItem
-                    
-                    # Set subject
-                    task.Subject = action.get('title', 'Untitled Task')
-                    
-                    # Build description
-                    description = f"From meeting: {meeting_title}\n\n"
-                    if action.get('description'):
-                        description += f"{action['description']}\n\n"
-                    if action.get('owner'):
-                        description += f"Owner: {action['owner']}\n"
-                    if action.get('related_decision'):
-                        description += f"Related Decision: {action['related_decision']}\n"
-                    
-                    task.Body = description
-                    
-                    # Set due date (default 10 business days)
-                    due_date = self.calculate_due_date(action.get('due_date_hint'))
-                    task.DueDate = due_date
-                    
-                    # Set category for organization
-                    task.Categories = "Webex Recording"
-                    
-                    # Set importance if urgent keywords detected
-                    title_lower = action.get('title', '').lower()
-                    if any(word in title_lower for word in ['urgent', 'asap', 'immediately', 'critical']):
-                        task.Importance = 2  # High importance
-                    
-                    # Save task
-                    task.Save()
-                    created_count += 1
-                    
-                except Exception as e:
-                    self.log(f"  Error creating task '{action.get('title', 'unknown')}': {str(e)}")
-            
-            self.log(f"✅ Created {created_count} Outlook Task(s) (will sync to Microsoft To Do)")
-            return created_count
+        meeting_id = meeting_id or meeting_title
         
+        # Decide what to write before touching Outlook
+        batch = []
+        for action in actions:
+            title = action.get('title', 'Untitled Task')
+            previous = self.ledger.lookup(OUTLOOK_TASK, meeting_id, 'action', title) if self.ledger is not None else None
+            if previous and not self.update_existing:
+                self.log(f"  ↺ Task already created, skipping: {title[:60]}")
+                continue
+            write = TaskWrite(self.task_properties(action, meeting_title),
+                              entry_id=previous.external_id if previous else None)
+            batch.append((title, write))
+        
+        if not batch:
+            return 0
+        
+        try:
+            self.log(f"Creating {len(batch)} Outlook Task(s)...")
+            results = self.worker.write_tasks([write for _, write in batch])
         except Exception as e:
             self.log(f"ERROR creating Outlook tasks: {str(e)}")
             return 0
+        
+        created_count = 0
+        for (title, write), result in zip(batch, results):
+            if not result.ok:
+                self.log(f"  Error creating task '{title}': {result.error}")
+                continue
+            if result.updated:
+                self.log(f"  ↺ Updated existing task: {title[:60]}")
+            else:
+                created_count += 1
+            if self.ledger is not None:
+                self.ledger.record(OUTLOOK_TASK, meeting_id, 'action', title, result.entry_id)
+        
+        self.log(f"✅ Created {created_count} Outlook Task(s) (will sync to Microsoft To Do)")
+        return created_count
+    
+    def task_properties(self, action, meeting_title):
+        """Outlook TaskItem properties (subject, body, due date, category, importance) for an action item"""
+        # Build description
+        description = f"From meeting: {meeting_title}\n\n"
+        if action.get('description'):
+            description += f"{action['description']}\n\n"
+        if action.get('owner'):
+            description += f"Owner: {action['owner']}\n"
+        if action.get('related_decision'):
+            description += f"Related Decision: {action['related_decision']}\n"
+        
+        properties = {
+            'Subject': action.get('title', 'Untitled Task'),
+            'Body': description,
+            'DueDate': self.calculate_due_date(action.get('due_date_hint')),  # Default 10 business days
+            'Categories': "Webex Recording",  # Category for organization
+        }
+        
+        # Set importance if urgent keywords detected
+        title_lower = action.get('title', '').lower()
+        if any(word in title_lower for word in ['urgent', 'asap', 'immediately', 'critical']):
+            properties['Importance'] = 2  # High importance
+        
+        return properties
     
     def calculate_due_date(self, due_date_hint):
         """Calculate due date - parses hints or defaults to 10 business days from now
@@ -146,12 +177,100 @@ class OutlookTasksIntegration:
         return current
 
 
+WEBEX_API_BASE_URL = 'https://webexapis.com/v1'
+WEBEX_MESSAGES_URL = WEBEX_API_BASE_URL + '/messages'
+WEBEX_MESSAGE_LIMIT = 7439  # Webex markdown limit (bytes)
+WEBEX_DELIVERY_MODES = ('split', 'attachment')
+
+
+def split_markdown_messages(header, blocks, footer='', limit=WEBEX_MESSAGE_LIMIT):
+    """Pack markdown blocks into as few messages as fit under limit, never splitting a block
+    
+    Args:
+        header: Markdown that opens every message
+        blocks: Item blocks (a block is only cut if it alone exceeds the limit)
+        footer: Markdown appended to the last message
+        limit: Maximum message size in UTF-8 bytes
+        
+    Returns:
+        List of markdown messages; parts are numbered when there is more than one
+    """
+    def size(text):
+        return len(text.encode('utf-8'))
+    
+    reserve = size(header) + size(" _(part 99/99)_\n\n")
+    budget = max(200, limit - reserve)
+    
+    parts, current, used = [], [], 0
+    for block in list(blocks) + ([footer] if footer else []):
+        block_size = size(block)
+        if block_size > budget:
+            # Oversized block: cut at a line boundary, then bytes as a last resort
+            block = block.encode('utf-8')[:budget - 4].decode('utf-8', 'ignore')
+            block = block[:block.rfind('\n') + 1] or block
+            block_size = size(block)
+        if current and used + block_size > budget:
+            parts.append(current)
+            current, used = [], 0
+        current.append(block)
+        used += block_size
+    if current or not parts:
+        parts.append(current)
+    
+    messages = []
+    for number, part in enumerate(parts, 1):
+        label = f" _(part {number}/{len(parts)})_" if len(parts) > 1 else ""
+        messages.append(header.rstrip('\n') + label + "\n\n" + "".join(part))
+    return messages
+
+
 class WebexBotIntegration:
-    """Sends notifications to Webex bot in markdown format"""
+    """Sends notifications to Webex bot in markdown format
     
-    def __init__(self, bot_token, log_callback=None):
+    Long summaries are split on item boundaries into several messages (or
+    posted as a single markdown attachment) rather than truncated. Messages
+    go out over one pooled HTTP session, paced across all instances and
+    retried on 429.
+    """
+    
+    _session = None
+    _session_lock = threading.Lock()
+    _last_sent = 0.0  # Shared pacing: a new instance is made per meeting
+    _pace_lock = threading.Lock()
+    
+    def __init__(self, bot_token, log_callback=None, delivery_mode='split', min_interval=0.5, max_retries=3,
+                 api_base_url=None):
+        """
+        Args:
+            bot_token: Webex bot access token
+            log_callback: Function to call for logging
+            delivery_mode: 'split' (several messages) or 'attachment' (short message + markdown file)
+            min_interval: Seconds between consecutive messages
+            max_retries: Retries for a rate-limited (429) message
+            api_base_url: Webex REST API root (default: webexapis.com; e.g. mock_server_v2)
+        """
         self.bot_token = bot_token
         self.log = log_callback or print
+        self.delivery_mode = delivery_mode if delivery_mode in WEBEX_DELIVERY_MODES else 'split'
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.messages_url = f"{(api_base_url or WEBEX_API_BASE_URL).rstrip('/')}/messages"
+    
+    @classmethod
+    def session(cls):
+        """Shared keep-alive session for all bot messages"""
+        with cls._session_lock:
+            if cls._session is None:
+                cls._session = requests.Session()
+            return cls._session
+    
+    @classmethod
+    def _reserve_send_slot(cls, min_interval):
+        """Monotonic time at which the next message may go out (at least min_interval after the last)"""
+        with cls._pace_lock:
+            send_at = max(time.monotonic(), WebexBotIntegration._last_sent + min_interval)
+            WebexBotIntegration._last_sent = send_at
+            return send_at
     
     def send_analysis_summary(self, structured_data, meeting_title, recording_url='', recipient_email=None):
         """Send meeting analysis summary to Webex bot
@@ -163,7 +282,7 @@ class WebexBotIntegration:
             recipient_email: Email address to send to (optional, defaults to qschalle@cisco.com)
             
         Returns:
-            True if successful, False otherwise
+            True if every message was delivered, False otherwise
         """
         if not self.bot_token:
             self.log("Webex Bot Token not configured - skipping notification")
@@ -181,89 +300,189 @@ class WebexBotIntegration:
                 self.log("No items to send to bot")
                 return False
             
-            # Build markdown message
-            message = self._format_markdown_message(meeting_title, actions, stories, recording_url)
+            if self.delivery_mode == 'attachment':
+                header, _, _ = self._markdown_sections(meeting_title, actions, stories, recording_url)
+                summary = (header + f"{len(actions)} action item(s), {len(stories)} user stor"
+                           f"{'y' if len(stories) == 1 else 'ies'} - full analysis attached.\n")
+                document = self._format_markdown_message(meeting_title, actions, stories, recording_url,
+                                                         detailed=True)
+                filename = "".join(c if c.isalnum() or c in ' -_' else '_' for c in meeting_title)[:60].strip()
+                sent = self._post({'toPersonEmail': recipient, 'markdown': summary},
+                                  files={'files': (f"{filename or 'analysis'}.md", document.encode('utf-8'),
+                                                   'text/markdown')})
+                if sent:
+                    self.log("✅ Sent summary to Webex bot (with attachment)")
+                return sent
             
-            # Send via Webex API
-            headers = {
-                'Authorization': f'Bearer {self.bot_token}',
-                'Content-Type': 'application/json'
-            }
+            # Build markdown messages, split on item boundaries
+            messages = split_markdown_messages(*self._markdown_sections(meeting_title, actions, stories, recording_url))
             
-            # Send to configured recipient
-            payload = {
-                'toPersonEmail': recipient,  # Configurable recipient
-                'markdown': message[:7439]  # Webex message size limit
-            }
+            delivered = 0
+            for message in messages:
+                if not self._post({'toPersonEmail': recipient, 'markdown': message}):
+                    break
+                delivered += 1
             
-            response = requests.post(
-                'https://webexapis.com/v1/messages',
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                self.log("✅ Sent summary to Webex bot")
+            if delivered == len(messages):
+                self.log(f"✅ Sent summary to Webex bot ({delivered} message{'s' if delivered > 1 else ''})")
                 return True
-            else:
-                self.log(f"ERROR: Webex API returned {response.status_code}")
-                self.log(f"Response: {response.text[:200]}")
-                return False
+            self.log(f"ERROR: Only {delivered}/{len(messages)} Webex message(s) delivered")
+            return False
         
         except Exception as e:
             self.log(f"ERROR sending to Webex bot: {str(e)}")
             return False
     
-    def _format_markdown_message(self, meeting_title, actions, stories, recording_url):
-        """Format the analysis into a markdown message
+    def send_digest(self, recipient_email, meetings, sent_at=None, start_part=0, on_part=None):
+        """Send several meeting summaries as one consolidated digest
+        
+        Args:
+            recipient_email: Email address to send to
+            meetings: List of dicts with meeting_title, recording_url, actions,
+                stories and processed_at (see webex_digest_v2)
+            sent_at: Time shown in the header (default: now); pass the same
+                value when resuming so the digest splits the same way
+            start_part: Messages already delivered by an earlier attempt
+            on_part: Called with the number of messages delivered so far,
+                after each message goes out
+            
+        Returns:
+            True if every message was delivered, False otherwise
+        """
+        if not self.bot_token:
+            self.log("Webex Bot Token not configured - skipping digest")
+            return False
+        
+        try:
+            sent_at = sent_at or datetime.now().strftime('%Y-%m-%d %H:%M')
+            header = (f"📬 **Meeting Digest:** {len(meetings)} meeting{'s' if len(meetings) != 1 else ''}\n\n"
+                      f"🕐 **Sent:** {sent_at}\n\n")
+            blocks = []
+            for meeting in meetings:
+                _, item_blocks, _ = self._markdown_sections(
+                    meeting['meeting_title'], meeting.get('actions', []), meeting.get('stories', []), '',
+                    heading='####'
+                )
+                intro = f"---\n### 📹 {meeting['meeting_title']}\n"
+                if meeting.get('processed_at'):
+                    intro += f"_Processed {meeting['processed_at']}_"
+                if meeting.get('recording_url'):
+                    intro += f" · [🔗 Recording]({meeting['recording_url']})"
+                intro += "\n\n"
+                if item_blocks:
+                    # Keep each meeting's heading with its first item
+                    item_blocks[0] = intro + item_blocks[0]
+                else:
+                    item_blocks = [intro + "_No action items or stories_\n\n"]
+                blocks.extend(item_blocks)
+            
+            messages = split_markdown_messages(header, blocks)
+            if start_part:
+                self.log(f"  Resuming Webex digest at message {start_part + 1}/{len(messages)}")
+            for part in range(start_part, len(messages)):
+                if not self._post({'toPersonEmail': recipient_email, 'markdown': messages[part]}):
+                    return False
+                if on_part:
+                    on_part(part + 1)
+            self.log(f"✅ Sent Webex digest of {len(meetings)} meeting(s) → {recipient_email}")
+            return True
+        
+        except Exception as e:
+            self.log(f"ERROR sending Webex digest: {str(e)}")
+            return False
+    
+    def _post(self, data, files=None):
+        """Send one message, pacing consecutive sends and retrying on 429"""
+        headers = {'Authorization': f'Bearer {self.bot_token}'}
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve_send_slot(self.min_interval) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            
+            if files:
+                response = self.session().post(self.messages_url, headers=headers, data=data,
+                                               files=files, timeout=60)
+            else:
+                response = self.session().post(self.messages_url, headers=headers, json=data, timeout=30)
+            
+            if response.status_code == 200:
+                return True
+            if response.status_code == 429 and attempt < self.max_retries:
+                try:
+                    retry_after = float(response.headers.get('Retry-After', 2 ** attempt))
+                except ValueError:
+                    retry_after = 2 ** attempt
+                self.log(f"  ⏳ Webex rate limited - retrying in {retry_after:.0f}s")
+                time.sleep(min(retry_after, 60))
+                continue
+            
+            self.log(f"ERROR: Webex API returned {response.status_code}")
+            self.log(f"Response: {response.text[:200]}")
+            return False
+        return False
+    
+    def _markdown_sections(self, meeting_title, actions, stories, recording_url, detailed=False, heading='##'):
+        """Header, one markdown block per item, and footer
         
         Args:
             meeting_title: Title of the meeting
             actions: List of action items
             stories: List of user stories
             recording_url: URL to recording
+            detailed: Full descriptions and acceptance criteria (attachment)
+            heading: Markdown heading level for the item sections
             
         Returns:
-            Formatted markdown string
+            (header, blocks, footer)
         """
-        message = f"📹 **Meeting Processed:** {meeting_title}\n\n"
-        message += f"🕐 **Analyzed:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n"
+        header = "".join([
+            f"📹 **Meeting Processed:** {meeting_title}\n\n",
+            f"🕐 **Analyzed:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n",
+        ])
+        blocks = []
         
         # Add action items
-        if actions:
-            message += f"## ✅ Action Items ({len(actions)})\n\n"
-            for idx, action in enumerate(actions, 1):
-                message += f"**{idx}. {action.get('title', 'Untitled')}**\n"
-                
-                if action.get('owner'):
-                    message += f"   - 👤 Owner: {action['owner']}\n"
-                if action.get('due_date_hint'):
-                    message += f"   - 📅 Due: {action['due_date_hint']}\n"
-                if action.get('description'):
+        for idx, action in enumerate(actions, 1):
+            lines = []
+            if idx == 1:
+                lines.append(f"{heading} ✅ Action Items ({len(actions)})\n\n")
+            lines.append(f"**{idx}. {action.get('title', 'Untitled')}**\n")
+            if action.get('owner'):
+                lines.append(f"   - 👤 Owner: {action['owner']}\n")
+            if action.get('due_date_hint'):
+                lines.append(f"   - 📅 Due: {action['due_date_hint']}\n")
+            if action.get('description'):
+                desc = action['description']
+                if not detailed and len(desc) > 100:
                     # Truncate long descriptions
-                    desc = action['description'][:100]
-                    if len(action['description']) > 100:
-                        desc += "..."
-                    message += f"   - 📝 {desc}\n"
-                
-                message += "\n"
+                    desc = desc[:100] + "..."
+                lines.append(f"   - 📝 {desc}\n")
+            lines.append("\n")
+            blocks.append("".join(lines))
         
         # Add user stories
-        if stories:
-            message += f"\n## 📝 User Stories ({len(stories)})\n\n"
-            for idx, story in enumerate(stories, 1):
-                message += f"**{idx}. {story.get('summary', 'Untitled')}**\n"
-                
-                if story.get('estimate_points'):
-                    message += f"   - 🎯 Story Points: {story['estimate_points']}\n"
-                if story.get('labels'):
-                    message += f"   - 🏷️  Labels: {', '.join(story['labels'])}\n"
-                
-                message += "\n"
+        for idx, story in enumerate(stories, 1):
+            lines = []
+            if idx == 1:
+                lines.append(f"\n{heading} 📝 User Stories ({len(stories)})\n\n")
+            lines.append(f"**{idx}. {story.get('summary', 'Untitled')}**\n")
+            if story.get('estimate_points'):
+                lines.append(f"   - 🎯 Story Points: {story['estimate_points']}\n")
+            if story.get('labels'):
+                lines.append(f"   - 🏷️  Labels: {', '.join(story['labels'])}\n")
+            if detailed and story.get('description'):
+                lines.append(f"   - 📝 {story['description']}\n")
+            if detailed and story.get('acceptance_criteria'):
+                lines.append("   - ✔️ Acceptance Criteria:\n")
+                lines.extend(f"      - {item}\n" for item in story['acceptance_criteria'])
+            lines.append("\n")
+            blocks.append("".join(lines))
         
         # Add recording link
-        if recording_url:
-            message += f"\n[🔗 View Recording]({recording_url})\n"
-        
-        return message
+        footer = f"\n[🔗 View Recording]({recording_url})\n" if recording_url else ""
+        return header, blocks, footer
+    
+    def _format_markdown_message(self, meeting_title, actions, stories, recording_url, detailed=False):
+        """Format the whole analysis as one markdown document (no size limit)"""
+        header, blocks, footer = self._markdown_sections(meeting_title, actions, stories, recording_url, detailed)
+        return header + "".join(blocks) + footer
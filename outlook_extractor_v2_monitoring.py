@@ -5,17 +5,21 @@ Handles email folder monitoring, filtering, and approval workflow
 
 import time
 import threading
-import pythoncom
-import win32com.client
 from datetime import datetime
-import tkinter as tk
-from tkinter import ttk
+
+from mail_sources_v2 import OutlookMailSource
+
+try:
+    import pythoncom
+    import win32com.client
+except ImportError:
+    pythoncom = None  # Not on Windows: only file/fake mail sources work
 
 
 class EmailMonitor:
     """Monitors Outlook folder for new emails matching pattern"""
     
-    def __init__(self, config_manager, log_callback, approval_callback, process_callback):
+    def __init__(self, config_manager, log_callback, approval_callback, process_callback, mail_source=None):
         """Initialize the email monitor
         
         Args:
@@ -23,11 +27,13 @@ class EmailMonitor:
             log_callback: Function to call for logging
             approval_callback: Function to call to get user approval
             process_callback: Function to call to process approved email
+            mail_source: MailSource to poll instead of the live Outlook folder
         """
         self.config = config_manager
         self.log = log_callback
         self.request_approval = approval_callback
         self.process_email = process_callback
+        self.mail_source = mail_source
         
         self.monitoring_active = False
         self.monitor_thread = None
@@ -61,37 +67,15 @@ class EmailMonitor:
     def _monitor_loop(self):
         """Main monitoring loop (runs in background thread)"""
         # Initialize COM for this thread
-        pythoncom.CoInitialize()
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
         
         try:
             polling_interval = self.config.config['polling_interval_seconds']
             
             while self.monitoring_active:
                 try:
-                    # Check for new emails
-                    new_emails = self._check_for_new_emails()
-                    
-                    # Process each new email
-                    for email_data in new_emails:
-                        if not self.monitoring_active:
-                            break
-                        
-                        # Request user approval
-                        approved = self.request_approval(email_data)
-                        
-                        if approved:
-                            self.log(f"User approved: {email_data['subject'][:50]}")
-                            # Process the email
-                            self.process_email(email_data)
-                        else:
-                            self.log(f"User declined: {email_data['subject'][:50]}")
-                            self.config.add_ignored_email(email_data['entry_id'])
-                        
-                        # Delay between processing
-                        if self.monitoring_active:
-                            delay = self.config.config['processing_delay_seconds']
-                            self.log(f"Waiting {delay} seconds before next email...")
-                            time.sleep(delay)
+                    self.poll_once()
                 
                 except Exception as e:
                     self.log(f"Error in monitoring loop: {str(e)}")
@@ -103,9 +87,45 @@ class EmailMonitor:
                     time.sleep(1)
         
         finally:
-            pythoncom.CoUninitialize()
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
             self.log("Monitoring stopped")
     
+    def poll_once(self):
+        """Check the folder once and handle every new email (caller initializes COM)
+        
+        Returns:
+            Number of emails handled
+        """
+        # Check for new emails
+        new_emails = self._check_for_new_emails()
+        
+        # Process each new email
+        handled = 0
+        for email_data in new_emails:
+            if not self.monitoring_active:
+                break
+            
+            # Request user approval
+            approved = self.request_approval(email_data)
+            
+            if approved:
+                self.log(f"User approved: {email_data['subject'][:50]}")
+                # Process the email
+                self.process_email(email_data)
+            else:
+                self.log(f"User declined: {email_data['subject'][:50]}")
+                self.config.add_ignored_email(email_data['entry_id'])
+            handled += 1
+            
+            # Delay between processing
+            if self.monitoring_active:
+                delay = self.config.config['processing_delay_seconds']
+                self.log(f"Waiting {delay} seconds before next email...")
+                time.sleep(delay)
+        
+        return handled
+    
     def _check_for_new_emails(self):
         """Check for new emails matching the pattern
         
@@ -122,79 +142,50 @@ class EmailMonitor:
             if not last_check:
                 last_check = datetime.now()
             
-            # Connect to Outlook
-            outlook = win32com.client.Dispatch("Outlook.Application")
-            namespace = outlook.GetNamespace("MAPI")
-            
-            # Get the folder
-            folder = self._get_folder(namespace, folder_name)
-            if not folder:
-                self.log(f"ERROR: Folder '{folder_name}' not found")
-                return new_emails
-            
-            # Check for new emails
-            items = folder.Items
-            items.Sort("[ReceivedTime]", True)  # Sort by newest first
+            source = self.mail_source
+            if source is None:
+                # Connect to Outlook
+                outlook = win32com.client.Dispatch("Outlook.Application")
+                namespace = outlook.GetNamespace("MAPI")
+                
+                # Get the folder
+                folder = self.get_folder(namespace, folder_name)
+                if not folder:
+                    self.log(f"ERROR: Folder '{folder_name}' not found")
+                    return new_emails
+                source = OutlookMailSource(folder, log_callback=self.log)
             
-            self.log(f"Checking folder '{folder_name}' - {items.Count} total items")
+            self.log(f"Checking '{source.location}'")
             self.log(f"Pattern: '{pattern}'")
             self.log(f"Last check time: {last_check.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Check up to 50 most recent emails
-            checked_count = 0
+            # Check up to 50 most recent matching emails
             pattern_matches = 0
             
-            for i in range(1, min(50, items.Count) + 1):
-                try:
-                    item = items.Item(i)
-                    checked_count += 1
-                    
-                    # Get received time
-                    received_time = item.ReceivedTime
-                    if hasattr(received_time, 'strftime'):
-                        received_dt = received_time
-                    else:
-                        continue
-                    
-                    # Check subject pattern
-                    subject = item.Subject or ""
-                    if pattern.lower() not in subject.lower():
-                        continue
-                    
-                    # Found matching pattern
-                    pattern_matches += 1
-                    self.log(f"  Found matching subject: '{subject[:60]}'")
-                    self.log(f"    Received: {received_dt.strftime('%Y-%m-%d %H:%M:%S')}")
-                    
-                    # FOR TESTING: Process any unprocessed email regardless of received time
-                    # In production, you may want to add back the time check:
-                    # if received_dt <= last_check:
-                    #     self.log(f"    ⚠ Email too old (before monitoring started)")
-                    #     continue
-                    
-                    # Get entry ID
-                    entry_id = item.EntryID
-                    
-                    # Skip if already handled
-                    if self.config.is_email_handled(entry_id):
-                        self.log(f"    ⚠ Already handled")
-                        continue
-                    
-                    # Add to new emails list
-                    self.log(f"    ✓ NEW email to process!")
-                    new_emails.append({
-                        'entry_id': entry_id,
-                        'subject': subject,
-                        'received_time': received_dt,
-                        'body': item.HTMLBody if hasattr(item, 'HTMLBody') else item.Body
-                    })
+            for message in source.iter_messages(subject_pattern=pattern, newest_first=True, limit=50):
+                # Found matching pattern
+                pattern_matches += 1
+                self.log(f"  Found matching subject: '{message.subject[:60]}'")
+                if message.received_time:
+                    self.log(f"    Received: {message.received_time.strftime('%Y-%m-%d %H:%M:%S')}")
                 
-                except Exception as e:
-                    # Skip problematic items
+                # FOR TESTING: Process any unprocessed email regardless of received time
+                # In production, you may want to add back the time check:
+                # if message.received_time <= last_check:
+                #     self.log(f"    ⚠ Email too old (before monitoring started)")
+                #     continue
+                
+                # Skip if already handled (before the body is read)
+                if self.config.is_email_handled(message.entry_id):
+                    self.log(f"    ⚠ Already handled")
                     continue
+                
+                # Add to new emails list
+                self.log(f"    ✓ NEW email to process!")
+                new_emails.append(message.to_email_data())
             
             # Summary
-            self.log(f"Poll summary: Checked {checked_count} items, {pattern_matches} matched pattern, {len(new_emails)} new to process")
+            self.log(f"Poll summary: {pattern_matches} matched pattern, {len(new_emails)} new to process")
             
             # Update last check time
             self.config.update_last_check_time()
@@ -207,7 +198,7 @@ class EmailMonitor:
         
         return new_emails
     
-    def _get_folder(self, namespace, folder_name):
+    def get_folder(self, namespace, folder_name):
         """Get Outlook folder by name
         
         Args:
@@ -256,6 +247,10 @@ class ApprovalDialog:
         Returns:
             True if approved, False if declined or timeout
         """
+        # Imported here so the monitor itself runs without Tk (headless runner)
+        import tkinter as tk
+        from tkinter import ttk
+        
         result = {'approved': False, 'done': False}
         
         def create_dialog():
@@ -15,6 +15,9 @@ ARCHITECTURE:
 - outlook_extractor_v2_config.py: Configuration management
 - outlook_extractor_v2_monitoring.py: Email monitoring
 - outlook_extractor_v2_integrations.py: External integrations
+- analysis_engine_v2.py: Transcript analysis pipeline (no UI dependencies)
+- meeting_pipeline_v2.py: Email -> transcript -> analysis -> delivery (no UI dependencies)
+- producto_headless.py: Headless runner (python -m producto run|backfill|analyze FILE)
 - This file: Main UI and orchestration
 
 DEPENDENCIES (install with: pip install pywin32 beautifulsoup4 requests keyring):
@@ -24,32 +27,35 @@ requests
 keyring
 """
 
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Any argument selects the headless runner (the GUI takes none);
+    # dispatch before any GUI module is imported
+    from producto_headless import main as headless_main
+    sys.exit(headless_main(sys.argv[1:]))
+
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import re
 import os
-import json
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta, timezone
 import threading
+import queue
 import win32com.client
 import pythoncom
 import requests
-import base64
 
 # Import v2 modules
 from outlook_extractor_v2_config import ConfigManager
+from credential_store_v2 import get_credential
 from outlook_extractor_v2_monitoring import EmailMonitor, ApprovalDialog
-from outlook_extractor_v2_integrations import OutlookTasksIntegration, WebexBotIntegration
-
-# Import meeting classification system v2
-from meeting_classifier_v2 import classify_meeting, MeetingClassification
-from meeting_prompts_v2 import (
-    SYSTEM_PROMPT,
-    build_refinement_user_prompt,
-    build_general_user_prompt,
-    build_mixed_user_prompt
-)
+from jira_client_v2 import JiraClient, JiraCreateResult
+from delivery_ledger_v2 import JIRA, meeting_id_for
+from jira_metadata_v2 import JiraMetadataCache, FieldResolver
+from jira_payloads_v2 import drafts_from_structured, draft_from_text, build_issue_payload
+from log_sink_v2 import TkLogSink, setup_logging
+from meeting_pipeline_v2 import MeetingPipeline
+from outlook_extractor_v2_integrations import WEBEX_API_BASE_URL
 
 try:
     import keyring
@@ -68,7 +74,8 @@ class WebexOAuthManager:
         self.config_manager = config_manager
         self.log = log_callback if log_callback else print
         # Webex OAuth2 token endpoint for Service Apps
-        self.token_url = 'https://webexapis.com/v1/access_token'
+        api_base_url = config_manager.config.get('webex_api_base_url') or WEBEX_API_BASE_URL
+        self.token_url = f"{api_base_url.rstrip('/')}/access_token"
     
     def get_access_token(self):
         """Get valid access token, refreshing if necessary"""
@@ -176,6 +183,24 @@ class OutlookWebexExtractorV2:
         self.outlook = None
         self.config_manager = ConfigManager()
         
+        # Logging: any thread logs, the Tk thread drains the queue into the log widget
+        self.log_sink = TkLogSink(max_lines=self.config_manager.config.get('log_max_lines', 2000))
+        self.logger = setup_logging(
+            self.log_sink,
+            log_file=(os.path.join(self.config_manager.config_dir, 'producto.log')
+                      if self.config_manager.config.get('log_file_enabled', False) else None),
+            max_mb=self.config_manager.config.get('log_file_max_mb', 5),
+            backups=self.config_manager.config.get('log_file_backups', 3)
+        )
+        
+        # Email -> transcript -> analysis -> delivery (shared with the headless runner)
+        self.pipeline = MeetingPipeline(self.config_manager, credentials=self.credential,
+                                        options=self.pipeline_options, log_callback=self.log)
+        self.delivery_ledger = self.pipeline.delivery_ledger
+        self.jira_metadata = JiraMetadataCache(
+            os.path.join(self.config_manager.config_dir, 'jira_metadata'),
+            ttl_hours=self.config_manager.config.get('jira_metadata_ttl_hours', 24)
+        )
         # Monitoring
         self.email_monitor = None
         
@@ -540,6 +565,7 @@ class OutlookWebexExtractorV2:
                                                   bg='white', fg='#2C3E50',
                                                   relief='sunken', borderwidth=2)
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=2, pady=2)
+        self.log_sink.attach(self.root, self.log_text)
         
         # Initial log
         self.log("=" * 80)
@@ -568,11 +594,8 @@ class OutlookWebexExtractorV2:
         self.log("Ready to connect to Outlook...")
         
     def log(self, message):
-        """Add message to log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        """Add message to log with timestamp (safe from any thread; shown on the next UI tick)"""
+        self.logger.info(message)
     
     def auto_connect_outlook(self):
         """Auto-connect to Outlook on startup"""
@@ -663,12 +686,7 @@ class OutlookWebexExtractorV2:
             return
         
         # Clear the lists
-        processed_count = len(self.config_manager.config['processed_emails'])
-        ignored_count = len(self.config_manager.config['ignored_emails'])
-        
-        self.config_manager.config['processed_emails'] = []
-        self.config_manager.config['ignored_emails'] = []
-        self.config_manager.save_config()
+        processed_count, ignored_count = self.config_manager.clear_handled_emails()
         
         self.log("=" * 60)
         self.log("🗑️ Processing history cleared!")
@@ -695,804 +713,36 @@ class OutlookWebexExtractorV2:
         pythoncom.CoInitialize()
         
         try:
-            subject = email_data['subject']
-            body = email_data['body']
-            
-            self.log(f"▶ Processing: {subject[:60]}...")
-            
-            # Extract Webex info
-            webex_info = self.extract_webex_info_from_body(subject, body)
-            
-            # Check if transcript is embedded in email (no recording URL)
-            has_embedded_transcript = self.check_for_embedded_transcript(body)
-            
-            if not webex_info and not has_embedded_transcript:
-                self.log("  ✗ No Webex URL or embedded transcript found")
-                self.config_manager.add_processed_email(email_data['entry_id'])
-                return
-            
-            # Handle transcript-only emails (no recording)
-            if not webex_info and has_embedded_transcript:
-                self.log("  ℹ️ This is a transcript-only meeting (no recording)")
-                self.process_transcript_only_email(email_data, subject, body)
-                return
+            result = self.pipeline.process_email(email_data)
             
-            # Download VTT using Webex Access Token
-            output_dir = self.output_entry.get()
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Get Webex access token from UI entry
-            webex_access_token = self.webex_token_entry.get()
-            
-            if not webex_access_token:
-                self.log("  ✗ Webex Access Token not configured")
-                self.log("     Set WEBEX_ACCESS_TOKEN environment variable")
-                self.config_manager.add_processed_email(email_data['entry_id'])
-                return
-            
-            vtt_file = self.download_vtt_from_webex(webex_info, output_dir, subject, webex_access_token)
-            
-            if not vtt_file or not vtt_file.endswith('.vtt'):
-                self.log("  ✗ Could not download VTT")
-                self.config_manager.add_processed_email(email_data['entry_id'])
-                return
-            
-            self.log(f"  ✓ Downloaded VTT: {vtt_file}")
-            
-            # Analyze with AI
-            if self.enable_analysis_var.get():
-                analysis_result = self.analyze_vtt_file(output_dir, vtt_file, subject)
-                
-                if analysis_result:
-                    analysis_file, analysis_text, structured_data = analysis_result
-                    self.log("  ✓ AI analysis complete")
-                    
-                    # Create Outlook Tasks
-                    if self.auto_create_tasks_var.get() and structured_data:
-                        actions = structured_data.get('actions', [])
-                        if actions:
-                            tasks_integration = OutlookTasksIntegration(log_callback=self.log)
-                            tasks_integration.create_tasks_from_actions(actions, subject)
-                    
-                    # Send to Webex bot
-                    self.log(f"  Checking Webex bot integration...")
-                    self.log(f"    Auto-send enabled: {self.auto_send_webex_var.get()}")
-                    self.log(f"    Has structured data: {bool(structured_data)}")
-                    
-                    if self.auto_send_webex_var.get() and structured_data:
-                        bot_token = self.bot_token_entry.get()
-                        self.log(f"    Bot token configured: {bool(bot_token)}")
-                        
-                        if bot_token:
-                            webex_integration = WebexBotIntegration(bot_token, log_callback=self.log)
-                            recipient_email = self.config_manager.config.get('bot_recipient_email', 'qschalle@cisco.com')
-                            webex_integration.send_analysis_summary(
-                                structured_data, subject, webex_info.get('url', ''), recipient_email
-                            )
-                        else:
-                            self.log("  ⚠️ Webex Bot Token not configured - skipping bot notification")
-                    else:
-                        if not self.auto_send_webex_var.get():
-                            self.log("  ℹ️ Auto-send to Webex Bot is disabled (check Settings)")
-                        if not structured_data:
-                            self.log("  ℹ️ No structured data to send to bot")
-                    
-                    # Display analysis
-                    self.root.after(0, lambda: self.display_analysis_summary(analysis_text, subject))
-            
-            # Mark as processed
-            self.config_manager.add_processed_email(email_data['entry_id'])
-            self.log(f"✓ Completed: {subject[:60]}")
-        
-        except Exception as e:
-            self.log(f"✗ Error: {str(e)}")
-            import traceback
-            self.log(traceback.format_exc()[:300])
+            # Display analysis
+            if result.analysis_text:
+                self.root.after(0, lambda: self.display_analysis_summary(
+                    result.analysis_text, result.subject, result.meeting_key, result.structured_data))
         
         finally:
             pythoncom.CoUninitialize()
     
-    # ===== EXTRACTION & ANALYSIS METHODS (from MVP) =====
-    
-    def check_for_embedded_transcript(self, body):
-        """Check if email mentions transcript (will fetch from Webex API)"""
-        # Look for transcript indicators AND Webex meeting links
-        transcript_indicators = [
-            'transcript',
-            'meeting notes',
-            'conversation summary',
-            'meeting summary',
-            'closed captions',
-            'captions'
-        ]
-        
-        body_lower = body.lower()
-        has_transcript_mention = any(indicator in body_lower for indicator in transcript_indicators)
-        
-        # Also check for Webex meeting links (not recording links)
-        has_webex_link = 'webex.com/meet/' in body_lower or 'webex.com/m/' in body_lower
-        
-        return has_transcript_mention or has_webex_link
-    
-    def process_transcript_only_email(self, email_data, subject, body):
-        """Process email that has transcript but no recording"""
-        try:
-            self.log("  Fetching transcript from Webex...")
-            
-            # Get Webex access token from UI entry
-            webex_access_token = self.webex_token_entry.get()
-            
-            if not webex_access_token:
-                self.log("  ✗ Webex Access Token not configured")
-                self.log("     Set WEBEX_ACCESS_TOKEN environment variable")
-                self.config_manager.add_processed_email(email_data['entry_id'])
-                return
-            
-            # Extract meeting ID from email
-            meeting_id = self.extract_meeting_id_from_email(body)
-            if not meeting_id:
-                self.log("  ✗ Could not extract meeting ID from email")
-                # Fallback: try to extract from email body text
-                self.log("  Attempting to extract transcript from email body as fallback...")
-                soup = BeautifulSoup(body, 'html.parser')
-                text = soup.get_text()
-                transcript_text = self.extract_transcript_from_email_text(text)
-                
-                if not transcript_text or len(transcript_text) < 100:
-                    self.log("  ✗ No transcript found in email body either")
-                    self.config_manager.add_processed_email(email_data['entry_id'])
-                    return
-            else:
-                # Fetch transcript from Webex API
-                transcript_text = self.fetch_transcript_from_webex(meeting_id, webex_access_token)
-                
-                if not transcript_text:
-                    self.log("  ✗ Could not fetch transcript from Webex API")
-                    self.config_manager.add_processed_email(email_data['entry_id'])
-                    return
-            
-            self.log(f"  ✓ Retrieved {len(transcript_text)} characters of transcript")
-            
-            # Save transcript as text file
-            output_dir = self.output_entry.get()
-            os.makedirs(output_dir, exist_ok=True)
-            
-            safe_title = re.sub(r'[^\w\s-]', '', subject)[:50]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            txt_filename = f"{safe_title}_{timestamp}_transcript.txt"
-            txt_filepath = os.path.join(output_dir, txt_filename)
-            
-            with open(txt_filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Meeting: {subject}\n")
-                f.write(f"Extracted: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(transcript_text)
-            
-            self.log(f"  ✓ Saved transcript: {txt_filename}")
-            
-            # Analyze with AI if enabled
-            if self.enable_analysis_var.get():
-                self.log("  Analyzing transcript with AI...")
-                analysis_result = self.analyze_transcript_text(transcript_text, subject, output_dir, safe_title)
-                
-                if analysis_result:
-                    analysis_text, structured_data = analysis_result
-                    self.log("  ✓ AI analysis complete")
-                    
-                    # Create Outlook Tasks
-                    if self.auto_create_tasks_var.get() and structured_data:
-                        actions = structured_data.get('actions', [])
-                        if actions:
-                            from outlook_extractor_v2_integrations import OutlookTasksIntegration
-                            tasks_integration = OutlookTasksIntegration(log_callback=self.log)
-                            tasks_integration.create_tasks_from_actions(actions, subject)
-                    
-                    # Send to Webex bot
-                    self.log(f"  Checking Webex bot integration...")
-                    self.log(f"    Auto-send enabled: {self.auto_send_webex_var.get()}")
-                    self.log(f"    Has structured data: {bool(structured_data)}")
-                    
-                    if self.auto_send_webex_var.get() and structured_data:
-                        bot_token = self.bot_token_entry.get()
-                        self.log(f"    Bot token configured: {bool(bot_token)}")
-                        
-                        if bot_token:
-                            from outlook_extractor_v2_integrations import WebexBotIntegration
-                            webex_integration = WebexBotIntegration(bot_token, log_callback=self.log)
-                            recipient_email = self.config_manager.config.get('bot_recipient_email', 'qschalle@cisco.com')
-                            webex_integration.send_analysis_summary(structured_data, subject, '', recipient_email)
-                        else:
-                            self.log("  ⚠️ Webex Bot Token not configured - skipping bot notification")
-                    else:
-                        if not self.auto_send_webex_var.get():
-                            self.log("  ℹ️ Auto-send to Webex Bot is disabled (check Settings)")
-                        if not structured_data:
-                            self.log("  ℹ️ No structured data to send to bot")
-                    
-                    # Display analysis
-                    self.root.after(0, lambda: self.display_analysis_summary(analysis_text, subject))
-            
-            # Mark as processed
-            self.config_manager.add_processed_email(email_data['entry_id'])
-            self.log(f"✓ Completed: {subject[:60]}")
-            
-        except Exception as e:
-            self.log(f"  Error processing transcript: {str(e)}")
-            self.config_manager.add_processed_email(email_data['entry_id'])
-    
-    def extract_meeting_id_from_email(self, body):
-        """Extract Webex meeting ID from email body"""
-        # Look for meeting ID patterns in the email
-        # Pattern 1: Meeting number
-        meeting_patterns = [
-            r'Meeting\s+(?:number|ID|#)[\s:]+(\d{9,15})',
-            r'meetingKey["\']?\s*[:=]\s*["\']?([a-f0-9]{32})',
-            r'webex\.com/meet/([a-zA-Z0-9\-_]+)',
-            r'webex\.com/m/([a-zA-Z0-9\-_]+)',
-            r'meetingUUID["\']?\s*[:=]\s*["\']?([a-f0-9\-]{36})',
-        ]
-        
-        for pattern in meeting_patterns:
-            match = re.search(pattern, body, re.IGNORECASE)
-            if match:
-                meeting_id = match.group(1)
-                self.log(f"  Found meeting ID: {meeting_id[:20]}...")
-                return meeting_id
-        
-        return None
-    
-    def fetch_transcript_from_webex(self, meeting_id, access_token):
-        """Fetch transcript from Webex API using meeting ID"""
-        try:
-            self.log(f"  Calling Webex Meetings API...")
-            headers = {
-                'Authorization': f'Bearer {access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Try to get meeting details first
-            # Note: Webex transcript API may require specific scopes
-            # This is a simplified approach - may need adjustment based on actual API
-            
-            # Option 1: Try meetings API
-            meetings_url = f'https://webexapis.com/v1/meetings/{meeting_id}'
-            response = requests.get(meetings_url, headers=headers, timeout=30)
-            
-            if response.status_code == 200:
-                meeting_data = response.json()
-                self.log(f"  ✓ Got meeting details")
-                
-                # Check if transcript is available
-                # Note: Actual field names may vary
-                transcript_url = meeting_data.get('transcriptUrl') or meeting_data.get('transcript')
-                
-                if transcript_url:
-                    self.log(f"  Downloading transcript...")
-                    transcript_response = requests.get(transcript_url, headers=headers, timeout=60)
-                    if transcript_response.status_code == 200:
-                        return transcript_response.text
-            
-            # Option 2: Try recordings API to find transcript
-            self.log(f"  Trying recordings API...")
-            recordings_url = f'https://webexapis.com/v1/recordings'
-            
-            # Search for recordings with this meeting ID
-            # This is similar to the VTT download logic
-            now = datetime.now(timezone.utc)
-            search_from = (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
-            search_to = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
-            
-            params = {'max': 100, 'from': search_from, 'to': search_to}
-            response = requests.get(recordings_url, headers=headers, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                recordings = response.json().get('items', [])
-                self.log(f"  Found {len(recordings)} recordings")
-                
-                for rec in recordings:
-                    # Try to match by meeting ID
-                    if str(meeting_id) in str(rec.get('meetingId', '')):
-                        rec_id = rec.get('id')
-                        self.log(f"  Found matching recording: {rec_id}")
-                        
-                        # Get recording details
-                        detail_url = f'https://webexapis.com/v1/recordings/{rec_id}'
-                        detail_response = requests.get(detail_url, headers=headers, timeout=30)
-                        
-                        if detail_response.status_code == 200:
-                            rec_full = detail_response.json()
-                            links = rec_full.get('temporaryDirectDownloadLinks', {})
-                            transcript_link = links.get('transcriptDownloadLink')
-                            
-                            if transcript_link:
-                                self.log(f"  Downloading transcript...")
-                                transcript_response = requests.get(transcript_link, timeout=60)
-                                if transcript_response.status_code == 200:
-                                    # Convert VTT to plain text
-                                    return self.extract_text_from_vtt(transcript_response.text)
-            
-            self.log(f"  ✗ No transcript found via API")
-            return None
-            
-        except Exception as e:
-            self.log(f"  Error fetching transcript: {str(e)}")
-            return None
-    
-    def extract_transcript_from_email_text(self, text):
-        """Extract transcript content from email plain text (fallback)"""
-        # Remove excessive whitespace
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        # Try to find where transcript starts
-        # Common headers: "Transcript:", "Meeting Notes:", etc.
-        transcript_start_idx = 0
-        for idx, line in enumerate(lines):
-            if any(marker in line.lower() for marker in ['transcript', 'meeting notes', 'conversation']):
-                transcript_start_idx = idx + 1
-                break
-        
-        # Take everything after the header
-        transcript_lines = lines[transcript_start_idx:]
-        
-        # Filter out common email footer junk
-        filtered_lines = []
-        for line in transcript_lines:
-            # Skip lines that are likely email metadata
-            if any(skip in line.lower() for skip in [
-                'unsubscribe', 'privacy', 'cisco.com', 'copyright',
-                'do not reply', 'automatic message', 'webex teams'
-            ]):
-                continue
-            filtered_lines.append(line)
-        
-        return '\n'.join(filtered_lines)
-    
-    def analyze_transcript_text(self, transcript_text, meeting_title, output_dir, safe_title):
-        """Analyze transcript text using Chat AI (similar to VTT analysis)"""
-        try:
-            client_id = self.chatai_client_id_entry.get()
-            client_secret = self.chatai_client_secret_entry.get()
-            app_key = self.chatai_app_key_entry.get()
-            
-            if not all([client_id, client_secret, app_key]):
-                self.log("  ✗ Chat AI credentials not configured")
-                return None
-            
-            # Classify meeting
-            from meeting_classifier_v2 import classify_meeting
-            classification = classify_meeting(meeting_title, transcript_text)
-            self.log(f"  📊 Meeting Classification: {classification.meeting_type.upper()}")
-            self.log(f"     Refinement Score: {classification.refinement_score:.2f} | Action Score: {classification.action_score:.2f}")
-            
-            # Intelligent routing based on classification
-            if classification.meeting_type == "refinement":
-                self.log(f"  🎯 Routing: Stories → Jira (with approval)")
-            elif classification.meeting_type == "general":
-                self.log(f"  🎯 Routing: Actions → Outlook Tasks (automatic)")
-            else:  # mixed
-                self.log(f"  🎯 Routing: Stories → Jira | Actions → Outlook Tasks")
-            
-            # Get SSO token
-            sso_url = 'https://id.cisco.com/oauth2/default/v1/token'
-            credentials = f"{client_id}:{client_secret}"
-            encoded = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-            
-            sso_response = requests.post(
-                sso_url,
-                headers={
-                    'Authorization': f'Basic {encoded}',
-                    'Content-Type': 'application/x-www-form-urlencoded'
-                },
-                data='grant_type=client_credentials',
-                timeout=30
-            )
-            
-            if sso_response.status_code != 200:
-                self.log(f"  ✗ SSO authentication failed")
-                return None
-            
-            access_token = sso_response.json().get('access_token')
-            
-            # Build prompt
-            from meeting_prompts_v2 import (
-                SYSTEM_PROMPT,
-                build_refinement_user_prompt,
-                build_general_user_prompt,
-                build_mixed_user_prompt
-            )
-            
-            if classification.meeting_type == "refinement":
-                user_prompt = build_refinement_user_prompt(meeting_title, transcript_text)
-            elif classification.meeting_type == "general":
-                user_prompt = build_general_user_prompt(meeting_title, transcript_text)
-            else:
-                user_prompt = build_mixed_user_prompt(meeting_title, transcript_text)
-            
-            # Call Chat AI
-            chatai_response = requests.post(
-                'https://chat-ai.cisco.com/openai/deployments/gemini-2.5-flash/chat/completions',
-                headers={'Content-Type': 'application/json', 'api-key': access_token},
-                json={
-                    'messages': [
-                        {'role': 'system', 'content': SYSTEM_PROMPT},
-                        {'role': 'user', 'content': user_prompt}
-                    ],
-                    'temperature': 0.2,
-                    'max_tokens': 8000,
-                    'user': f'{{"appkey": "{app_key}"}}'
-                },
-                timeout=180
-            )
-            
-            if chatai_response.status_code != 200:
-                self.log(f"  ✗ Chat AI API failed")
-                return None
-            
-            llm_output = chatai_response.json()['choices'][0]['message']['content']
-            
-            # Parse JSON
-            structured_data = None
-            try:
-                json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', llm_output, re.DOTALL)
-                json_str = json_match.group(1) if json_match else llm_output
-                structured_data = json.loads(json_str)
-                
-                if 'stories' in structured_data:
-                    self.log(f"     {len(structured_data['stories'])} stories")
-                if 'actions' in structured_data:
-                    self.log(f"     {len(structured_data['actions'])} actions")
-            except:
-                pass
-            
-            # Save analysis
-            if structured_data:
-                json_filepath = os.path.join(output_dir, f"{safe_title}_analysis.json")
-                with open(json_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(structured_data, f, indent=2)
-            
-            analysis_text = f"Meeting: {meeting_title}\nType: {classification.meeting_type}\n\n"
-            if structured_data:
-                analysis_text += json.dumps(structured_data, indent=2)
-            else:
-                analysis_text += llm_output
-            
-            txt_filepath = os.path.join(output_dir, f"{safe_title}_analysis.txt")
-            with open(txt_filepath, 'w', encoding='utf-8') as f:
-                f.write(analysis_text)
-            
-            return (analysis_text, structured_data)
-        
-        except Exception as e:
-            self.log(f"  Analysis error: {str(e)}")
-            return None
-    
-    def extract_webex_info_from_body(self, subject, body):
-        """Extract Webex URL and password from email"""
-        self.log("  Extracting Webex info from email body...")
-        
-        soup = BeautifulSoup(body, 'html.parser')
-        text = soup.get_text()
-        
-        # Log first 500 chars of body for debugging
-        body_preview = body[:500] if body else "(empty)"
-        self.log(f"  Body preview (first 500 chars): {body_preview[:200]}...")
-        
-        webex_patterns = [
-            r'https://[\w\-]+\.webex\.com/[\w\-]+/ldr\.php?[^\s"<>]+',
-            r'https://[\w\-]+\.webex\.com/[\w\-]+/lsr\.php?[^\s"<>]+',
-            r'https://[\w\-]+\.webex\.com/webappng/sites/[\w\-]+/recording/[^\s"<>]+',
-            r'https://[\w\-]+\.webex\.com/recordingservice/sites/[\w\-]+/recording/playback/[^\s"<>]+',
-        ]
-        
-        meeting_url = None
-        for idx, pattern in enumerate(webex_patterns):
-            match = re.search(pattern, body, re.IGNORECASE)
-            if match:
-                meeting_url = match.group(0)
-                self.log(f"  ✓ Found URL with pattern {idx+1}: {meeting_url[:80]}...")
-                break
-        
-        if not meeting_url:
-            self.log("  ✗ No Webex URL found in email body")
-            self.log(f"  Searched {len(webex_patterns)} patterns")
-            return None
-        
-        password_patterns = [
-            r'Password[\s:]+([a-zA-Z0-9]+)',
-            r'password[\s:]+([a-zA-Z0-9]+)',
-            r'Recording password[\s:]+([a-zA-Z0-9]+)',
-        ]
-        
-        password = None
-        for pattern in password_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                password = match.group(1).strip()
-                self.log(f"  ✓ Found password: {password[:3]}***")
-                break
-        
-        if not password:
-            self.log("  ⚠ No password found (may not be required)")
-        
-        return {'url': meeting_url, 'password': password}
-    
-    def download_vtt_from_webex(self, webex_info, output_dir, subject, access_token):
-        """Download VTT from Webex API - simplified version"""
-        try:
-            recording_url = webex_info['url']
-            normalized_title = self.normalize_title(subject)
-            
-            self.log(f"  Recording URL: {recording_url[:80]}...")
-            self.log(f"  Normalized title: {normalized_title}")
-            
-            rcid = self.extract_recording_id(recording_url)
-            if not rcid:
-                self.log("  ✗ Could not extract recording ID from URL")
-                return None
-            
-            self.log(f"  Recording ID: {rcid}")
-            
-            headers = {'Authorization': f'Bearer {access_token}', 'Content-Type': 'application/json'}
-            self.log(f"  Using token length: {len(access_token)}")
-            
-            # Search last 30 days
-            now = datetime.now(timezone.utc)
-            search_from = (now - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
-            search_to = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
-            
-            # List recordings
-            list_url = 'https://webexapis.com/v1/recordings'
-            params = {'max': 100, 'from': search_from, 'to': search_to}
-            self.log(f"  Calling Webex API to list recordings...")
-            response = requests.get(list_url, headers=headers, params=params, timeout=30)
-            
-            self.log(f"  API Response: {response.status_code}")
-            
-            if response.status_code != 200:
-                self.log(f"  ✗ API Error: {response.text[:200]}")
-                return None
-            
-            recordings = response.json().get('items', [])
-            self.log(f"  Found {len(recordings)} recordings in last 30 days")
-            
-            # Find best match (simplified - just use title matching)
-            best_match = None
-            best_score = 0
-            
-            self.log(f"  Searching for match to: '{normalized_title}'")
-            
-            for rec in recordings:
-                score = 0
-                topic = rec.get('topic', '').lower()
-                title_words = set(normalized_title.lower().split())
-                topic_words = set(topic.split())
-                
-                # Score by word overlap
-                overlap = len(title_words.intersection(topic_words))
-                if overlap > best_score:
-                    best_score = overlap
-                    best_match = rec
-                    self.log(f"    Better match: '{rec.get('topic', 'N/A')}' (score: {overlap})")
-            
-            if not best_match or best_score < 1:
-                self.log(f"  ✗ No good match found (best score: {best_score})")
-                if recordings:
-                    self.log(f"    Available recordings: {[r.get('topic', 'N/A')[:40] for r in recordings[:3]]}")
-                return None
-            
-            self.log(f"  ✓ Best match: '{best_match.get('topic', 'N/A')}' (score: {best_score})")
-            
-            # Get VTT download link
-            rec_id = best_match.get('id')
-            detail_url = f'https://webexapis.com/v1/recordings/{rec_id}'
-            self.log(f"  Getting recording details...")
-            detail_response = requests.get(detail_url, headers=headers, timeout=30)
-            
-            if detail_response.status_code != 200:
-                self.log(f"  ✗ Failed to get recording details: {detail_response.status_code}")
-                return None
-            
-            rec_full = detail_response.json()
-            links = rec_full.get('temporaryDirectDownloadLinks', {})
-            vtt_url = links.get('transcriptDownloadLink')
-            
-            if not vtt_url:
-                self.log(f"  ✗ No transcript download link available")
-                self.log(f"    Available links: {list(links.keys())}")
-                return None
-            
-            self.log(f"  ✓ Found transcript link")
-            
-            # Download VTT
-            self.log(f"  Downloading VTT file...")
-            vtt_response = requests.get(vtt_url, timeout=60)
-            if vtt_response.status_code != 200:
-                self.log(f"  ✗ VTT download failed: {vtt_response.status_code}")
-                return None
-            
-            self.log(f"  ✓ Downloaded {len(vtt_response.content)} bytes")
-            
-            # Save
-            safe_title = re.sub(r'[^\w\s-]', '', normalized_title)[:50]
-            filename = f"{safe_title}_{rec_id}.vtt"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'wb') as f:
-                f.write(vtt_response.content)
-            
-            return filename
-        
-        except Exception as e:
-            self.log(f"  Error downloading VTT: {str(e)}")
-            return None
-    
-    def normalize_title(self, subject):
-        """Clean up email subject"""
-        if not subject:
-            return "Untitled"
-        
-        prefixes = ["Fw:", "Re:", "FW:", "RE:", "Fwd:", "Webex:", "Recording:", 
-                   "Recording of", "Recording available:", "Your Webex meeting content is available:"]
-        
-        title = subject.strip()
-        for prefix in prefixes:
-            if title.lower().startswith(prefix.lower()):
-                title = title[len(prefix):].strip()
-        
-        return ' '.join(title.split()) if title else "Untitled"
-    
-    def extract_recording_id(self, url):
-        """Extract recording ID from URL"""
-        patterns = [r'RCID=([a-f0-9\-]+)', r'/recording/([a-f0-9\-]+)', 
-                   r'recordingId=([a-f0-9\-]+)', r'/playback/([a-f0-9\-]+)']
-        
-        for pattern in patterns:
-            match = re.search(pattern, url, re.IGNORECASE)
-            if match:
-                return match.group(1)
-        return None
+    def credential(self, name):
+        """Credential for the pipeline, read from the Settings entries"""
+        entry = {
+            'webex_access_token': self.webex_token_entry,
+            'webex_bot_token': self.bot_token_entry,
+            'chatai_client_id': self.chatai_client_id_entry,
+            'chatai_client_secret': self.chatai_client_secret_entry,
+            'chatai_app_key': self.chatai_app_key_entry,
+        }.get(name)
+        return entry.get() if entry is not None else get_credential(name)
     
-    def analyze_vtt_file(self, output_dir, vtt_filename, meeting_title):
-        """Analyze VTT with Chat AI - simplified"""
-        try:
-            client_id = self.chatai_client_id_entry.get()
-            client_secret = self.chatai_client_secret_entry.get()
-            app_key = self.chatai_app_key_entry.get()
-            
-            if not all([client_id, client_secret, app_key]):
-                return None
-            
-            # Read VTT
-            vtt_filepath = os.path.join(output_dir, vtt_filename)
-            with open(vtt_filepath, 'r', encoding='utf-8') as f:
-                vtt_content = f.read()
-            
-            transcript_text = self.extract_text_from_vtt(vtt_content)
-            
-            if len(transcript_text) < 50:
-                return None
-            
-            # Classify
-            classification = classify_meeting(meeting_title, transcript_text)
-            self.log(f"  📊 Meeting Classification: {classification.meeting_type.upper()}")
-            self.log(f"     Refinement Score: {classification.refinement_score:.2f} | Action Score: {classification.action_score:.2f}")
-            
-            # Intelligent routing based on classification
-            if classification.meeting_type == "refinement":
-                self.log(f"  🎯 Routing: Stories → Jira (with approval)")
-            elif classification.meeting_type == "general":
-                self.log(f"  🎯 Routing: Actions → Outlook Tasks (automatic)")
-            else:  # mixed
-                self.log(f"  🎯 Routing: Stories → Jira | Actions → Outlook Tasks")
-            
-            # Get SSO token
-            sso_url = 'https://id.cisco.com/oauth2/default/v1/token'
-            credentials = f"{client_id}:{client_secret}"
-            encoded = base64.b64encode(credentials.encode('utf-8')).decode('utf-8')
-            
-            sso_response = requests.post(
-                sso_url,
-                headers={
-                    'Authorization': f'Basic {encoded}',
-                    'Content-Type': 'application/x-www-form-urlencoded'
-                },
-                data='grant_type=client_credentials',
-                timeout=30
-            )
-            
-            if sso_response.status_code != 200:
-                return None
-            
-            access_token = sso_response.json().get('access_token')
-            
-            # Build prompt
-            if classification.meeting_type == "refinement":
-                user_prompt = build_refinement_user_prompt(meeting_title, transcript_text)
-            elif classification.meeting_type == "general":
-                user_prompt = build_general_user_prompt(meeting_title, transcript_text)
-            else:
-                user_prompt = build_mixed_user_prompt(meeting_title, transcript_text)
-            
-            # Call Chat AI
-            chatai_response = requests.post(
-                'https://chat-ai.cisco.com/openai/deployments/gemini-2.5-flash/chat/completions',
-                headers={'Content-Type': 'application/json', 'api-key': access_token},
-                json={
-                    'messages': [
-                        {'role': 'system', 'content': SYSTEM_PROMPT},
-                        {'role': 'user', 'content': user_prompt}
-                    ],
-                    'temperature': 0.2,
-                    'max_tokens': 8000,
-                    'user': f'{{"appkey": "{app_key}"}}'
-                },
-                timeout=180
-            )
-            
-            if chatai_response.status_code != 200:
-                return None
-            
-            llm_output = chatai_response.json()['choices'][0]['message']['content']
-            
-            # Parse JSON
-            structured_data = None
-            try:
-                json_match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', llm_output, re.DOTALL)
-                json_str = json_match.group(1) if json_match else llm_output
-                structured_data = json.loads(json_str)
-                
-                if 'stories' in structured_data:
-                    self.log(f"     {len(structured_data['stories'])} stories")
-                if 'actions' in structured_data:
-                    self.log(f"     {len(structured_data['actions'])} actions")
-            except:
-                pass
-            
-            # Save files
-            base_filename = vtt_filename.replace('.vtt', '')
-            
-            if structured_data:
-                json_filepath = os.path.join(output_dir, f"{base_filename}_analysis.json")
-                with open(json_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(structured_data, f, indent=2)
-            
-            analysis_text = f"Meeting: {meeting_title}\nType: {classification.meeting_type}\n\n"
-            if structured_data:
-                analysis_text += json.dumps(structured_data, indent=2)
-            else:
-                analysis_text += llm_output
-            
-            txt_filepath = os.path.join(output_dir, f"{base_filename}_analysis.txt")
-            with open(txt_filepath, 'w', encoding='utf-8') as f:
-                f.write(analysis_text)
-            
-            return (f"{base_filename}_analysis.txt", analysis_text, structured_data)
-        
-        except Exception as e:
-            self.log(f"  Analysis error: {str(e)}")
-            return None
-    
-    def extract_text_from_vtt(self, vtt_content):
-        """Extract text from VTT"""
-        lines = vtt_content.split('\n')
-        text_lines = []
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
-                i += 1
-                continue
-            if '-->' in line:
-                i += 1
-                if i < len(lines):
-                    text = lines[i].strip()
-                    if text:
-                        text_lines.append(text)
-                continue
-            i += 1
-        
-        return ' '.join(text_lines)
+    def pipeline_options(self):
+        """Current checkbox/entry values (they may change while monitoring)"""
+        return {
+            'enable_analysis': self.enable_analysis_var.get(),
+            'auto_create_tasks': self.auto_create_tasks_var.get(),
+            'auto_send_to_webex': self.auto_send_webex_var.get(),
+            'bot_recipient_email': self.config_manager.config.get('bot_recipient_email', 'qschalle@cisco.com'),
+            'output_directory': self.output_entry.get(),
+        }
     
     def parse_jira_issues(self, analysis_text):
         """Parse the analysis text into individual Jira issues"""
@@ -1516,10 +766,19 @@ class OutlookWebexExtractorV2:
         
         return issues
     
-    def post_issues_to_jira(self, issue_vars, issue_texts, parent_window):
-        """Post selected issues to Jira Cloud"""
+    def post_issues_to_jira(self, issue_selected, issue_texts, parent_window, meeting_key=None, issue_drafts=None):
+        """Post selected issues to Jira Cloud
+        
+        issue_selected holds one bool per entry of issue_texts.
+        
+        Payloads are built from issue_drafts (JiraIssueDraft per issue) when the
+        analysis was structured; plain-text issues are parsed from markdown.
+        
+        Issues already posted for this meeting (per the delivery ledger) are
+        skipped, or updated in place when delivery_update_existing is set.
+        """
         # Get selected issues
-        selected_issues = [(text, idx) for idx, (var, text) in enumerate(zip(issue_vars, issue_texts)) if var.get()]
+        selected_issues = [(text, idx) for idx, (selected, text) in enumerate(zip(issue_selected, issue_texts)) if selected]
         
         if not selected_issues:
             messagebox.showwarning("No Selection", "Please select at least one issue to post to Jira.")
@@ -1540,18 +799,16 @@ class OutlookWebexExtractorV2:
                                "- Jira Project Key")
             return
         
-        # Hardcoded custom field values
-        custom_field_values = {}
-        
-        # Work Type (customfield_10106) - RTB
-        default_work_type = os.getenv('JIRA_DEFAULT_WORK_TYPE', 'RTB')
-        custom_field_values['customfield_10106'] = {'value': default_work_type}
-        self.log(f"  Setting Work Type to: {default_work_type}")
+        # Custom field values by field name (or ID); resolved per project from Jira metadata
+        custom_field_values = dict(self.config_manager.config.get('jira_field_values', {}))
         
-        # Team field (customfield_10001)
-        default_team_id = os.getenv('JIRA_DEFAULT_TEAM_ID', '75ed17b2-21c7-405b-8534-57a2517f0dba-334')
-        custom_field_values['customfield_10001'] = default_team_id
-        self.log(f"  Setting Team field to: {default_team_id}")
+        # Work Type / Team overrides from the environment
+        if os.getenv('JIRA_DEFAULT_WORK_TYPE'):
+            custom_field_values['Work Type'] = {'value': os.getenv('JIRA_DEFAULT_WORK_TYPE')}
+        if os.getenv('JIRA_DEFAULT_TEAM_ID'):
+            custom_field_values['Team'] = os.getenv('JIRA_DEFAULT_TEAM_ID')
+        for name, value in custom_field_values.items():
+            self.log(f"  Setting {name} to: {value.get('value') if isinstance(value, dict) else value}")
         
         # Confirm before posting
         if not messagebox.askyesno("Confirm Post", 
@@ -1569,49 +826,87 @@ class OutlookWebexExtractorV2:
         progress_label = ttk.Label(progress_window, text="")
         progress_label.pack(pady=10)
         
-        # Post issues in a thread
+        # Post issues in a thread; progress comes back through a queue so that
+        # only the Tk thread touches the progress window
+        progress_queue = queue.Queue()
+        ledger_meeting = meeting_key or 'unknown meeting'
+        acceptance_criteria_field = (os.getenv('JIRA_ACCEPTANCE_CRITERIA_FIELD')
+                                     or self.config_manager.config.get('jira_acceptance_criteria_field',
+                                                                       'Acceptance Criteria'))
+        update_existing = self.config_manager.config.get('delivery_update_existing', False)
+        
         def post_thread():
-            import base64
-            auth_string = f"{jira_email}:{jira_token}"
-            auth_bytes = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+            results = {}
+            payloads = []
+            jira_client = JiraClient(jira_url, jira_email, jira_token, log_callback=self.log)
             
-            headers = {
-                'Authorization': f'Basic {auth_bytes}',
-                'Content-Type': 'application/json',
-                'Accept': 'application/json'
-            }
-            
-            api_url = f"{jira_url.rstrip('/')}/rest/api/3/issue"
-            
-            success_count = 0
-            failed_issues = []
-            
-            for idx, (issue_text, original_idx) in enumerate(selected_issues, 1):
-                progress_label.config(text=f"Posting issue {idx}/{len(selected_issues)}...")
-                progress_window.update()
-                
+            # Resolve field names and validate locally so bad payloads never hit Jira
+            resolver = FieldResolver(self.jira_metadata.get(jira_client, jira_project))
+            for idx, (issue_text, original_idx) in enumerate(selected_issues):
                 try:
-                    # Parse issue
-                    issue_data = self.parse_issue_for_jira(issue_text, jira_project, custom_field_values)
-                    
-                    # Post to Jira
-                    response = requests.post(api_url, json=issue_data, headers=headers, timeout=30)
-                    
-                    if response.status_code == 201:
-                        success_count += 1
-                        issue_key = response.json().get('key', 'Unknown')
-                        self.log(f"  ✅ Posted to Jira: {issue_key}")
+                    # Structured drafts when the analysis produced JSON, markdown otherwise
+                    draft = issue_drafts[original_idx] if issue_drafts else draft_from_text(issue_text)
+                    payload, warnings = build_issue_payload(draft, jira_project, custom_field_values,
+                                                            resolver, acceptance_criteria_field)
+                    for warning in warnings:
+                        self.log(f"  ⚠ {warning} - not sent")
+                    problems = resolver.validate(payload)
+                    if problems:
+                        results[idx] = JiraCreateResult(idx, error="Invalid: " + "; ".join(problems))
                     else:
-                        failed_issues.append(f"Issue {original_idx + 1}: {response.status_code} - {response.text[:100]}")
-                        self.log(f"  ✗ Failed to post issue {original_idx + 1}: {response.status_code}")
-                
+                        payloads.append((idx, payload))
                 except Exception as e:
-                    failed_issues.append(f"Issue {original_idx + 1}: {str(e)}")
-                    self.log(f"  ✗ Error posting issue {original_idx + 1}: {str(e)}")
+                    results[idx] = JiraCreateResult(idx, error=str(e))
             
-            # Close progress window
+            def on_progress(done, total, result):
+                progress_queue.put(('progress', done + len(results), len(selected_issues)))
+            
+            try:
+                # Skip (or update) issues already delivered for this meeting
+                to_create = []
+                for idx, payload in payloads:
+                    previous = self.delivery_ledger.lookup(JIRA, ledger_meeting, *self.jira_ledger_item(payload)) \
+                        if self.delivery_ledger is not None else None
+                    if not previous:
+                        to_create.append((idx, payload))
+                    elif update_existing:
+                        results[idx] = jira_client.update_issue(previous.external_id, payload, idx)
+                        self.log(f"  ↺ Updating existing Jira issue {previous.external_id}")
+                    else:
+                        results[idx] = JiraCreateResult(idx, key=previous.external_id)
+                        self.log(f"  ↺ Already posted as {previous.external_id}, skipping")
+                
+                created = jira_client.create_issues([payload for _, payload in to_create], on_progress=on_progress)
+                for (idx, _), result in zip(to_create, created):
+                    results[idx] = JiraCreateResult(idx, key=result.key, error=result.error)
+                
+                if self.delivery_ledger is not None:
+                    for idx, payload in payloads:
+                        result = results.get(idx)
+                        if result and result.ok:
+                            self.delivery_ledger.record(JIRA, ledger_meeting, *self.jira_ledger_item(payload),
+                                                        result.key)
+            except Exception as e:
+                for idx, _ in payloads:
+                    results.setdefault(idx, JiraCreateResult(idx, error=str(e)))
+            
+            progress_queue.put(('done', results))
+        
+        def finish(results):
             progress_window.destroy()
             
+            success_count = 0
+            failed_issues = []
+            for idx, (issue_text, original_idx) in enumerate(selected_issues):
+                result = results.get(idx)
+                if result and result.ok:
+                    success_count += 1
+                    self.log(f"  ✅ Posted to Jira: {result.key}")
+                else:
+                    error = result.error if result else "Not posted"
+                    failed_issues.append(f"Issue {original_idx + 1}: {error[:100]}")
+                    self.log(f"  ✗ Failed to post issue {original_idx + 1}: {error}")
+            
             # Show results
             if success_count == len(selected_issues):
                 messagebox.showinfo("Success", 
@@ -1624,86 +919,31 @@ class OutlookWebexExtractorV2:
                 messagebox.showerror("Failed", 
                                    f"Failed to post any issues.\n\n" + "\n".join(failed_issues[:3]))
         
+        def poll_progress():
+            try:
+                while True:
+                    event = progress_queue.get_nowait()
+                    if event[0] == 'done':
+                        finish(event[1])
+                        return
+                    _, done, total = event
+                    progress_label.config(text=f"Posted {done}/{total} issue(s)...")
+            except queue.Empty:
+                pass
+            progress_window.after(100, poll_progress)
+        
+        progress_label.config(text=f"Posting {len(selected_issues)} issue(s)...")
+        progress_window.after(100, poll_progress)
+        
         thread = threading.Thread(target=post_thread, daemon=True)
         thread.start()
     
-    def parse_issue_for_jira(self, issue_text, project_key, custom_field_values=None):
-        """Parse issue text and create Jira API payload"""
-        import re
-        
-        # Extract issue type and title
-        header_match = re.search(r'###\s+(?:\d+\.\s+)?\[(STORY|TASK)\]\s+(.+?)(?:\n|$)', issue_text)
-        
-        if not header_match:
-            raise ValueError("Could not parse issue header")
-        
-        issue_type = header_match.group(1)
-        title = header_match.group(2).strip()
-        
-        # Extract sections
-        summary_match = re.search(r'\*\*Summary:\*\*\s*\n(.+?)(?:\n\n|\*\*)', issue_text, re.DOTALL)
-        description_match = re.search(r'\*\*Description:\*\*\s*\n(.+?)(?:\n\n\*\*|$)', issue_text, re.DOTALL)
-        acceptance_criteria_match = re.search(r'\*\*Acceptance Criteria:\*\*\s*\n(.+?)(?:\n\n\*\*|$)', issue_text, re.DOTALL)
-        
-        summary = summary_match.group(1).strip() if summary_match else title
-        description = description_match.group(1).strip() if description_match else issue_text
-        
-        # Build Jira payload
-        payload = {
-            "fields": {
-                "project": {"key": project_key},
-                "summary": title[:255],  # Jira has a 255 char limit
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": description[:32000]  # Jira description limit
-                                }
-                            ]
-                        }
-                    ]
-                },
-                "issuetype": {"name": "Story" if issue_type == "STORY" else "Task"}
-            }
-        }
-        
-        # Add acceptance criteria if present (hardcoded field ID)
-        if acceptance_criteria_match:
-            acceptance_criteria = acceptance_criteria_match.group(1).strip()
-            # Hardcoded: customfield_10107 is the Acceptance Criteria field
-            acceptance_criteria_field = os.getenv('JIRA_ACCEPTANCE_CRITERIA_FIELD', 'customfield_10107')
-            # Format as ADF (Atlassian Document Format) like description
-            payload["fields"][acceptance_criteria_field] = {
-                "type": "doc",
-                "version": 1,
-                "content": [
-                    {
-                        "type": "paragraph",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": acceptance_criteria
-                            }
-                        ]
-                    }
-                ]
-            }
-            self.log(f"  Adding Acceptance Criteria to field: {acceptance_criteria_field}")
-        
-        # Add custom fields if provided (skip internal keys)
-        if custom_field_values:
-            for key, value in custom_field_values.items():
-                if not key.startswith('__'):  # Skip internal tracking keys
-                    payload["fields"][key] = value
-        
-        return payload
+    def jira_ledger_item(self, payload):
+        """(item type, title) that identifies a Jira payload in the delivery ledger"""
+        fields = payload.get('fields', {})
+        return fields.get('issuetype', {}).get('name', 'Task'), fields.get('summary', '')
     
-    def display_analysis_summary(self, analysis_text, meeting_title):
+    def display_analysis_summary(self, analysis_text, meeting_title, meeting_key=None, structured_data=None):
         """Display analysis with Jira issue selection UI"""
         # Create new window
         analysis_window = tk.Toplevel(self.root)
@@ -1725,67 +965,121 @@ class OutlookWebexExtractorV2:
                                 font=('Segoe UI', 14, 'bold'), style='Title.TLabel')
         title_label.grid(row=0, column=0, pady=10, sticky=tk.W)
         
-        # Parse issues from analysis text
-        issues = self.parse_jira_issues(analysis_text)
+        # Issues straight from the structured analysis; parse the text only when there is none
+        issue_drafts = drafts_from_structured(structured_data) if structured_data else []
+        if issue_drafts:
+            issues = [draft.to_text() for draft in issue_drafts]
+        else:
+            issues = self.parse_jira_issues(analysis_text)
+        
+        # Selection state lives in plain lists; the widgets only render it
+        issue_texts = list(issues)
+        issue_selected = [True] * len(issues)
         
         # Selection controls frame
         controls_frame = ttk.Frame(main_frame, style='TFrame')
         controls_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=5)
         
+        def refresh_rows(indexes=None):
+            for idx in (range(len(issues)) if indexes is None else indexes):
+                issue_tree.set(str(idx), 'selected', '☑' if issue_selected[idx] else '☐')
+            count_label.config(text=f"Selected: {sum(issue_selected)} / {len(issues)}")
+        
         # Select All / Deselect All buttons
         def select_all():
-            for var in issue_vars:
-                var.set(True)
+            issue_selected[:] = [True] * len(issues)
+            refresh_rows()
         
         def deselect_all():
-            for var in issue_vars:
-                var.set(False)
+            issue_selected[:] = [False] * len(issues)
+            refresh_rows()
         
         ttk.Button(controls_frame, text="✓ Select All", command=select_all, style='Action.TButton').grid(row=0, column=0, padx=5)
         ttk.Button(controls_frame, text="✗ Deselect All", command=deselect_all, style='Action.TButton').grid(row=0, column=1, padx=5)
         ttk.Label(controls_frame, text=f"Total Issues: {len(issues)}", font=('Segoe UI', 10, 'bold')).grid(row=0, column=2, padx=20)
-        
-        # Scrollable frame for issues
-        canvas = tk.Canvas(main_frame, bg='#F5F7FA', highlightthickness=0)
-        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas, style='TFrame')
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=2, column=1, sticky=(tk.N, tk.S))
-        
-        # Create checkbox and text for each issue
-        issue_vars = []
-        issue_texts = []
+        count_label = ttk.Label(controls_frame, text="", font=('Segoe UI', 10))
+        count_label.grid(row=0, column=3, padx=5)
+        
+        # Issue list (one Treeview row per issue) above a detail pane for the focused issue
+        panes = ttk.PanedWindow(main_frame, orient=tk.VERTICAL)
+        panes.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        list_frame = ttk.Frame(panes, style='TFrame')
+        list_frame.columnconfigure(0, weight=1)
+        list_frame.rowconfigure(0, weight=1)
+        issue_tree = ttk.Treeview(list_frame, columns=('selected', 'type', 'summary'), show='headings',
+                                  selectmode='browse', height=12)
+        issue_tree.heading('selected', text='Post')
+        issue_tree.heading('type', text='Type')
+        issue_tree.heading('summary', text='Summary')
+        issue_tree.column('selected', width=50, stretch=False, anchor=tk.CENTER)
+        issue_tree.column('type', width=80, stretch=False)
+        issue_tree.column('summary', width=900)
+        tree_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=issue_tree.yview)
+        issue_tree.configure(yscrollcommand=tree_scrollbar.set)
+        issue_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        tree_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        panes.add(list_frame, weight=1)
+        
+        detail_frame = ttk.Frame(panes, style='TFrame')
+        detail_frame.columnconfigure(0, weight=1)
+        detail_frame.rowconfigure(0, weight=1)
+        detail_text = tk.Text(detail_frame, wrap=tk.WORD, height=14,
+                              font=('Consolas', 9), bg='white', fg='#2C3E50',
+                              relief='sunken', borderwidth=2, state='disabled')
+        detail_scrollbar = ttk.Scrollbar(detail_frame, orient="vertical", command=detail_text.yview)
+        detail_text.configure(yscrollcommand=detail_scrollbar.set)
+        detail_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        detail_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        panes.add(detail_frame, weight=1)
         
         for idx, issue in enumerate(issues):
-            # Frame for each issue
-            issue_frame = ttk.Frame(scrollable_frame, relief="solid", borderwidth=2, style='TFrame')
-            issue_frame.grid(row=idx, column=0, sticky=(tk.W, tk.E), padx=5, pady=5)
-            issue_frame.columnconfigure(1, weight=1)
-            
-            # Checkbox
-            var = tk.BooleanVar(value=True)
-            issue_vars.append(var)
-            issue_texts.append(issue)
-            
-            checkbox = ttk.Checkbutton(issue_frame, variable=var, style='TCheckbutton')
-            checkbox.grid(row=0, column=0, sticky=tk.N, padx=5, pady=5)
-            
-            # Issue text
-            text_widget = tk.Text(issue_frame, wrap=tk.WORD, height=10, width=100,
-                                 font=('Consolas', 9), bg='white', fg='#2C3E50',
-                                 relief='sunken', borderwidth=2)
-            text_widget.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=5, pady=5)
-            text_widget.insert('1.0', issue)
-            text_widget.config(state='disabled')
+            if issue_drafts:
+                issue_type, summary = issue_drafts[idx].issue_type, issue_drafts[idx].summary
+            else:
+                header = re.match(r'###\s+(?:\d+\.\s+)?\[(STORY|TASK)\]\s+(.+)', issue)
+                issue_type, summary = (header.group(1).title(), header.group(2)) if header \
+                    else ('-', issue.strip().split('\n', 1)[0])
+            issue_tree.insert('', tk.END, iid=str(idx), values=('☑', issue_type, summary[:200]))
+        
+        def show_detail(event=None):
+            focus = issue_tree.focus()
+            detail_text.config(state='normal')
+            detail_text.delete('1.0', tk.END)
+            if focus:
+                detail_text.insert('1.0', issue_texts[int(focus)])
+            detail_text.config(state='disabled')
+        
+        def toggle(idx):
+            issue_selected[idx] = not issue_selected[idx]
+            refresh_rows([idx])
+        
+        def on_click(event):
+            row = issue_tree.identify_row(event.y)
+            if row and issue_tree.identify_column(event.x) == '#1':
+                toggle(int(row))
+        
+        def on_double_click(event):
+            # A click on the Post column already toggled the row
+            row = issue_tree.identify_row(event.y)
+            if row and issue_tree.identify_column(event.x) != '#1':
+                toggle(int(row))
+            return 'break'
+        
+        def on_key_toggle(event):
+            if issue_tree.focus():
+                toggle(int(issue_tree.focus()))
+            return 'break'
+        
+        issue_tree.bind('<<TreeviewSelect>>', show_detail)
+        issue_tree.bind('<Button-1>', on_click, add='+')
+        issue_tree.bind('<space>', on_key_toggle)
+        issue_tree.bind('<Double-1>', on_double_click)
+        
+        if issues:
+            issue_tree.selection_set('0')
+            issue_tree.focus('0')
+        refresh_rows([])
         
         # Button frame
         button_frame = ttk.Frame(main_frame, style='TFrame')
@@ -1793,7 +1087,7 @@ class OutlookWebexExtractorV2:
         
         # Copy selected issues to clipboard
         def copy_selected():
-            selected_issues = [text for var, text in zip(issue_vars, issue_texts) if var.get()]
+            selected_issues = [text for selected, text in zip(issue_selected, issue_texts) if selected]
             if not selected_issues:
                 messagebox.showwarning("No Selection", "Please select at least one issue to copy.")
                 return
@@ -1821,7 +1115,8 @@ class OutlookWebexExtractorV2:
         
         # Post to Jira button
         def post_to_jira():
-            self.post_issues_to_jira(issue_vars, issue_texts, analysis_window)
+            self.post_issues_to_jira(issue_selected, issue_texts, analysis_window,
+                                     meeting_key or meeting_id_for(meeting_title), issue_drafts)
         
         post_jira_button = ttk.Button(button_frame, text="🚀 Post Selected to Jira", 
                                       command=post_to_jira, style='Action.TButton')
@@ -1836,7 +1131,10 @@ class OutlookWebexExtractorV2:
 def main():
     root = tk.Tk()
     app = OutlookWebexExtractorV2(root)
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.pipeline.close()
 
 
 if __name__ == "__main__":
@@ -29,6 +29,30 @@ a = Analysis(
         'outlook_extractor_v2_monitoring',
         'meeting_classifier_v2',
         'meeting_prompts_v2',
+        'analysis_cache_v2',
+        'chunked_analysis_v2',
+        'transcript_v2',
+        'analysis_engine_v2',
+        'chatai_client_v2',
+        'llm_stream_parser_v2',
+        'llm_response_parser_v2',
+        'token_estimator_v2',
+        'transcript_compaction_v2',
+        'llm_dispatch_v2',
+        'llm_backends_v2',
+        'rate_limiter_v2',
+        'jira_client_v2',
+        'delivery_ledger_v2',
+        'jira_metadata_v2',
+        'jira_payloads_v2',
+        'outlook_com_worker_v2',
+        'webex_digest_v2',
+        'log_sink_v2',
+        'credential_store_v2',
+        'meeting_pipeline_v2',
+        'producto_headless',
+        'backfill_v2',
+        'mail_sources_v2',
         'win32com',
         'win32com.client',
         'pywintypes',
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Producto headless runner
+Runs the meeting pipeline as a background service or batch job, without Tk.
+
+Usage:
+    python -m producto run                  # monitor the folder, auto-approve every match
+    python -m producto backfill --since 2025-01-01 [--until ...] [--dry-run]
+    python -m producto analyze FILE [...]   # analyze local .vtt / .txt transcripts
+
+run and backfill read the Outlook folder unless --source names a directory
+of .eml/.msg files or an mbox archive (see mail_sources_v2.py).
+
+Credentials come from the environment or the OS credential store (see
+credential_store_v2.py); everything else from config_v2.json. Outlook
+(pywin32) is only imported when the Outlook folder is used.
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from backfill_v2 import BackfillRunner
+from credential_store_v2 import credential_status, get_credential
+from log_sink_v2 import setup_logging
+from mail_sources_v2 import OutlookMailSource, open_mail_source
+from meeting_pipeline_v2 import COMPLETED, MeetingPipeline
+from outlook_com_worker_v2 import stop_shared_worker
+from outlook_extractor_v2_config import ConfigManager
+
+
+def build_pipeline(args):
+    """ConfigManager, logger and pipeline for one CLI invocation"""
+    config_manager = ConfigManager(config_dir=args.config_dir)
+    config = config_manager.config
+
+    log_file = args.log_file
+    if log_file is None and config.get('log_file_enabled', False):
+        log_file = os.path.join(config_manager.config_dir, 'producto.log')
+    logger = setup_logging(None, log_file=log_file, max_mb=config.get('log_file_max_mb', 5),
+                           backups=config.get('log_file_backups', 3),
+                           stream=None if args.quiet else sys.stderr)
+
+    def credentials(name):
+        value = get_credential(name)
+        if not value and name == 'webex_access_token':
+            value = config_manager.get_oauth_token()  # Cached Service App token
+        return value
+
+    overrides = {}
+    if getattr(args, 'output_dir', None):
+        overrides['output_directory'] = args.output_dir
+    if getattr(args, 'no_analysis', False):
+        overrides['enable_analysis'] = False
+
+    pipeline = MeetingPipeline(config_manager, credentials=credentials, options=lambda: overrides,
+                               log_callback=logger.info)
+    return config_manager, logger, pipeline
+
+
+def make_monitor(config_manager, pipeline, log, folder=None, mail_source=None):
+    """EmailMonitor that auto-approves (the subject pattern is the only filter)"""
+    from outlook_extractor_v2_monitoring import EmailMonitor
+
+    if folder:
+        config_manager.config['monitored_folder'] = folder
+
+    def approve(email_data):
+        return True
+
+    return EmailMonitor(
+        config_manager=config_manager,
+        log_callback=log,
+        approval_callback=approve,
+        process_callback=pipeline.process_email,
+        mail_source=mail_source
+    )
+
+
+def log_credentials(log):
+    missing = [name for name, present in credential_status().items() if not present]
+    if missing:
+        log(f"Credentials not set: {', '.join(missing)}")
+
+
+def cmd_run(args) -> int:
+    config_manager, logger, pipeline = build_pipeline(args)
+    log_credentials(logger.info)
+
+    mail_source = open_mail_source(args.source, log_callback=logger.info) if args.source else None
+    monitor = make_monitor(config_manager, pipeline, logger.info, args.folder, mail_source)
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    if not monitor.start_monitoring():
+        logger.error("✗ Failed to start monitoring")
+        return 1
+    logger.info(f"▶ Started monitoring folder: '{config_manager.config['monitored_folder']}' (headless)")
+
+    try:
+        while not stop.wait(1):
+            if not monitor.monitor_thread.is_alive():
+                logger.error("✗ Monitoring thread exited")
+                return 1
+    finally:
+        monitor.stop_monitoring()
+        pipeline.close()
+        stop_shared_worker()
+        logger.info("⏸ Monitoring stopped")
+    return 0
+
+
+def cmd_backfill(args) -> int:
+    config_manager, logger, pipeline = build_pipeline(args)
+    if not args.dry_run:
+        log_credentials(logger.info)
+
+    runner = BackfillRunner(config_manager, pipeline.process_email, parallelism=args.parallel,
+                            window_days=args.window_days, log_callback=logger.info)
+    signal.signal(signal.SIGTERM, lambda *_: runner.stop())
+
+    end = args.until or datetime.now()
+    start = args.since or end - timedelta(days=30)
+
+    try:
+        if args.source:
+            source = open_mail_source(args.source, log_callback=logger.info)
+            stats = runner.run(source, start, end, subject_pattern=args.pattern, dry_run=args.dry_run,
+                               resume=not args.restart)
+        else:
+            stats = backfill_outlook(args, config_manager, logger, pipeline, runner, start, end)
+            if stats is None:
+                return 1
+    finally:
+        pipeline.close()
+        stop_shared_worker()
+
+    if args.json:
+        json.dump(asdict(stats), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    if stats.interrupted:
+        return 130
+    return 1 if stats.failed else 0
+
+
+def backfill_outlook(args, config_manager, logger, pipeline, runner, start, end):
+    """Backfill the live Outlook folder (COM is initialized on this thread only)"""
+    import pythoncom
+    from outlook_com_worker_v2 import dispatch_outlook
+
+    monitor = make_monitor(config_manager, pipeline, logger.info, args.folder)
+    pythoncom.CoInitialize()
+    try:
+        namespace = dispatch_outlook().GetNamespace("MAPI")
+        folder_name = config_manager.config['monitored_folder']
+        folder = monitor.get_folder(namespace, folder_name)
+        if not folder:
+            logger.error(f"ERROR: Folder '{folder_name}' not found")
+            return None
+        return runner.run(OutlookMailSource(folder, log_callback=logger.info), start, end,
+                          subject_pattern=args.pattern, dry_run=args.dry_run, resume=not args.restart)
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def cmd_analyze(args) -> int:
+    config_manager, logger, pipeline = build_pipeline(args)
+
+    failed = 0
+    results = []
+    try:
+        for path in args.files:
+            result = pipeline.analyze_file(path, meeting_title=args.title, deliver=args.deliver)
+            if result.status != COMPLETED:
+                failed += 1
+                logger.error(f"✗ Analysis failed: {path}")
+                continue
+            logger.info(f"✓ {path} -> {result.analysis_file or '(not saved)'}")
+            results.append({
+                'file': path,
+                'meeting_title': result.subject,
+                'analysis_file': result.analysis_file,
+                'structured_data': result.structured_data,
+            })
+    finally:
+        pipeline.close()
+        stop_shared_worker()
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='producto', description="Producto meeting pipeline (headless)")
+    parser.add_argument('--config-dir', help="Directory holding config_v2.json (default: %%APPDATA%%)")
+    parser.add_argument('--log-file', help="Also write the log to this rotating file")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not log to stderr")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Monitor the Outlook folder and process every matching email")
+    run.add_argument('--folder', help="Folder to monitor (default: monitored_folder from config)")
+    run.add_argument('--source', help="Poll a directory of .eml/.msg files or an mbox file instead of Outlook")
+    run.add_argument('--output-dir', help="Where transcripts and analyses are written")
+    run.add_argument('--no-analysis', action='store_true', help="Download transcripts only")
+    run.set_defaults(handler=cmd_run)
+
+    backfill = commands.add_parser('backfill', help="Process past matching emails in a date range")
+    backfill.add_argument('--since', type=datetime.fromisoformat, help="Start date (default: 30 days ago)")
+    backfill.add_argument('--until', type=datetime.fromisoformat, help="End date, exclusive (default: now)")
+    backfill.add_argument('--folder', help="Folder to scan (default: monitored_folder from config)")
+    backfill.add_argument('--source', help="Read a directory of .eml/.msg files or an mbox file instead of Outlook")
+    backfill.add_argument('--pattern', help="Subject substring (default: email_subject_pattern from config)")
+    backfill.add_argument('--parallel', type=int, help="Emails processed at once (default: backfill_parallelism)")
+    backfill.add_argument('--window-days', type=int, help="Days per Outlook query (default: backfill_window_days)")
+    backfill.add_argument('--dry-run', action='store_true', help="Only report counts and the estimated LLM cost")
+    backfill.add_argument('--restart', action='store_true', help="Ignore the checkpoint of an earlier run")
+    backfill.add_argument('--json', action='store_true', help="Print the final counts as JSON")
+    backfill.add_argument('--output-dir', help="Where transcripts and analyses are written")
+    backfill.add_argument('--no-analysis', action='store_true', help="Download transcripts only")
+    backfill.set_defaults(handler=cmd_backfill)
+
+    analyze = commands.add_parser('analyze', help="Analyze local .vtt or .txt transcripts")
+    analyze.add_argument('files', nargs='+', metavar='FILE')
+    analyze.add_argument('--title', help="Meeting title (default: file name)")
+    analyze.add_argument('--output-dir', help="Where analyses are written (default: output_directory)")
+    analyze.add_argument('--deliver', action='store_true',
+                         help="Also create Outlook tasks / notify the Webex bot per config")
+    analyze.add_argument('--json', action='store_true', help="Print the structured results as JSON")
+    analyze.set_defaults(handler=cmd_analyze)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Adaptive Rate Limiter v2.0
+AIMD concurrency control in front of LLM calls:
+
+- Additive increase: +1 concurrent call after a full window of healthy calls
+- Multiplicative decrease: x0.5 on 429/503 or when latency climbs well above
+  its best observed level; Retry-After pauses new calls for everyone
+- Waiting calls are served by priority (refinement meetings first), then FIFO
+
+stats() exposes live concurrency, queue depth and throttle counts.
+"""
+
+from typing import Dict, Optional
+import heapq
+import itertools
+import threading
+import time
+
+from meeting_prompts_v2 import SYSTEM_PROMPT
+from llm_backends_v2 import LLMBackend, LLMThrottled
+
+# Lower runs first
+MEETING_PRIORITY = {
+    'refinement': 0,
+    'mixed': 1,
+    'general': 2,
+    'unknown': 2,
+}
+DEFAULT_PRIORITY = 2
+
+
+class AdaptiveConcurrencyLimiter:
+    """Thread-safe AIMD limiter with a priority wait queue"""
+
+    def __init__(self, initial_limit=2, min_limit=1, max_limit=8, backoff_factor=0.5,
+                 latency_tolerance=2.0, log_callback=None):
+        """
+        Args:
+            initial_limit: Concurrent calls allowed at start
+            min_limit: Never go below this
+            max_limit: Never go above this
+            backoff_factor: Multiply the limit by this when throttled
+            latency_tolerance: Back off when smoothed latency exceeds the best
+                smoothed latency seen by this factor
+            log_callback: Function to call for logging
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.log = log_callback or print
+
+        self._condition = threading.Condition()
+        self._queue = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._healthy_since_change = 0
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.throttled = 0
+        self.latency_avg: Optional[float] = None
+        self.latency_best: Optional[float] = None
+
+    def acquire(self, priority=DEFAULT_PRIORITY, timeout=None) -> bool:
+        """
+        Wait for a slot.
+
+        Returns:
+            True once the caller may proceed (it must call release()),
+            False if timeout expired first
+        """
+        ticket = (priority, next(self._sequence))
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            while True:
+                now = time.monotonic()
+                if (self._queue[0] == ticket and self.in_flight < int(self.limit)
+                        and now >= self._paused_until):
+                    heapq.heappop(self._queue)
+                    self.in_flight += 1
+                    self._condition.notify_all()
+                    return True
+
+                waits = []
+                if self._paused_until > now:
+                    waits.append(self._paused_until - now)
+                if deadline is not None:
+                    if now >= deadline:
+                        self._queue.remove(ticket)
+                        heapq.heapify(self._queue)
+                        self._condition.notify_all()
+                        return False
+                    waits.append(deadline - now)
+                self._condition.wait(timeout=min(waits) if waits else None)
+
+    def release(self, outcome='ok', latency=None, retry_after=None) -> None:
+        """
+        Return a slot and feed the result into the controller.
+
+        Args:
+            outcome: 'ok', 'throttled' (429/503) or 'error' (other failure)
+            latency: Seconds the call took
+            retry_after: Seconds the endpoint asked us to wait (throttled only)
+        """
+        with self._condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
+
+            if outcome == 'throttled':
+                self.throttled += 1
+                pause = retry_after if retry_after is not None else 1.0
+                self._paused_until = max(self._paused_until, now + pause)
+                self._decrease(now, "throttled")
+            elif outcome == 'ok':
+                self.completed += 1
+                self._observe_latency(latency)
+                if (self.latency_best and self.latency_avg
+                        and self.latency_avg > self.latency_best * self.latency_tolerance):
+                    self._decrease(now, "latency rising")
+                else:
+                    self._healthy_since_change += 1
+                    if self._healthy_since_change >= int(self.limit) and self.limit < self.max_limit:
+                        self.limit += 1
+                        self._healthy_since_change = 0
+            else:
+                self.failed += 1
+
+            self._condition.notify_all()
+
+    def stats(self) -> Dict:
+        """Live view of the limiter"""
+        with self._condition:
+            return {
+                'limit': int(self.limit),
+                'in_flight': self.in_flight,
+                'queue_depth': len(self._queue),
+                'completed': self.completed,
+                'failed': self.failed,
+                'throttled': self.throttled,
+                'latency_avg': round(self.latency_avg, 3) if self.latency_avg else None,
+                'paused_for': round(max(0.0, self._paused_until - time.monotonic()), 1),
+            }
+
+    # --- Internals -----------------------------------------------------------
+
+    def _observe_latency(self, latency):
+        if latency is None:
+            return
+        if self.latency_avg is None:
+            self.latency_avg = latency
+        else:
+            self.latency_avg = 0.8 * self.latency_avg + 0.2 * latency
+        if self.latency_best is None or self.latency_avg < self.latency_best:
+            self.latency_best = self.latency_avg
+
+    def _decrease(self, now, reason):
+        # Calls already in flight when we backed off report the same
+        # congestion; only back off once per round trip
+        if now - self._last_decrease < max(1.0, self.latency_avg or 0.0):
+            return
+        old = int(self.limit)
+        self.limit = max(float(self.min_limit), self.limit * self.backoff_factor)
+        self._healthy_since_change = 0
+        self._last_decrease = now
+        if reason == "latency rising":
+            # Re-learn the baseline at the new concurrency
+            self.latency_best = self.latency_avg
+        if int(self.limit) != old:
+            self.log(f"  🚦 LLM concurrency {old} → {int(self.limit)} ({reason})")
+
+
+class RateLimitedBackend(LLMBackend):
+    """Runs another backend's calls through an AdaptiveConcurrencyLimiter, retrying throttled calls"""
+
+    def __init__(self, inner, limiter, max_retries=3, log_callback=None):
+        """
+        Args:
+            inner: Backend to call
+            limiter: AdaptiveConcurrencyLimiter (may be shared between backends)
+            max_retries: Retries for a throttled call before giving up
+            log_callback: Function to call for logging
+        """
+        super().__init__(log_callback)
+        self.inner = inner
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.name = inner.name
+
+    def for_priority(self, priority):
+        """Same backend, queued at the given priority"""
+        return _PriorityView(self, priority)
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT, priority=DEFAULT_PRIORITY):
+        return self._call(priority, self.inner.complete, user_prompt, system_prompt)
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT,
+                        priority=DEFAULT_PRIORITY):
+        return self._call(priority, self.inner.stream_complete, user_prompt, on_item, system_prompt)
+
+    def _call(self, priority, method, *args):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(priority)
+            started = time.monotonic()
+            try:
+                result = method(*args)
+            except LLMThrottled as e:
+                self.limiter.release('throttled', retry_after=e.retry_after or min(2 ** attempt, 30))
+                if attempt < self.max_retries:
+                    self.log(f"  ⏳ {self.name} throttled ({e.status}) - retry {attempt + 1}/{self.max_retries}")
+                continue
+            except Exception:
+                self.limiter.release('error')
+                raise
+            self.limiter.release('ok' if result is not None else 'error',
+                                 latency=time.monotonic() - started)
+            return result
+
+        self.log(f"  ✗ {self.name} still throttled after {self.max_retries} retries")
+        return None
+
+
+class _PriorityView:
+    def __init__(self, backend, priority):
+        self.backend = backend
+        self.priority = priority
+        self.name = backend.name
+
+    def complete(self, user_prompt, system_prompt=SYSTEM_PROMPT):
+        return self.backend.complete(user_prompt, system_prompt, priority=self.priority)
+
+    def stream_complete(self, user_prompt, on_item=None, system_prompt=SYSTEM_PROMPT):
+        return self.backend.stream_complete(user_prompt, on_item, system_prompt, priority=self.priority)
@@ -0,0 +1,75 @@
+import json
+import threading
+from datetime import datetime
+
+from delivery_ledger_v2 import JIRA, OUTLOOK_TASK, DeliveryLedger, meeting_id_for, normalize_title
+
+
+def test_normalize_title():
+    assert normalize_title("  Send the  Timeline!! ") == "send the timeline"
+    assert normalize_title(None) == ""
+
+
+def test_meeting_id_includes_the_day():
+    assert meeting_id_for("Weekly  sync", datetime(2025, 6, 2, 9, 30)) == "Weekly sync@2025-06-02"
+    assert meeting_id_for("Weekly sync", "2025-06-09 10:00") == "Weekly sync@2025-06-09"
+    assert meeting_id_for("Weekly sync") == "Weekly sync"
+
+
+def test_lookup_matches_normalized_title_per_target(tmp_path):
+    ledger = DeliveryLedger(str(tmp_path / 'ledger.json'), log_callback=lambda m: None)
+    ledger.record(JIRA, "m@2025-06-02", "STORY", "Filter by region", "PROJ-1")
+
+    record = ledger.lookup(JIRA, "m@2025-06-02", "story", "filter by Region.")
+    assert record.external_id == "PROJ-1"
+    assert ledger.lookup(OUTLOOK_TASK, "m@2025-06-02", "STORY", "Filter by region") is None
+    assert ledger.lookup(JIRA, "m@2025-06-09", "STORY", "Filter by region") is None
+    assert ledger.lookup(JIRA, "m@2025-06-02", "TASK", "Filter by region") is None
+
+
+def test_record_refresh_keeps_created_at(tmp_path):
+    ledger = DeliveryLedger(str(tmp_path / 'ledger.json'), log_callback=lambda m: None)
+    first = ledger.record(JIRA, "m", "STORY", "A", "PROJ-1")
+    second = ledger.record(JIRA, "m", "STORY", "A", "PROJ-2")
+    assert second.created_at == first.created_at
+    assert ledger.lookup(JIRA, "m", "STORY", "A").external_id == "PROJ-2"
+    assert len(ledger) == 1
+
+
+def test_persisted_and_reloaded(tmp_path):
+    path = str(tmp_path / 'nested' / 'ledger.json')
+    DeliveryLedger(path, log_callback=lambda m: None).record(OUTLOOK_TASK, "m", "action", "Call Raj", "ENTRY1")
+    reloaded = DeliveryLedger(path, log_callback=lambda m: None)
+    assert reloaded.lookup(OUTLOOK_TASK, "m", "action", "call raj").external_id == "ENTRY1"
+    assert not (tmp_path / 'nested' / 'ledger.json.tmp').exists()
+
+
+def test_forget(tmp_path):
+    ledger = DeliveryLedger(str(tmp_path / 'ledger.json'), log_callback=lambda m: None)
+    ledger.record(JIRA, "m", "STORY", "A", "PROJ-1")
+    assert ledger.forget(JIRA, "m", "STORY", "a")
+    assert not ledger.forget(JIRA, "m", "STORY", "a")
+    assert len(ledger) == 0
+
+
+def test_corrupt_file_starts_empty(tmp_path):
+    path = tmp_path / 'ledger.json'
+    path.write_text("{not json", encoding='utf-8')
+    messages = []
+    ledger = DeliveryLedger(str(path), log_callback=messages.append)
+    assert len(ledger) == 0
+    assert messages
+
+
+def test_concurrent_records(tmp_path):
+    path = str(tmp_path / 'ledger.json')
+    ledger = DeliveryLedger(path, log_callback=lambda m: None)
+    threads = [threading.Thread(target=ledger.record, args=(JIRA, "m", "TASK", f"Item {i}", f"P-{i}"))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(ledger) == 20
+    with open(path, encoding='utf-8') as f:
+        assert len(json.load(f)) == 20
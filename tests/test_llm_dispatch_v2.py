@@ -0,0 +1,108 @@
+import json
+import re
+import threading
+
+from llm_dispatch_v2 import BatchingDispatcher, split_batch_response
+
+KEYS = ['m1', 'm2', 'm3']
+BATCH = {key: {'actions': [{'title': f"{key} action"}]} for key in KEYS}
+
+
+def test_clean_fenced_response():
+    text = f"Sure!\n```json\n{json.dumps(BATCH, indent=2)}\n```"
+    outputs = split_batch_response(text, KEYS)
+    assert sorted(outputs) == KEYS
+    assert json.loads(outputs['m2']) == BATCH['m2']
+
+
+def test_trailing_commas():
+    text = '{"m1": {"actions": [{"title": "a",},]}, "m2": {"actions": []},}'
+    assert json.loads(split_batch_response(text, ['m1', 'm2'])['m1']) == {'actions': [{'title': 'a'}]}
+
+
+def test_cut_off_meeting_is_left_out():
+    text = json.dumps(BATCH)
+    cut = text[:text.index('m3 action')]
+    assert sorted(split_batch_response(cut, KEYS)) == ['m1', 'm2']
+
+
+def test_cut_off_inside_first_meeting_keeps_nothing():
+    text = json.dumps(BATCH)
+    assert split_batch_response(text[:text.index('m1 action') + 3], KEYS) == {}
+
+
+def test_malformed_meeting_is_left_out_and_others_kept():
+    text = ('{"m1": {"actions": [{"title": "a"}]}, "m2": {"actions": [{"title": "b" "owner": 1}]}, '
+            '"m3": {"actions": []}}')
+    assert sorted(split_batch_response(text, KEYS)) == ['m1', 'm3']
+
+
+def test_unknown_and_non_object_members_are_ignored():
+    text = '{"m1": [], "m2": "text", "m9": {}, "m3": {"stories": []}}'
+    assert sorted(split_batch_response(text, KEYS)) == ['m3']
+    assert split_batch_response(None, KEYS) == {}
+    assert split_batch_response("no json", KEYS) == {}
+
+
+class FakeClient:
+    """Answers batch prompts with one object per meeting, except those in drop"""
+
+    def __init__(self, drop=()):
+        self.drop = set(drop)
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def complete(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+        meetings = re.findall(r'=== MEETING (\w+) ===\n(.*?)\n=== END MEETING', prompt, re.S)
+        if not meetings:
+            return json.dumps({'actions': [{'title': prompt}]})
+        return json.dumps({key: {'actions': [{'title': text}]} for key, text in meetings
+                           if text not in self.drop})
+
+
+def run_concurrently(dispatcher, prompts):
+    results = [None] * len(prompts)
+
+    def run(index):
+        results[index] = dispatcher.complete(prompts[index])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(prompts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return [json.loads(result)['actions'][0]['title'] for result in results]
+
+
+def test_concurrent_requests_share_one_call():
+    client = FakeClient()
+    dispatcher = BatchingDispatcher(client, max_batch_size=3, max_wait_ms=2000, log_callback=lambda m: None)
+    try:
+        assert run_concurrently(dispatcher, ['one', 'two', 'three']) == ['one', 'two', 'three']
+    finally:
+        dispatcher.close()
+    assert len(client.prompts) == 1
+    assert dispatcher.meetings_batched == 3
+
+
+def test_meeting_missing_from_batch_is_retried_alone():
+    client = FakeClient(drop={'two'})
+    dispatcher = BatchingDispatcher(client, max_batch_size=3, max_wait_ms=2000, log_callback=lambda m: None)
+    try:
+        assert run_concurrently(dispatcher, ['one', 'two', 'three']) == ['one', 'two', 'three']
+    finally:
+        dispatcher.close()
+    assert client.prompts[-1] == 'two'
+    assert dispatcher.single_requests == 1
+
+
+def test_large_requests_and_closed_dispatcher_go_alone():
+    client = FakeClient()
+    dispatcher = BatchingDispatcher(client, max_request_tokens=5, log_callback=lambda m: None)
+    assert dispatcher.complete('a prompt that is well over five tokens long') is not None
+    dispatcher.close()
+    assert dispatcher.complete('short') is not None
+    assert dispatcher.single_requests == 2
+    assert dispatcher.batches_sent == 0
@@ -0,0 +1,106 @@
+import json
+
+from llm_response_parser_v2 import (REVIEW_LABEL, close_truncated, find_json_span, parse_llm_response,
+                                    strip_trailing_commas)
+
+ANALYSIS = {
+    'meeting_type': 'mixed',
+    'stories': [{'summary': 'Filter dashboard by region', 'description': 'As a user...',
+                 'acceptance_criteria': ['Region picker'], 'estimate_points': 3}],
+    'actions': [{'title': 'Send revised timeline', 'owner': 'Mei'},
+                {'title': 'Own the rollback plan', 'owner': 'Raj'}],
+}
+
+
+def titles(result):
+    return [action['title'] for action in result.data['actions']]
+
+
+def test_clean_json_parses_without_flags():
+    result = parse_llm_response(json.dumps(ANALYSIS), 'mixed')
+    assert result.ok and result.clean
+    assert titles(result) == ['Send revised timeline', 'Own the rollback plan']
+    assert result.data['stories'][0]['labels'][0] == REVIEW_LABEL
+
+
+def test_fenced_json_with_prose_around_it():
+    text = f"Here is the analysis {{as requested}}.\n\n```json\n{json.dumps(ANALYSIS, indent=2)}\n```\nThanks!"
+    assert find_json_span(text)[0] == text.index('{\n')
+    result = parse_llm_response(text, 'mixed')
+    assert result.clean
+    assert len(result.data['stories']) == 1
+
+
+def test_trailing_commas_are_repaired():
+    text = '{"actions": [{"title": "A", "owner": "Jane",}, {"title": "B",},], "stories": [],}'
+    assert json.loads(strip_trailing_commas(text))['actions'][1] == {'title': 'B'}
+    result = parse_llm_response(text, 'general')
+    assert result.repaired and not result.truncated and not result.salvaged
+    assert titles(result) == ['A', 'B']
+
+
+def test_commas_inside_strings_are_kept():
+    assert strip_trailing_commas('{"title": "a ,]", "x": [1,]}') == '{"title": "a ,]", "x": [1]}'
+
+
+def test_truncated_document_keeps_complete_items():
+    text = json.dumps(ANALYSIS)
+    cut = text[:text.index('Own the rollback') + 5]
+    assert find_json_span(cut) == (0, len(cut))
+    result = parse_llm_response(cut, 'mixed')
+    assert result.truncated and not result.clean
+    assert titles(result) == ['Send revised timeline']
+    assert len(result.data['stories']) == 1
+
+
+def test_close_truncated_drops_partial_element():
+    closed = close_truncated('{"actions": [{"title": "A"}, {"title": "B')
+    assert closed['actions'][0] == {'title': 'A'}
+    assert all(not action.get('title', '').startswith('B') for action in closed['actions'])
+    assert close_truncated('no json here') is None
+
+
+def test_complete_but_malformed_document_is_salvaged_not_closed():
+    # Missing comma between two actions: closing structures would lose items
+    text = ('{"actions": [{"title": "A", "owner": "x"} {"title": "B", "owner": "y"}, '
+            '{"title": "C", "owner": "z"}], "stories": []}')
+    result = parse_llm_response(text, 'general')
+    assert result.salvaged and not result.truncated
+    assert titles(result) == ['A', 'B', 'C']
+
+
+def test_top_level_array_of_actions():
+    text = '```json\n[{"title": "A", "owner": "Jane"}, {"title": "B"}]\n```'
+    result = parse_llm_response(text, 'general')
+    assert result.clean
+    assert titles(result) == ['A', 'B']
+
+
+def test_top_level_array_of_stories():
+    result = parse_llm_response('[{"summary": "S1"}]', 'refinement')
+    assert result.data['stories'][0]['summary'] == 'S1'
+
+
+def test_invalid_items_are_dropped_and_counted():
+    text = '{"actions": [{"title": "A"}, {"owner": "nobody"}, "junk"]}'
+    result = parse_llm_response(text, 'general')
+    assert titles(result) == ['A']
+    assert result.dropped_items == 2
+
+
+def test_fields_are_coerced():
+    text = '{"stories": [{"summary": "S", "estimate_points": "5 points", "acceptance_criteria": "One"}]}'
+    story = parse_llm_response(text, 'refinement').data['stories'][0]
+    assert story['estimate_points'] == 5
+    assert story['acceptance_criteria'] == ['One']
+
+
+def test_no_json_at_all():
+    result = parse_llm_response("Sorry, I can't help with that.", 'general')
+    assert result.data is None
+    assert result.errors == ["No JSON found in response"]
+
+
+def test_expected_collections_are_filled_in():
+    result = parse_llm_response('{"actions": []}', 'mixed')
+    assert result.data['stories'] == []
@@ -0,0 +1,74 @@
+import json
+
+from llm_stream_parser_v2 import IncrementalItemParser, iter_completion_deltas, iter_sse_data, stream_items
+
+DOCUMENT = json.dumps({
+    'meeting_type': 'mixed',
+    'notes': {'actions': [{'title': 'not an item'}]},
+    'stories': [{'summary': 'S1', 'acceptance_criteria': ['a {b}', 'c]"d']}],
+    'actions': [{'title': 'A1', 'owner': {'name': 'Jane'}}, {'title': 'A2 \\"quoted\\" }'}],
+}, indent=2)
+
+
+def feed_all(chunks):
+    parser = IncrementalItemParser()
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+
+def test_items_in_document_order():
+    items = feed_all([DOCUMENT])
+    assert [(collection, item.get('summary') or item.get('title')) for collection, item in items] == [
+        ('stories', 'S1'), ('actions', 'A1'), ('actions', 'A2 \\"quoted\\" }')]
+    assert items[0][1]['acceptance_criteria'] == ['a {b}', 'c]"d']
+
+
+def test_character_by_character_gives_same_items():
+    assert feed_all(list(DOCUMENT)) == feed_all([DOCUMENT])
+
+
+def test_item_is_emitted_when_its_brace_arrives():
+    parser = IncrementalItemParser()
+    text = '```json\n{"actions": [{"title": "A1"}, {"title": "A2"'
+    cut = text.index('}') + 1
+    assert parser.feed(text[:cut - 1]) == []
+    assert parser.feed(text[cut - 1:cut]) == [('actions', {'title': 'A1'})]
+    assert parser.feed(text[cut:]) == []  # A2 never closed
+
+
+def test_nested_arrays_under_other_keys_are_ignored():
+    assert feed_all(['{"notes": {"stories": [{"summary": "x"}]}, "stories": []}']) == []
+
+
+def test_malformed_item_is_skipped_and_later_items_still_arrive():
+    items = feed_all(['{"actions": [{"title": "A" "owner": 1}, {"title": "B"}]}'])
+    assert items == [('actions', {'title': 'B'})]
+
+
+def test_text_after_the_document_is_ignored():
+    assert feed_all(['{"actions": []} {"actions": [{"title": "late"}]}']) == []
+
+
+def test_stream_items_returns_full_text():
+    seen = []
+    text = stream_items([DOCUMENT[:40], DOCUMENT[40:]], lambda collection, item: seen.append(collection))
+    assert text == DOCUMENT
+    assert seen == ['stories', 'actions', 'actions']
+
+
+def test_sse_deltas():
+    lines = [
+        b'data: {"choices": [{"delta": {"content": "{\\"act"}}]}', b'',
+        ': keep-alive', '',
+        'data: {"choices": [{"delta": {}}]}', '',
+        'data: {"choices": [{"delta": {"content": "ions\\": []}"}}]}', '',
+        'data: [DONE]', '',
+        'data: {"choices": [{"delta": {"content": "ignored"}}]}', '',
+    ]
+    assert ''.join(iter_completion_deltas(lines)) == '{"actions": []}'
+
+
+def test_sse_multiline_event_without_trailing_blank():
+    assert list(iter_sse_data(['data: a', 'data: b'])) == ['a\nb']
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from meeting_classifier_v2 import IncrementalMeetingClassifier, classify_meeting
+
+TRANSCRIPT = (
+    "Jane: Let's look at the acceptance criteria for the export story. "
+    "Raj: I'd put five story points on it, the epic is big. "
+    "Mei: Action item for me, I'll follow up with security. Next steps? "
+    "Carlos: Can you send the deadline to the owner? "
+    "Anna: Definition of done includes load tests. sp sp sp "
+    "Tom: Please share the due date, and ping me. Owner is Raj. "
+)
+
+
+def fed(title, chunks):
+    classifier = IncrementalMeetingClassifier(title)
+    for chunk in chunks:
+        classifier.feed(chunk)
+    return classifier.classification()
+
+
+def test_single_chunk_matches_classify_meeting():
+    assert fed("Sprint 12 Refinement", [TRANSCRIPT]) == classify_meeting("Sprint 12 Refinement", TRANSCRIPT)
+
+
+@pytest.mark.parametrize('phrase', ["acceptance criteria", "story points", "follow up", "owner", "sp "])
+def test_phrase_split_at_every_boundary_is_counted_once(phrase):
+    text = f"We discussed the {phrase} today."
+    expected = classify_meeting("Weekly sync", text)
+    for split in range(1, len(text)):
+        assert fed("Weekly sync", [text[:split], text[split:]]) == expected, split
+
+
+def test_overlapping_matches_are_not_double_counted_across_chunks():
+    # "story points" contains "story point"; "sp sp sp" has three matches of "sp "
+    text = "story points sp sp sp "
+    expected = classify_meeting("", text)
+    for split in range(1, len(text)):
+        assert fed("", [text[:split], text[split:]]) == expected
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_chunking_matches_classify_meeting(seed):
+    rng = random.Random(seed)
+    chunks, position = [], 0
+    while position < len(TRANSCRIPT):
+        size = rng.randint(1, 25)
+        chunks.append(TRANSCRIPT[position:position + size])
+        position += size
+    assert fed("Backlog grooming", chunks) == classify_meeting("Backlog grooming", TRANSCRIPT)
+
+
+def test_tiny_chunks_and_empty_chunks():
+    chunks = [ch for ch in TRANSCRIPT] + ["", ""]
+    assert fed("", chunks) == classify_meeting("", TRANSCRIPT)
+
+
+def test_provisional_type_and_confidence():
+    classifier = IncrementalMeetingClassifier("Weekly sync")
+    assert not classifier.is_confident()
+    classifier.feed("Action item: follow up on next steps. Please send the deadline to the owner. ")
+    assert classifier.provisional_meeting_type == "general"
+    assert classifier.is_confident()
+    assert classifier.chunks_seen == 1
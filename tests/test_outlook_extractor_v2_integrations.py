@@ -0,0 +1,73 @@
+from outlook_extractor_v2_integrations import WebexBotIntegration, split_markdown_messages
+
+HEADER = "📹 **Meeting Processed:** Sync\n\n"
+
+
+def size(text):
+    return len(text.encode('utf-8'))
+
+
+def test_short_summary_is_one_unnumbered_message():
+    messages = split_markdown_messages(HEADER, ["- a\n", "- b\n"], footer="_end_\n")
+    assert messages == [HEADER + "- a\n- b\n_end_\n"]
+
+
+def test_blocks_are_packed_without_splitting_and_parts_numbered():
+    blocks = [f"### Item {i}\n" + "détail " * 40 + "\n\n" for i in range(12)]
+    messages = split_markdown_messages(HEADER, blocks, footer="_end_\n", limit=1200)
+    assert len(messages) > 1
+    assert all(size(message) <= 1200 for message in messages)
+    assert all(f"_(part {n}/{len(messages)})_" in message for n, message in enumerate(messages, 1))
+    assert all(message.startswith("📹 **Meeting Processed:** Sync") for message in messages)
+    body = "".join(message.split("\n\n", 1)[1] for message in messages)
+    assert body == "".join(blocks) + "_end_\n"
+    assert messages[-1].endswith("_end_\n")
+
+
+def test_oversized_block_is_cut_at_a_line():
+    block = "".join(f"line {i} " + "x" * 50 + "\n" for i in range(100))
+    messages = split_markdown_messages(HEADER, [block], limit=1000)
+    assert len(messages) == 1
+    assert size(messages[0]) <= 1000
+    assert messages[0].endswith("\n")
+
+
+def test_no_blocks_still_sends_the_header():
+    assert split_markdown_messages(HEADER, []) == [HEADER]
+
+
+class RecordingBot(WebexBotIntegration):
+    """Bot whose _post records messages and fails on the given call numbers"""
+
+    def __init__(self, fail_on=()):
+        super().__init__('token', log_callback=lambda m: None, min_interval=0)
+        self.fail_on = set(fail_on)
+        self.calls = 0
+        self.sent = []
+
+    def _post(self, data, files=None):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            return False
+        self.sent.append(data['markdown'])
+        return True
+
+
+def digest_meetings():
+    actions = [{'title': f"Action {i} " + "x" * 400, 'owner': 'Jane'} for i in range(40)]
+    return [{'meeting_title': 'Sync', 'actions': actions, 'stories': [], 'processed_at': '2025-06-02 10:00'}]
+
+
+def test_digest_resumes_at_first_undelivered_message():
+    progress = []
+    first = RecordingBot(fail_on={3})
+    assert not first.send_digest('a@b.c', digest_meetings(), sent_at='2025-06-02 10:30', on_part=progress.append)
+    assert progress == [1, 2]
+
+    second = RecordingBot()
+    assert second.send_digest('a@b.c', digest_meetings(), sent_at='2025-06-02 10:30', start_part=progress[-1],
+                              on_part=progress.append)
+    everything = RecordingBot()
+    assert everything.send_digest('a@b.c', digest_meetings(), sent_at='2025-06-02 10:30')
+    assert first.sent + second.sent == everything.sent
+    assert progress[-1] == len(everything.sent)
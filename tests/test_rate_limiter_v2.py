@@ -0,0 +1,124 @@
+import threading
+import time
+
+from llm_backends_v2 import LLMBackend, LLMThrottled
+from rate_limiter_v2 import AdaptiveConcurrencyLimiter, RateLimitedBackend
+
+
+def limiter(**kwargs):
+    return AdaptiveConcurrencyLimiter(log_callback=lambda m: None, **kwargs)
+
+
+def run_ok(limiter_, count, latency=0.1):
+    for _ in range(count):
+        assert limiter_.acquire(timeout=1)
+        limiter_.release('ok', latency=latency)
+
+
+def test_additive_increase_after_a_full_window():
+    lim = limiter(initial_limit=2, max_limit=4)
+    run_ok(lim, 1)
+    assert lim.stats()['limit'] == 2
+    run_ok(lim, 1)
+    assert lim.stats()['limit'] == 3
+    run_ok(lim, 3)
+    assert lim.stats()['limit'] == 4
+    run_ok(lim, 20)
+    assert lim.stats()['limit'] == 4
+
+
+def test_multiplicative_decrease_on_throttle_once_per_round_trip():
+    lim = limiter(initial_limit=8, max_limit=8)
+    for _ in range(3):
+        assert lim.acquire(timeout=1)
+    lim.release('throttled', retry_after=0)
+    lim.release('throttled', retry_after=0)  # Same congestion event
+    assert lim.stats()['limit'] == 4
+    assert lim.stats()['throttled'] == 2
+    lim.release('error')
+    assert lim.stats()['failed'] == 1
+    assert lim.stats()['in_flight'] == 0
+
+
+def test_never_below_min_limit():
+    lim = limiter(initial_limit=1, min_limit=1)
+    lim._last_decrease = -10
+    assert lim.acquire(timeout=1)
+    lim.release('throttled', retry_after=0)
+    assert lim.stats()['limit'] == 1
+
+
+def test_rising_latency_backs_off():
+    lim = limiter(initial_limit=4, max_limit=4)
+    run_ok(lim, 4, latency=0.1)
+    limits = []
+    for _ in range(5):
+        run_ok(lim, 1, latency=1.0)
+        limits.append(lim.stats()['limit'])
+    assert limits[0] == 2  # smoothed latency 0.28s > 2 x 0.1s best
+    assert min(limits) == 2  # one back-off per round trip, then a new baseline
+
+
+def test_retry_after_pauses_new_calls():
+    lim = limiter(initial_limit=2)
+    assert lim.acquire(timeout=1)
+    lim.release('throttled', retry_after=0.3)
+    assert not lim.acquire(timeout=0.1)
+    started = time.monotonic()
+    assert lim.acquire(timeout=2)
+    assert time.monotonic() - started >= 0.1
+
+
+def test_slots_and_priority_order():
+    lim = limiter(initial_limit=1, max_limit=1)
+    assert lim.acquire()
+    order = []
+
+    def wait(priority, name):
+        assert lim.acquire(priority=priority, timeout=5)
+        order.append(name)
+        lim.release('ok', latency=0.01)
+
+    threads = [threading.Thread(target=wait, args=(2, 'general'))]
+    threads[0].start()
+    time.sleep(0.05)
+    threads.append(threading.Thread(target=wait, args=(0, 'refinement')))
+    threads[1].start()
+    time.sleep(0.05)
+    assert lim.stats()['queue_depth'] == 2
+    assert lim.stats()['in_flight'] == 1
+
+    lim.release('ok', latency=0.01)
+    for thread in threads:
+        thread.join(5)
+    assert order == ['refinement', 'general']
+
+
+class FlakyBackend(LLMBackend):
+    name = "Flaky"
+
+    def __init__(self, throttles):
+        super().__init__(lambda m: None)
+        self.throttles = throttles
+        self.calls = 0
+
+    def complete(self, user_prompt, system_prompt=None):
+        self.calls += 1
+        if self.calls <= self.throttles:
+            raise LLMThrottled(429, retry_after=0.01)
+        return "ok"
+
+
+def test_backend_retries_throttled_calls():
+    backend = FlakyBackend(throttles=2)
+    lim = limiter()
+    assert RateLimitedBackend(backend, lim, max_retries=3, log_callback=lambda m: None).complete("p") == "ok"
+    assert backend.calls == 3
+    assert lim.stats()['in_flight'] == 0
+
+
+def test_backend_gives_up_after_max_retries():
+    backend = FlakyBackend(throttles=10)
+    wrapped = RateLimitedBackend(backend, limiter(), max_retries=1, log_callback=lambda m: None)
+    assert wrapped.for_priority(0).complete("p") is None
+    assert backend.calls == 2
@@ -0,0 +1,77 @@
+from transcript_compaction_v2 import clean_text, compact_cues, compact_transcript, enforce_budget, strip_timing
+from transcript_v2 import TranscriptCue
+
+
+def texts(cues):
+    return [cue.text for cue in cues]
+
+
+def test_strip_timing_keeps_spoken_times():
+    text = "00:00:01.000 --> 00:00:04.000 align:start\n[01:02] Let's meet at 10:30 tomorrow"
+    assert strip_timing(text).strip() == "Let's meet at 10:30 tomorrow"
+
+
+def test_clean_text_removes_noise_and_disfluencies():
+    assert clean_text("Um, so the the plan is [Music] <c.yellow>ready</c>") == "So the plan is ready"
+    assert clean_text("Uh-huh.") == ""
+
+
+def test_clean_text_keeps_meaningful_repeats():
+    assert clean_text("We had had enough") == "We had had enough"
+    assert clean_text("Ticket 3 3 is open") == "Ticket 3 3 is open"
+    assert clean_text("What it is is a bug") == "What it is is a bug"
+    assert clean_text("no no no") == "no"
+
+
+def test_exact_repeat_from_known_speaker_is_dropped():
+    cues = [TranscriptCue("Ship it Friday", speaker="Jane"), TranscriptCue("Ship it Friday", speaker="Jane")]
+    assert texts(compact_cues(cues)) == ["Jane: Ship it Friday"]
+
+
+def test_short_replies_from_unlabelled_speakers_are_kept():
+    cues = [TranscriptCue("Okay."), TranscriptCue("Okay."), TranscriptCue("Yes.")]
+    assert texts(compact_cues(cues)) == ["Okay.", "Okay.", "Yes."]
+
+
+def test_line_ending_the_previous_one_is_kept():
+    cues = [TranscriptCue("We ship it next week", speaker="Jane"), TranscriptCue("next week", speaker="Jane")]
+    assert texts(compact_cues(cues)) == ["Jane: We ship it next week next week"]
+
+
+def test_rolling_caption_is_folded():
+    cues = [TranscriptCue("so the plan", speaker="Raj"), TranscriptCue("so the plan is to ship", speaker="Raj"),
+            TranscriptCue("Sounds good", speaker="Mei")]
+    result = compact_transcript(cues)
+    assert texts(result.cues) == ["Raj: so the plan is to ship", "Mei: Sounds good"]
+    assert result.duplicates_removed == 1
+
+
+def test_same_speaker_turns_merge_and_speaker_prefix_is_read_from_text():
+    cues = [TranscriptCue("Jane: First point."), TranscriptCue("Jane: Second point."),
+            TranscriptCue("Raj: Reply.")]
+    result = compact_transcript(cues)
+    assert texts(result.cues) == ["Jane: First point. Second point.", "Raj: Reply."]
+    assert result.turns_merged == 1
+
+
+def test_merge_respects_turn_token_limit():
+    words = " ".join(f"word{n}" for n in range(40))
+    cues = [TranscriptCue(f"{words} part {i}", speaker="Jane") for i in range(3)]
+    assert len(compact_cues(cues)) == 1
+    assert len(compact_cues(cues, max_turn_tokens=200)) == 2
+    assert len(compact_cues(cues, merge_turns=False)) == 3
+
+
+def test_budget_drops_low_signal_cues_and_keeps_order():
+    cues = [TranscriptCue("A: Sounds good."), TranscriptCue("B: The acceptance criteria need a deadline."),
+            TranscriptCue("C: Right, right, okay then everyone.")]
+    kept = enforce_budget(cues, target_tokens=14)
+    assert texts(kept) == ["B: The acceptance criteria need a deadline."]
+    assert enforce_budget(cues, target_tokens=0) == cues
+
+
+def test_result_reports_savings():
+    cues = [TranscriptCue("Um, uh, the the thing [inaudible]", speaker="Jane")] * 4
+    result = compact_transcript(cues)
+    assert result.compacted_tokens < result.original_tokens
+    assert 0 < result.saved_ratio < 1
@@ -0,0 +1,64 @@
+"""
+Token Estimator v2.0
+Offline token count estimates for prompt budgeting (no tokenizer download,
+no network). Counts word pieces and punctuation the way BPE/SentencePiece
+tokenizers roughly do, tuned per model family.
+"""
+
+from typing import Optional
+import re
+
+# Characters per sub-word token once a word is longer than a single token
+MODEL_CHARS_PER_TOKEN = {
+    'gemini': 4.2,
+    'gpt': 4.0,
+    'claude': 3.6,
+    'llama': 3.8,
+    'mistral': 3.8,
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# Words up to this length are almost always a single token
+_SINGLE_TOKEN_WORD = 7
+
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+def chars_per_token(model: Optional[str] = None) -> float:
+    """Sub-word ratio for a model name (e.g. 'gemini-2.5-flash', 'gpt-4o')"""
+    name = (model or "").lower()
+    for family, ratio in MODEL_CHARS_PER_TOKEN.items():
+        if family in name:
+            return ratio
+    return DEFAULT_CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Estimate the number of tokens text will use.
+
+    - Short words are one token, longer ones one token per chars_per_token
+    - Every punctuation mark / symbol is its own token
+    - Numbers cost one token per three digits
+
+    Args:
+        text: Text to measure
+        model: Configured model name (selects the sub-word ratio)
+
+    Returns:
+        Estimated token count (at least 1)
+    """
+    if not text:
+        return 1
+
+    ratio = chars_per_token(model)
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        length = len(piece)
+        if piece[0].isdigit():
+            tokens += (length + 2) // 3
+        elif length <= _SINGLE_TOKEN_WORD:
+            tokens += 1
+        else:
+            tokens += 1 + int((length - _SINGLE_TOKEN_WORD) / ratio + 0.999)
+    return max(1, tokens)
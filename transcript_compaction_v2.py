@@ -0,0 +1,241 @@
+"""
+Transcript Compaction v2.0
+Shrinks a transcript before it is pasted into a prompt:
+
+- Strips cue timestamps, caption noise ([Music], <c> tags) and disfluencies (um, uh, "the the")
+- Drops a known speaker's exact repeats and rolling caption lines
+- Merges consecutive cues from the same speaker into one turn
+- Optionally enforces a token budget by dropping the turns with the fewest
+  classifier keyword hits (original order is kept)
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+import re
+
+from transcript_v2 import TranscriptCue, cues_to_text, split_speaker
+from meeting_classifier_v2 import keyword_signal
+from token_estimator_v2 import estimate_tokens
+
+# Only VTT cue timing ("00:01:02.345 --> 00:01:05.000 ...") and timestamps that
+# prefix a line ("[01:02]", "00:01:02"); times in speech ("by 10:30") are kept
+_CUE_TIMING = re.compile(
+    r'^[ \t]*(?:\d{1,2}:)?\d{2}:\d{2}[.,]\d{3}[ \t]*-->[ \t]*(?:\d{1,2}:)?\d{2}:\d{2}[.,]\d{3}.*$',
+    re.MULTILINE
+)
+_TIMESTAMP_PREFIX = re.compile(
+    r'^[ \t]*(?:\[(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?\]|\d{1,2}:\d{2}:\d{2}(?:[.,]\d{1,3})?|\d{1,2}:\d{2}[.,]\d{3})'
+    r'[ \t]*-?[ \t]*',
+    re.MULTILINE
+)
+_CAPTION_NOISE = re.compile(
+    r'[\[(](?:music|laughter|laughs|applause|inaudible|crosstalk|silence|noise|background noise)[^\])]*[\])]'
+    r'|</?(?:c|i|b|u|v)(?:[.\s][^>]*)?>',
+    re.IGNORECASE
+)
+_DISFLUENCY = re.compile(
+    r'(?<![\w-])(?:u+m+|u+h+|e+r+m+|a+h+|h+m+|m+-?hm+|uh-huh)(?![\w-])[,.]?\s*',
+    re.IGNORECASE
+)
+_FILLER_PHRASE = re.compile(r'(?<![\w-])(?:you know|i mean|kind of like|sort of like),\s*', re.IGNORECASE)
+# Stutters: a short function word said twice ("the the", "I I"), or any word
+# three or more times; "had had", "what it is is" and repeated numbers/IDs ("3 3") are kept
+_STUTTER_WORDS = r'(?:i|a|an|the|and|but|so|we|you|it|to|of|in|just|like)'
+_REPEATED_WORD = re.compile(
+    rf'\b({_STUTTER_WORDS})(?:[,\s]+\1\b)+|\b([^\W\d_]+)(?:[,\s]+\2\b){{2,}}',
+    re.IGNORECASE
+)
+_SPACES = re.compile(r'\s+')
+_SPACE_BEFORE_PUNCT = re.compile(r'\s+([,.!?;:])')
+_NORMALIZE = re.compile(r'[^a-z0-9]+')
+
+
+@dataclass
+class CompactionResult:
+    cues: List[TranscriptCue]
+    original_tokens: int
+    compacted_tokens: int
+    duplicates_removed: int = 0
+    turns_merged: int = 0
+    dropped_segments: int = 0
+    dropped_tokens: int = 0
+    notes: List[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return cues_to_text(self.cues)
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of tokens removed (0.0 - 1.0)"""
+        if not self.original_tokens:
+            return 0.0
+        return max(0.0, 1 - self.compacted_tokens / self.original_tokens)
+
+
+def strip_timing(text: str) -> str:
+    """Remove VTT cue timing lines and line-leading timestamps"""
+    return _TIMESTAMP_PREFIX.sub('', _CUE_TIMING.sub('', text))
+
+
+def clean_text(text: str) -> str:
+    """Remove timestamps, caption markup and disfluencies from one line of speech"""
+    text = strip_timing(text)
+    text = _CAPTION_NOISE.sub(' ', text).strip()
+    leading_filler = _DISFLUENCY.match(text) is not None
+    text = _DISFLUENCY.sub('', text)
+    text = _FILLER_PHRASE.sub('', text)
+    text = _REPEATED_WORD.sub(lambda match: match.group(1) or match.group(2), text)
+    text = _SPACE_BEFORE_PUNCT.sub(r'\1', _SPACES.sub(' ', text)).strip(' ,')
+    # "Um, so we..." -> "So we..."
+    if leading_filler and text:
+        text = text[:1].upper() + text[1:]
+    return text
+
+
+def _normalized(text: str) -> str:
+    return _NORMALIZE.sub(' ', text.lower()).strip()
+
+
+def _format_turn(speaker: Optional[str], body: str) -> str:
+    return f"{speaker}: {body}" if speaker else body
+
+
+def compact_cues(
+    cues: List[TranscriptCue],
+    merge_turns: bool = True,
+    max_turn_tokens: int = 400,
+    model: Optional[str] = None,
+    result: Optional[CompactionResult] = None,
+) -> List[TranscriptCue]:
+    """
+    Clean, de-duplicate and merge cues.
+
+    Args:
+        cues: Transcript cues (speaker prefixes may still be in the text)
+        merge_turns: Merge consecutive cues of the same (known) speaker
+        max_turn_tokens: Upper bound on a merged turn, so chunked analysis
+            still has boundaries to split on
+        model: Model name for token estimates
+        result: CompactionResult to record counts in (optional)
+
+    Returns:
+        New list of cues; text is "Speaker: words" when the speaker is known
+    """
+    # [speaker, turn text, last line, last line normalized, start, end, tokens]
+    turns: List[list] = []
+
+    for cue in cues:
+        speaker, body = split_speaker(strip_timing(cue.text).strip())
+        speaker = cue.speaker or speaker
+        body = clean_text(body)
+        if not body:
+            continue
+        norm = _normalized(body)
+        if not norm:
+            continue
+
+        previous = turns[-1] if turns else None
+        if previous and previous[0] == speaker:
+            last_line, last_norm = previous[2], previous[3]
+            # Repeated caption: a known speaker's line again, word for word. Short
+            # replies from unlabelled speakers ("Okay.", "Yes.") may be different people
+            if speaker and norm == last_norm:
+                if result:
+                    result.duplicates_removed += 1
+                previous[5] = cue.end or previous[5]
+                continue
+            # Rolling caption: the last line again with a few more words
+            if norm.startswith(last_norm + ' '):
+                if result:
+                    result.duplicates_removed += 1
+                previous[1] = previous[1][:len(previous[1]) - len(last_line)] + body
+                previous[6] += estimate_tokens(body, model) - estimate_tokens(last_line, model)
+                previous[2], previous[3] = body, norm
+                previous[5] = cue.end or previous[5]
+                continue
+
+            body_tokens = estimate_tokens(body, model)
+            if merge_turns and speaker and previous[6] + body_tokens <= max_turn_tokens:
+                if result:
+                    result.turns_merged += 1
+                previous[1] = f"{previous[1]} {body}"
+                previous[6] += body_tokens
+                previous[2], previous[3] = body, norm
+                previous[5] = cue.end or previous[5]
+                continue
+
+        turns.append([speaker, body, body, norm, cue.start, cue.end, estimate_tokens(body, model)])
+
+    return [
+        TranscriptCue(text=_format_turn(speaker, text), speaker=speaker, start=start, end=end)
+        for speaker, text, _, _, start, end, _ in turns
+    ]
+
+
+def enforce_budget(
+    cues: List[TranscriptCue],
+    target_tokens: int,
+    model: Optional[str] = None,
+    result: Optional[CompactionResult] = None,
+) -> List[TranscriptCue]:
+    """
+    Drop low-signal cues until the transcript fits target_tokens.
+
+    Cues are ranked by classifier keyword hits; among equals the shortest go
+    first (acknowledgements like "Sounds good."). Remaining cues keep their
+    original order.
+    """
+    costs = [estimate_tokens(cue.text, model) + 1 for cue in cues]
+    total = sum(costs)
+    if target_tokens <= 0 or total <= target_tokens:
+        return list(cues)
+
+    ranked = sorted(range(len(cues)), key=lambda i: (keyword_signal(cues[i].text), costs[i], -i))
+    dropped = set()
+    for index in ranked:
+        if total <= target_tokens:
+            break
+        dropped.add(index)
+        total -= costs[index]
+
+    if result:
+        result.dropped_segments += len(dropped)
+        result.dropped_tokens += sum(costs[i] for i in dropped)
+        if total > target_tokens:
+            result.notes.append(f"Could not reach {target_tokens} tokens")
+    return [cue for i, cue in enumerate(cues) if i not in dropped]
+
+
+def compact_transcript(
+    cues: List[TranscriptCue],
+    model: Optional[str] = None,
+    target_tokens: int = 0,
+    merge_turns: bool = True,
+    max_turn_tokens: int = 400,
+) -> CompactionResult:
+    """
+    Run the full compaction and report original vs. compacted token counts.
+
+    Args:
+        cues: Transcript cues
+        model: Configured model name (for token estimates)
+        target_tokens: Token budget for the transcript (0 = no budget)
+        merge_turns: Merge consecutive same-speaker cues
+        max_turn_tokens: Upper bound on a merged turn
+
+    Returns:
+        CompactionResult
+    """
+    result = CompactionResult(
+        cues=[],
+        original_tokens=estimate_tokens(cues_to_text(cues), model),
+        compacted_tokens=0,
+    )
+    compacted = compact_cues(cues, merge_turns, max_turn_tokens, model, result)
+    if target_tokens:
+        compacted = enforce_budget(compacted, target_tokens, model, result)
+
+    result.cues = compacted
+    result.compacted_tokens = estimate_tokens(cues_to_text(compacted), model)
+    return result
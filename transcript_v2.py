@@ -0,0 +1,92 @@
+"""
+Transcript Model v2.0
+Parses Webex VTT transcripts into cues (with speaker where available)
+so downstream stages can work on cue/speaker boundaries instead of one flat string.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import re
+
+
+@dataclass
+class TranscriptCue:
+    text: str
+    speaker: Optional[str] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+
+# "<v Jane Doe>Hello" (WebVTT voice tag) or "Jane Doe: Hello" (Webex style)
+_VOICE_TAG = re.compile(r'^<v(?:\.[\w.-]+)?\s+([^>]+)>')
+_SPEAKER_PREFIX = re.compile(r"^([A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,3}):\s")
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def _speaker_of(text: str) -> Optional[str]:
+    match = _VOICE_TAG.match(text) or _SPEAKER_PREFIX.match(text)
+    return match.group(1).strip() if match else None
+
+
+def split_speaker(text: str) -> Tuple[Optional[str], str]:
+    """Split "Jane Doe: Hello" / "<v Jane Doe>Hello</v>" into (speaker, spoken text)"""
+    match = _VOICE_TAG.match(text) or _SPEAKER_PREFIX.match(text)
+    if not match:
+        return None, text
+    body = text[match.end():]
+    if body.endswith('</v>'):
+        body = body[:-4]
+    return match.group(1).strip(), body.strip()
+
+
+def parse_vtt_cues(vtt_content: str) -> List[TranscriptCue]:
+    """
+    Parse VTT content into cues.
+    Uses the same rules as the original text extractor (the first non-empty
+    line after each timing line is the cue text), so joining the cue text
+    with spaces reproduces the flat transcript exactly.
+    """
+    lines = vtt_content.split('\n')
+    cues = []
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        if not line or line.startswith('WEBVTT') or line.startswith('NOTE'):
+            i += 1
+            continue
+        if '-->' in line:
+            start, _, end = line.partition('-->')
+            i += 1
+            if i < len(lines):
+                text = lines[i].strip()
+                if text:
+                    cues.append(TranscriptCue(
+                        text=text,
+                        speaker=_speaker_of(text),
+                        start=start.strip() or None,
+                        end=end.strip().split(' ')[0] or None,
+                    ))
+            continue
+        i += 1
+
+    return cues
+
+
+def cues_from_text(text: str) -> List[TranscriptCue]:
+    """
+    Build cues from plain transcript text (e.g. fetched from the meetings API
+    or scraped from an email). Splits on lines when present, otherwise on
+    sentence boundaries.
+    """
+    text = text or ""
+    pieces = [line.strip() for line in text.split('\n') if line.strip()]
+    if len(pieces) <= 1:
+        pieces = [p.strip() for p in _SENTENCE_END.split(text) if p.strip()]
+
+    return [TranscriptCue(text=p, speaker=_speaker_of(p)) for p in pieces]
+
+
+def cues_to_text(cues: List[TranscriptCue]) -> str:
+    """Flatten cues back into a single transcript string"""
+    return ' '.join(cue.text for cue in cues)
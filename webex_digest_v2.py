@@ -0,0 +1,173 @@
+"""
+Webex Digest v2.0
+Collects meeting summaries per recipient and sends them as one consolidated
+bot message when the digest window elapses (e.g. every 30 minutes) or enough
+meetings have piled up. Pending digests are persisted to disk, so a restart
+does not lose them; they are flushed on the next check after start-up. A
+digest split over several messages records how many went out, so a retry
+resumes at the first undelivered one.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import json
+import os
+import threading
+import time
+
+
+class WebexDigestScheduler:
+    """Thread-safe digest queue with time-window and size-threshold flushing"""
+
+    def __init__(self, state_path, send_digest: Callable[..., bool],
+                 window_minutes=30, max_meetings=10, check_interval=30, log_callback=None):
+        """
+        Args:
+            state_path: JSON file holding pending digests
+            send_digest: Called with (recipient, meetings, sent_at=, start_part=, on_part=);
+                returns True once delivered (e.g. WebexBotIntegration.send_digest)
+            window_minutes: Flush a recipient's digest this long after its first meeting
+            max_meetings: Flush as soon as a digest holds this many meetings
+            check_interval: Seconds between window checks
+            log_callback: Function to call for logging
+        """
+        self.state_path = state_path
+        self.send_digest = send_digest
+        self.window_seconds = window_minutes * 60
+        self.max_meetings = max(1, max_meetings)
+        self.check_interval = check_interval
+        self.log = log_callback or print
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # recipient -> {started_at, meetings, sending: {meetings, sent_at, parts_sent} while partly sent}
+        self._pending: Dict[str, Dict] = self._load()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if self._pending:
+            count = sum(len(digest['meetings']) for digest in self._pending.values())
+            self.log(f"Webex digest: {count} pending meeting(s) restored")
+
+    def start(self):
+        """Check digest windows in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="webex-digest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, flush=False) -> None:
+        self._stop.set()
+        if flush:
+            self.flush_all()
+
+    def add(self, recipient, structured_data, meeting_title, recording_url='') -> None:
+        """Queue one meeting's summary for recipient's next digest"""
+        meeting = {
+            'meeting_title': meeting_title,
+            'recording_url': recording_url or '',
+            'actions': list(structured_data.get('actions', [])),
+            'stories': list(structured_data.get('stories', [])),
+            'processed_at': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        }
+        with self._lock:
+            digest = self._pending.setdefault(recipient, {'started_at': time.time(), 'meetings': []})
+            digest['meetings'].append(meeting)
+            size = len(digest['meetings'])
+            self._save_locked()
+        self.log(f"  📬 Added to Webex digest for {recipient} ({size}/{self.max_meetings})")
+
+        if size >= self.max_meetings:
+            self.flush(recipient)
+
+    def pending(self) -> Dict[str, int]:
+        """Meetings waiting per recipient"""
+        with self._lock:
+            return {recipient: len(digest['meetings']) for recipient, digest in self._pending.items()}
+
+    def flush(self, recipient) -> bool:
+        """
+        Send a recipient's digest now.
+
+        Meetings stay queued if delivery fails, and the retry skips the
+        messages already delivered; meetings added while the digest is being
+        sent are kept for the next one.
+        """
+        with self._flush_lock:
+            with self._lock:
+                digest = self._pending.get(recipient)
+                if not digest or not digest['meetings']:
+                    return True
+                sending = digest.get('sending')
+                if sending is None:
+                    sending = {'meetings': len(digest['meetings']),
+                               'sent_at': datetime.now().strftime('%Y-%m-%d %H:%M'), 'parts_sent': 0}
+                    digest['sending'] = sending
+                    self._save_locked()
+                meetings = list(digest['meetings'][:sending['meetings']])
+
+            def on_part(parts_sent):
+                with self._lock:
+                    sending['parts_sent'] = parts_sent
+                    self._save_locked()
+
+            if not self.send_digest(recipient, meetings, sent_at=sending['sent_at'],
+                                    start_part=sending['parts_sent'], on_part=on_part):
+                self.log(f"  ⚠ Webex digest for {recipient} not delivered - will retry")
+                return False
+
+            with self._lock:
+                digest = self._pending.get(recipient)
+                if digest:
+                    remaining = digest['meetings'][len(meetings):]
+                    if remaining:
+                        self._pending[recipient] = {'started_at': time.time(), 'meetings': remaining}
+                    else:
+                        del self._pending[recipient]
+                self._save_locked()
+            return True
+
+    def flush_due(self) -> None:
+        """Flush every digest whose window has elapsed"""
+        now = time.time()
+        with self._lock:
+            due = [recipient for recipient, digest in self._pending.items()
+                   if now - digest['started_at'] >= self.window_seconds]
+        for recipient in due:
+            self.flush(recipient)
+
+    def flush_all(self) -> None:
+        with self._lock:
+            recipients = list(self._pending)
+        for recipient in recipients:
+            self.flush(recipient)
+
+    # --- Internals -----------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.flush_due()
+            except Exception as e:
+                self.log(f"ERROR flushing Webex digest: {str(e)}")
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.log(f"Error loading Webex digest state: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_locked(self) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._pending, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            self.log(f"Error writing Webex digest state: {e}")